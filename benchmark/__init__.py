@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2018 Shinichi Takii, shinichi.takii@shaketh.com
+#
+# This module is part of python-ddlparse and is released under
+# the BSD License: https://opensource.org/licenses/BSD-3-Clause
+
+"""
+Benchmarks of ddlparse
+
+* benchmark.ddl_generator : Synthetic DDL generators of each DdlParse.DATABASE dialect
+* benchmark.suite : Benchmark suite with stored baselines and regression gates, python -m benchmark.suite --help
+* bench_*.py : Benchmarks of each feature, PYTHONPATH=. python benchmark/bench_*.py
+"""
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2018 Shinichi Takii, shinichi.takii@shaketh.com
+#
+# This module is part of python-ddlparse and is released under
+# the BSD License: https://opensource.org/licenses/BSD-3-Clause
+
+"""Benchmark of BigQuery JSON schema generation of catalog, to_bigquery_fields() and DdlParseBigQueryWriter"""
+
+import io, json, time, tracemalloc
+
+from ddlparse import DdlParse, DdlParseBigQueryWriter
+
+
+COLUMN_DEFINES = [
+    "Col_{0} varchar(100) NOT NULL DEFAULT 'abc' COMMENT 'column {0}'",
+    "Col_{0} decimal(18, 2) UNSIGNED ZEROFILL DEFAULT 0",
+    "Col_{0} integer PRIMARY KEY AUTO_INCREMENT",
+    "Col_{0} timestamp with time zone DEFAULT CURRENT_TIMESTAMP",
+    "Col_{0} character varying(10)[][] ENCODE lzo DISTKEY",
+    "Col_{0} text CHARACTER SET utf8mb4 NULL",
+]
+
+
+def catalog_tables(table_count, column_count):
+    columns = ",\n  ".join(COLUMN_DEFINES[i % len(COLUMN_DEFINES)].format(i) for i in range(column_count))
+    table = DdlParse(engine=DdlParse.ENGINE.fast).parse_table("CREATE TABLE Table_0 (\n  {}\n);".format(columns))
+
+    # Same table for each table of catalog, the parse time is not measured
+    return [table] * table_count
+
+
+def write_strings(tables, file):
+    file.write("{")
+    for i, table in enumerate(tables):
+        file.write("{}\"{}\":{}".format("," if i > 0 else "", table.name, table.to_bigquery_fields()))
+    file.write("}")
+
+
+def native_strings(tables):
+    return [json.loads(table.to_bigquery_fields()) for table in tables]
+
+
+def measure(func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+class NullFile():
+    def write(self, data):
+        pass
+
+
+if __name__ == "__main__":
+    table_count, column_count = 2000, 50
+    tables = catalog_tables(table_count, column_count)
+
+    for name, func in [
+        ("to_bigquery_fields() write", lambda: write_strings(tables, NullFile())),
+        ("DdlParseBigQueryWriter", lambda: DdlParseBigQueryWriter(NullFile()).write_tables(tables)),
+        ("json.loads(to_bigquery_fields())", lambda: native_strings(tables)),
+        ("DdlParseBigQueryWriter.fields()", lambda: [DdlParseBigQueryWriter.fields(table) for table in tables]),
+    ]:
+        elapsed, peak = measure(func)
+        print("columns = {:>7} : {:<34} : {:>6.3f} sec, peak {:>7.1f} KB".format(table_count * column_count, name, elapsed, peak / 1024))
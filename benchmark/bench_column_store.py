@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2018 Shinichi Takii, shinichi.takii@shaketh.com
+#
+# This module is part of python-ddlparse and is released under
+# the BSD License: https://opensource.org/licenses/BSD-3-Clause
+
+"""Benchmark of bulk queries over the columns of catalog, DdlParseColumn objects and DdlParseColumnStore"""
+
+import timeit
+
+from ddlparse import DdlParse, DdlParseColumnStore
+
+
+COLUMN_DEFINES = [
+    "Col_{0} varchar(100) NOT NULL DEFAULT 'abc' COMMENT 'column {0}'",
+    "Col_{0} decimal(38, 2) UNSIGNED ZEROFILL DEFAULT 0",
+    "Col_{0} integer PRIMARY KEY AUTO_INCREMENT",
+    "Col_{0} timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP",
+    "Col_{0} character varying(10)[] ENCODE lzo DISTKEY",
+    "Col_{0} text CHARACTER SET utf8mb4 NULL",
+]
+
+
+def catalog_tables(table_count, column_count):
+    columns = ",\n  ".join(COLUMN_DEFINES[i % len(COLUMN_DEFINES)].format(i) for i in range(column_count))
+    table = DdlParse(engine=DdlParse.ENGINE.fast).parse_table("CREATE TABLE Table_0 (\n  {}\n);".format(columns))
+
+    # Same table for each table of catalog, the parse time is not measured
+    return [table] * table_count
+
+
+def query_objects(tables):
+    return [col for table in tables for col in table.columns.values()
+            if col.not_null and col.data_type == "TIMESTAMP" or col.bigquery_data_type == "NUMERIC"]
+
+
+def query_store(store):
+    return store.indices(store.mask(data_type="TIMESTAMP", not_null=True) | store.mask(bigquery_data_type="NUMERIC")) \
+        if store.use_numpy else store.indices([a or b for a, b in zip(store.mask(data_type="TIMESTAMP", not_null=True), store.mask(bigquery_data_type="NUMERIC"))])
+
+
+if __name__ == "__main__":
+    table_count, column_count = 20000, 50
+    tables = catalog_tables(table_count, column_count)
+
+    print("columns = {:>8} : {:<24} : {:>7.3f} sec".format(
+        table_count * column_count, "DdlParseColumn", min(timeit.repeat(lambda: query_objects(tables), number=1, repeat=3))))
+
+    for use_numpy in [False, True]:
+        try:
+            store = DdlParseColumnStore(tables, use_numpy=use_numpy)
+        except ImportError:
+            continue
+
+        assert len(query_store(store)) == len(query_objects(tables))
+
+        print("columns = {:>8} : {:<24} : {:>7.3f} sec".format(
+            len(store), "use_numpy={}".format(use_numpy), min(timeit.repeat(lambda: query_store(store), number=1, repeat=3))))
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2018 Shinichi Takii, shinichi.takii@shaketh.com
+#
+# This module is part of python-ddlparse and is released under
+# the BSD License: https://opensource.org/licenses/BSD-3-Clause
+
+"""Benchmark of schema emission of catalog to multiple targets, separate to_bigquery_*() calls and DdlParseEmitter"""
+
+import time
+
+from ddlparse import DdlParse, DdlParseEmitter
+
+
+COLUMN_DEFINES = [
+    "Col_{0} varchar(100) NOT NULL DEFAULT 'abc' COMMENT 'column {0}'",
+    "Col_{0} decimal(18, 2) UNSIGNED ZEROFILL DEFAULT 0",
+    "Col_{0} integer PRIMARY KEY AUTO_INCREMENT",
+    "Col_{0} timestamp with time zone DEFAULT CURRENT_TIMESTAMP",
+    "Col_{0} character varying(10)[][] ENCODE lzo DISTKEY",
+    "Col_{0} text CHARACTER SET utf8mb4 NULL",
+]
+
+
+def catalog_tables(table_count, column_count):
+    columns = ",\n  ".join(COLUMN_DEFINES[i % len(COLUMN_DEFINES)].format(i) for i in range(column_count))
+    table = DdlParse(engine=DdlParse.ENGINE.fast).parse_table("CREATE TABLE Table_0 (\n  {}\n);".format(columns))
+
+    # Same table for each table of catalog, the parse time is not measured
+    return [table] * table_count
+
+
+def separate(tables, name_case):
+    return [(table.to_bigquery_fields(name_case), table.to_bigquery_schema(name_case), table.to_bigquery_ddl(name_case))
+            for table in tables]
+
+
+def emitter(tables, name_case):
+    return list(DdlParseEmitter(name_case).emit_tables(tables))
+
+
+def measure(func, repeat=3):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+
+    return min(elapsed)
+
+
+if __name__ == "__main__":
+    table_count, column_count = 2000, 50
+    tables = catalog_tables(table_count, column_count)
+
+    for name_case in [DdlParse.NAME_CASE.original, DdlParse.NAME_CASE.lower]:
+        for name, func in [
+            ("to_bigquery_fields/schema/ddl()", separate),
+            ("DdlParseEmitter", emitter),
+        ]:
+            print("columns = {:>7} : {:<20} : {:<32} : {:>6.3f} sec".format(
+                table_count * column_count, name_case.name, name, measure(lambda: func(tables, name_case))))
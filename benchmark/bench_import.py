@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2018 Shinichi Takii, shinichi.takii@shaketh.com
+#
+# This module is part of python-ddlparse and is released under
+# the BSD License: https://opensource.org/licenses/BSD-3-Clause
+
+"""Benchmark of import time and first parse time, measured in a new interpreter for each run"""
+
+import os, subprocess, sys
+
+
+SAMPLE_DDL = "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 integer NOT NULL);"
+
+STAGES = [
+    ("import ddlparse", "import ddlparse"),
+    ("import + first parse (pyparsing)", "import ddlparse; ddlparse.DdlParse(ddl).parse()"),
+    ("import + first parse (fast)", "import ddlparse; ddlparse.DdlParse(ddl, engine=ddlparse.DdlParse.ENGINE.fast).parse()"),
+]
+
+TIMER_CODE = "import time; ddl = {ddl!r}; start = time.perf_counter(); {stage}; print(time.perf_counter() - start)"
+
+
+def measure(stage, repeat=10):
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = TIMER_CODE.format(ddl=SAMPLE_DDL, stage=stage)
+
+    return min(float(subprocess.check_output([sys.executable, "-c", code], cwd=root_dir)) for _ in range(repeat))
+
+
+if __name__ == "__main__":
+    for name, stage in STAGES:
+        print("{:<35} : {:>10.2f} ms".format(name, measure(stage) * 1000))
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2018 Shinichi Takii, shinichi.takii@shaketh.com
+#
+# This module is part of python-ddlparse and is released under
+# the BSD License: https://opensource.org/licenses/BSD-3-Clause
+
+"""
+Benchmark of memory usage of parsed tables held in memory (e.g. warehouse catalog)
+
+    python -m benchmark.bench_memory
+"""
+
+import gc, pickle, tracemalloc
+
+from ddlparse import DdlParse
+
+from benchmark.ddl_generator import DATABASES, catalog_ddl, database_name
+
+
+def measure(ddl, options):
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    tables = list(DdlParse(engine=DdlParse.ENGINE.fast, **options).iter_tables(ddl))
+
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    return tables, size
+
+
+if __name__ == "__main__":
+    table_count, column_count = 1000, 50
+
+    for database in DATABASES:
+        ddl = catalog_ddl(database, table_count, column_count, attribute_rate=1.0)
+
+        for options in [{}, {"keep_constraint_text": False}]:
+            tables, size = measure(ddl, dict(options, source_database=database))
+            pickled_size = len(pickle.dumps(tables, pickle.HIGHEST_PROTOCOL))
+
+            print("{:<10} : columns = {:>7} : {:<32} : {:>8.1f} MB, {:>6.0f} bytes/column, pickled {:>6.0f} bytes/column".format(
+                database_name(database), table_count * column_count, str(options), size / 1024 / 1024,
+                size / (table_count * column_count), pickled_size / (table_count * column_count)))
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2018 Shinichi Takii, shinichi.takii@shaketh.com
+#
+# This module is part of python-ddlparse and is released under
+# the BSD License: https://opensource.org/licenses/BSD-3-Clause
+
+"""Benchmark of packrat memoization option on wide tables"""
+
+import timeit
+
+from ddlparse import DdlParse
+
+
+COLUMN_DEFINES = [
+    "Col_{0} varchar(100) NOT NULL DEFAULT 'abc' COMMENT 'column {0}'",
+    "Col_{0} decimal(18, 2) UNSIGNED ZEROFILL DEFAULT 0",
+    "Col_{0} integer PRIMARY KEY AUTO_INCREMENT",
+    "Col_{0} timestamp with time zone DEFAULT CURRENT_TIMESTAMP",
+    "Col_{0} character varying(10)[] ENCODE lzo DISTKEY",
+    "Col_{0} text CHARACTER SET utf8mb4 NULL",
+]
+
+
+def wide_table_ddl(column_count):
+    columns = [COLUMN_DEFINES[i % len(COLUMN_DEFINES)].format(i) for i in range(column_count)]
+    return "CREATE TABLE Wide_Table (\n  {},\n  PRIMARY KEY (Col_2)\n);".format(",\n  ".join(columns))
+
+
+if __name__ == "__main__":
+    for column_count in [10, 100, 1000]:
+        ddl = wide_table_ddl(column_count)
+        number = max(1, 200 // column_count)
+
+        for options in [{}, {"packrat": True}, {"packrat": True, "packrat_cache_size": None}]:
+            sec = min(timeit.repeat(lambda: DdlParse(ddl, **options).parse(), number=number, repeat=3)) / number
+            print("columns = {:>5} : {:<50} : {:>10.2f} ms".format(column_count, str(options), sec * 1000))
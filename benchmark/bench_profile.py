@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2018 Shinichi Takii, shinichi.takii@shaketh.com
+#
+# This module is part of python-ddlparse and is released under
+# the BSD License: https://opensource.org/licenses/BSD-3-Clause
+
+"""
+Benchmark of the overhead of DdlParseProfile, and the per-phase profile of catalog parse
+
+    python -m benchmark.bench_profile
+"""
+
+import time
+
+from ddlparse import DdlParse, DdlParseProfile
+
+from benchmark.ddl_generator import catalog_ddl
+
+
+DATABASE = DdlParse.DATABASE.mysql
+
+
+def parse(ddl, engine):
+    for table in DdlParse(source_database=DATABASE, engine=engine).iter_tables(ddl):
+        table.to_bigquery_fields()
+
+
+def measure(func, repeat=3):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+
+    return min(elapsed)
+
+
+if __name__ == "__main__":
+    for engine, table_count, column_count in [(DdlParse.ENGINE.fast, 1000, 50), (DdlParse.ENGINE.pyparsing, 100, 50)]:
+        ddl = catalog_ddl(DATABASE, table_count, column_count, attribute_rate=1.0)
+
+        disabled = measure(lambda: parse(ddl, engine))
+
+        profile = DdlParseProfile()
+        with profile:
+            enabled = measure(lambda: parse(ddl, engine))
+
+        print("columns = {:>6} : {:<9} : disabled {:>6.3f} sec, enabled {:>6.3f} sec".format(
+            table_count * column_count, engine.name, disabled, enabled))
+
+        for phase, (calls, seconds) in profile.stats.items():
+            print("    {:<18} : {:>8} calls, {:>7.3f} sec".format(phase, calls, seconds))
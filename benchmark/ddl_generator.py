@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2018 Shinichi Takii, shinichi.takii@shaketh.com
+#
+# This module is part of python-ddlparse and is released under
+# the BSD License: https://opensource.org/licenses/BSD-3-Clause
+
+"""Synthetic DDL generators of each DdlParse.DATABASE dialect, deterministic by seed"""
+
+import random
+from collections import OrderedDict
+
+from ddlparse import DdlParse
+
+
+# Column data types of dialect : format of data type, "{n}" is length, "{p}" and "{s}" are precision and scale
+_DATA_TYPES = OrderedDict([
+    (None, [
+        "varchar({n})", "char({n})", "text", "integer", "bigint", "smallint", "numeric({p}, {s})", "decimal({p})",
+        "double precision", "real", "date", "time", "timestamp", "boolean",
+    ]),
+    (DdlParse.DATABASE.mysql, [
+        "varchar({n})", "char({n})", "text", "tinyint({n}) UNSIGNED", "int({n})", "bigint({n}) UNSIGNED ZEROFILL",
+        "decimal({p}, {s}) UNSIGNED", "double", "float({p}, {s})", "datetime", "date", "year", "json", "binary({n})", "varbinary({n})",
+    ]),
+    (DdlParse.DATABASE.postgresql, [
+        "character varying({n})", "character({n})", "text", "integer", "bigint", "serial", "numeric({p}, {s})", "numeric",
+        "double precision", "money", "timestamp with time zone", "timestamp without time zone", "timestamptz", "date",
+        "bool", "uuid", "json", "bytea",
+    ]),
+    (DdlParse.DATABASE.oracle, [
+        "varchar2({n} char)", "varchar2({n} byte)", "nvarchar2({n})", "char({n})", "clob", "nclob", "number({p}, {s})",
+        "number({p})", "number(*, {s})", "number", "float", "date", "timestamp",
+    ]),
+    (DdlParse.DATABASE.redshift, [
+        "varchar({n})", "character varying({n})", "char({n})", "smallint", "integer", "bigint", "decimal({p}, {s})",
+        "real", "double precision", "boolean", "date", "timestamp", "timestamptz",
+    ]),
+])
+
+# Column attributes of dialect, optional and at most one of each list
+_ATTRIBUTES = OrderedDict([
+    (None, [["UNIQUE"]]),
+    (DdlParse.DATABASE.mysql, [["AUTO_INCREMENT"], ["CHARACTER SET utf8mb4", "CHARACTER SET latin1"]]),
+    (DdlParse.DATABASE.postgresql, [["UNIQUE"]]),
+    (DdlParse.DATABASE.oracle, [["UNIQUE"]]),
+    (DdlParse.DATABASE.redshift, [["ENCODE lzo", "ENCODE zstd", "ENCODE az64"], ["DISTKEY", "SORTKEY"]]),
+])
+
+# Name quote of dialect
+_QUOTES = {None: "", DdlParse.DATABASE.mysql: "`", DdlParse.DATABASE.postgresql: '"', DdlParse.DATABASE.oracle: '"', DdlParse.DATABASE.redshift: ""}
+
+# Dialects with COMMENT column attribute and array data types
+_COMMENT_DATABASES = (DdlParse.DATABASE.mysql,)
+_ARRAY_DATABASES = (DdlParse.DATABASE.postgresql,)
+
+DATABASES = list(_DATA_TYPES)
+
+_WORDS = ["ddlparse", "column", "table", "schema", "value", "Comma, strings", "in \"Quote\"", "BigQuery", "Full-width コメント"]
+
+
+def database_name(database):
+    """Name of dialect, "generic" for None"""
+
+    return "generic" if database is None else database.name
+
+
+def column_define(rnd, database, index, literal_length=16, array_dimensional=0, attribute_rate=0.5):
+    """
+    Generate a column definition
+
+    :param rnd: random.Random
+    :param database: enum DdlParse.DATABASE or None
+    :param index: Column index, the column name is Col_{index}
+    :param literal_length: Length of COMMENT and DEFAULT literals, 0 is without literals
+    :param array_dimensional: Maximum array dimensional of PostgreSQL columns, 0 is no array
+    :param attribute_rate: Rate of each optional attribute
+
+    :return: Column definition
+    """
+
+    quote = _QUOTES[database]
+    data_type = rnd.choice(_DATA_TYPES[database])
+    precision = rnd.randint(1, 38)
+    data_type = data_type.format(n=rnd.randint(1, 255), p=precision, s=rnd.randint(0, precision))
+
+    define = ["{0}Col_{1}{0}".format(quote, index), data_type]
+
+    if array_dimensional > 0 and database in _ARRAY_DATABASES:
+        define[-1] += "[]" * rnd.randint(0, array_dimensional)
+
+    if rnd.random() < attribute_rate:
+        define.append(rnd.choice(["NOT NULL", "NULL"]))
+
+    for attributes in _ATTRIBUTES[database]:
+        if rnd.random() < attribute_rate / 2:
+            define.append(rnd.choice(attributes))
+
+    if literal_length > 0 and rnd.random() < attribute_rate:
+        define.append("DEFAULT '{}'".format(_literal(rnd, literal_length)))
+
+    if literal_length > 0 and database in _COMMENT_DATABASES and rnd.random() < attribute_rate:
+        define.append("COMMENT '{}'".format(_literal(rnd, literal_length)))
+
+    return " ".join(define)
+
+
+def table_ddl(rnd, database, name, column_count, constraint_count=0, **options):
+    """
+    Generate CREATE TABLE statement
+
+    :param rnd: random.Random
+    :param database: enum DdlParse.DATABASE or None
+    :param name: Table name
+    :param column_count: Number of columns
+    :param constraint_count: Number of table constraints (PRIMARY KEY, UNIQUE and NOT NULL of column lists)
+    :param options: Options of column_define()
+
+    :return: CREATE TABLE statement
+    """
+
+    quote = _QUOTES[database]
+    defines = [column_define(rnd, database, i, **options) for i in range(column_count)]
+
+    for i in range(constraint_count):
+        columns = ", ".join("{0}Col_{1}{0}".format(quote, col) for col in rnd.sample(range(column_count), min(column_count, rnd.randint(1, 4))))
+
+        if i == 0:
+            defines.append("CONSTRAINT {0}pk_{1}{0} PRIMARY KEY ({2})".format(quote, name, columns))
+        elif database == DdlParse.DATABASE.mysql and i % 3 == 1:
+            defines.append("KEY idx_{} ({})".format(i, columns))
+        else:
+            defines.append("CONSTRAINT {0}cons_{1}{0} {2} ({3})".format(quote, i, "UNIQUE" if i % 2 else "NOT NULL", columns))
+
+    return "CREATE TABLE {0}{1}{0} (\n  {2}\n);".format(quote, name, ",\n  ".join(defines))
+
+
+def catalog_ddl(database, table_count, column_count, seed=0, **options):
+    """
+    Generate DDL script of tables
+
+    :param database: enum DdlParse.DATABASE or None
+    :param table_count: Number of tables
+    :param column_count: Number of columns of each table
+    :param seed: Random seed, the same DDL script is generated for the same arguments
+    :param options: Options of table_ddl() and column_define()
+
+    :return: DDL script
+    """
+
+    rnd = random.Random("{}:{}".format(database_name(database), seed))
+
+    return "\n".join(table_ddl(rnd, database, "Table_{}".format(i), column_count, **options) for i in range(table_count))
+
+
+def _literal(rnd, length):
+    literal = []
+    size = 0
+
+    while size < length:
+        word = rnd.choice(_WORDS)
+        literal.append(word)
+        size += len(word) + 1
+
+    return " ".join(literal)[:length].replace("'", "\\'").rstrip("\\")
@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2018 Shinichi Takii, shinichi.takii@shaketh.com
+#
+# This module is part of python-ddlparse and is released under
+# the BSD License: https://opensource.org/licenses/BSD-3-Clause
+
+"""
+Benchmark suite of synthetic DDL of each dialect, with stored baselines and regression gates
+
+    python -m benchmark.suite run -o results.json       # Run and save the results
+    python -m benchmark.suite baseline                  # Run and save the results to benchmark/baseline.json
+    python -m benchmark.suite compare baseline.json results.json
+    python -m benchmark.suite check                     # Run and compare with benchmark/baseline.json
+    python -m benchmark.suite check --reference path/to/tree    # Also run the engine cases A/B with ddlparse of the tree
+    python -m benchmark.suite reference path/to/tree    # Run the engine cases with ddlparse of the tree and the current tree, save to the baseline
+
+compare and check exit with status 1 on regression.
+Times are compared by normalized time (seconds / calibration seconds) to reduce the difference of machines,
+peak memory is compared by bytes.
+The engine cases (DdlParse(ddl).parse() of the default engine) are also compared with the "reference" results,
+the results of the release before the optimizations.
+The stored reference of the baseline was measured by another run, so it is compared by the tolerance of the baseline.
+check --reference runs the reference tree and the current tree alternately in child processes,
+and compares the best seconds of the rounds by the reference tolerance.
+"""
+
+import argparse, fnmatch, gc, json, os, platform, re, subprocess, sys, time, tracemalloc
+from collections import OrderedDict, namedtuple
+
+import ddlparse
+from ddlparse import DdlParse
+
+from benchmark.ddl_generator import DATABASES, catalog_ddl, database_name
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+Case = namedtuple("Case", "name table_count column_count options engines databases")
+
+# Engine names, resolved while running so that the engine cases run with ddlparse of releases without DdlParse.ENGINE
+_ENGINES = ("fast", "pyparsing")
+
+CASES = [
+    Case("wide_10", 20, 10, {}, _ENGINES, DATABASES),
+    Case("wide_1000", 1, 1000, {}, _ENGINES, DATABASES),
+    Case("wide_10000", 1, 10000, {}, ("fast",), DATABASES),
+    Case("many_tables", 500, 20, {}, ("fast",), DATABASES),
+    Case("long_literals", 5, 50, {"literal_length": 2000, "attribute_rate": 1.0}, _ENGINES, DATABASES),
+    Case("arrays", 5, 100, {"array_dimensional": 5}, _ENGINES, [DdlParse.DATABASE.postgresql]),
+    Case("constraints", 5, 100, {"constraint_count": 50, "attribute_rate": 1.0}, _ENGINES, DATABASES),
+]
+
+# DdlParse(ddl).parse() of the default engine, the API of all releases
+ENGINE_CASES = [
+    Case("engine_200", 1, 200, {}, ("default",), DATABASES),
+    Case("engine_constraints", 1, 100, {"constraint_count": 20, "attribute_rate": 1.0}, ("default",), DATABASES),
+]
+
+
+def calibrate(repeat=5):
+    """Seconds of the fixed pure Python workload, the unit of normalized time"""
+
+    pattern = re.compile(r"(\w+)\s*\(\s*(\d+)\s*\)")
+    words = ["Col_{} varchar({})".format(i, i % 255) for i in range(20000)]
+
+    def workload():
+        index = {}
+        for word in words:
+            match = pattern.search(word)
+            index[match.group(1).upper()] = int(match.group(2))
+        return sorted(index.items())
+
+    return _best(workload, repeat)
+
+
+def run(case_pattern="*", database_pattern="*", repeat=5, out=sys.stdout):
+    """
+    Run the cases
+
+    :param case_pattern: fnmatch pattern of case names
+    :param database_pattern: fnmatch pattern of dialect names ("generic", "mysql", ...)
+    :param repeat: Number of repeats of time measurement, the best time is used
+    :param out: Text file of the progress, None is silent
+
+    :return: Results dict
+    """
+
+    calibrations = [calibrate()]
+    results = OrderedDict()
+
+    for case in CASES + ENGINE_CASES:
+        if not fnmatch.fnmatch(case.name, case_pattern):
+            continue
+
+        for database in case.databases:
+            if not fnmatch.fnmatch(database_name(database), database_pattern):
+                continue
+
+            ddl = catalog_ddl(database, case.table_count, case.column_count, **case.options)
+            columns = case.table_count * case.column_count
+            prefix = "{}/{}/".format(database_name(database), case.name)
+
+            if case in ENGINE_CASES:
+                seconds = _best(lambda: DdlParse(ddl, source_database=database).parse(), repeat)
+                results[prefix + "parse_default"] = _time_result(columns, seconds)
+
+            else:
+                for engine in [DdlParse.ENGINE[name] for name in case.engines]:
+                    parser = DdlParse(source_database=database, engine=engine)
+
+                    seconds = _best(lambda: list(parser.iter_tables(ddl)), repeat)
+                    results[prefix + "parse_" + engine.name] = _time_result(columns, seconds)
+
+                    peak = _peak(lambda: list(parser.iter_tables(ddl)))
+                    results[prefix + "memory_" + engine.name] = OrderedDict([
+                        ("columns", columns), ("peak_bytes", peak), ("bytes_per_column", round(peak / columns, 1))])
+
+                # The BigQuery data type of columns is memoized by the first loop, same as the repeated emission of tables
+                tables = list(DdlParse(source_database=database, engine=DdlParse.ENGINE.fast).iter_tables(ddl))
+
+                for name, func in [
+                    ("bigquery_fields", lambda: [table.to_bigquery_fields() for table in tables]),
+                    ("bigquery_ddl", lambda: [table.to_bigquery_ddl() for table in tables]),
+                ]:
+                    seconds = _best(func, repeat)
+                    results[prefix + name] = _time_result(columns, seconds)
+
+            if out is not None:
+                for key in [key for key in results if key.startswith(prefix)]:
+                    print(_format_result(key, results[key]), file=out)
+
+    # Normalized by the best calibration of the run, the machine load may change while running
+    calibrations.append(calibrate())
+    calibration = min(calibrations)
+
+    for result in results.values():
+        if "seconds" in result:
+            result["normalized"] = result["seconds"] / calibration
+
+    return OrderedDict([
+        ("ddlparse", ddlparse.__version__),
+        ("python", platform.python_version()),
+        ("platform", platform.platform()),
+        ("calibration", calibration),
+        ("results", results),
+    ])
+
+
+def compare(baseline, current, tolerance=0.5, memory_tolerance=0.1, absolute=False, reference=None, reference_tolerance=0.25, out=sys.stdout):
+    """
+    Compare the results with the baseline, and the engine cases with the reference results
+
+    :param baseline: Results dict of baseline
+    :param current: Results dict
+    :param tolerance: Allowed ratio of time increase, also from the stored reference results of the baseline
+    :param memory_tolerance: Allowed ratio of peak memory increase
+    :param absolute: Compare seconds instead of normalized time
+    :param reference: Results dict of the reference measured alternately with current (see interleave()),
+        None compares with the stored reference results of the baseline
+    :param reference_tolerance: Allowed ratio of time increase from the reference results of reference
+    :param out: Text file of the report, None is silent
+
+    :return: List of the keys of regressions, the keys of the reference regressions are prefixed by "reference:"
+    """
+
+    regressions = []
+    time_metric = "seconds" if absolute else "normalized"
+
+    if out is not None and baseline.get("python") != current.get("python"):
+        print("warning: Python version is different, baseline {} : current {}".format(baseline.get("python"), current.get("python")), file=out)
+
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            if out is not None:
+                print("{:<48} : no baseline".format(key), file=out)
+            continue
+
+        metric, limit = ("peak_bytes", memory_tolerance) if "peak_bytes" in result else (time_metric, tolerance)
+        _compare_result(key, base, result, metric, limit, regressions, out)
+
+    # The best seconds of the same rounds are comparable without calibration
+    if reference is None:
+        reference, reference_metric, reference_limit, source = baseline.get("reference"), time_metric, tolerance, "stored"
+    else:
+        reference_metric, reference_limit, source = "seconds", reference_tolerance, "A/B"
+
+    if reference is not None:
+        if out is not None:
+            print("reference: ddlparse {} ({})".format(reference["ddlparse"], source), file=out)
+
+        for key, base in reference["results"].items():
+            result = current["results"].get(key)
+            if result is not None:
+                _compare_result("reference:" + key, base, result, reference_metric, reference_limit, regressions, out)
+
+    if out is not None:
+        print("{} regression(s)".format(len(regressions)), file=out)
+
+    return regressions
+
+
+def reference(path, case_pattern="engine_*", database_pattern="*", repeat=5):
+    """
+    Run the engine cases with ddlparse of the other tree in a child process, the release before the optimizations
+
+    :param path: Directory of the tree which contains the ddlparse package
+    :param case_pattern: fnmatch pattern of case names, the cases other than ENGINE_CASES need the current API
+    :param database_pattern: fnmatch pattern of dialect names
+    :param repeat: Number of repeats of time measurement
+
+    :return: Results dict
+    """
+
+    # ddlparse is imported from the tree first, and the benchmark package from the current directory
+    code = "\n".join([
+        "import json, sys",
+        "sys.path.insert(0, sys.argv[1])",
+        "import ddlparse",
+        "sys.path.pop(0)",
+        "from benchmark import suite",
+        "json.dump(suite.run(sys.argv[2], sys.argv[3], int(sys.argv[4]), out=None), sys.stdout)",
+    ])
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output([sys.executable, "-c", code, os.path.abspath(path), case_pattern, database_pattern, str(repeat)], cwd=cwd)
+
+    return json.loads(output.decode("utf-8"), object_pairs_hook=OrderedDict)
+
+
+def interleave(path, case_pattern="engine_*", database_pattern="*", repeat=5, rounds=3):
+    """
+    Run the cases with ddlparse of the other tree and the current tree alternately in child processes,
+    so that both trees are measured under the same machine load
+
+    :param path: Directory of the tree which contains the ddlparse package
+    :param case_pattern: fnmatch pattern of case names
+    :param database_pattern: fnmatch pattern of dialect names
+    :param repeat: Number of repeats of time measurement
+    :param rounds: Number of rounds of the tree and the current tree
+
+    :return: Tuple of the best results of the rounds of the tree and the current tree
+    """
+
+    current_path = os.path.dirname(os.path.dirname(os.path.abspath(ddlparse.__file__)))
+    references, currents = [], []
+
+    for _ in range(rounds):
+        references.append(reference(path, case_pattern, database_pattern, repeat))
+        currents.append(reference(current_path, case_pattern, database_pattern, repeat))
+
+    return _best_results(references), _best_results(currents)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmark.suite", description="Benchmark suite of ddlparse")
+    commands = parser.add_subparsers(dest="command")
+
+    run_options = argparse.ArgumentParser(add_help=False)
+    run_options.add_argument("--case", default="*", help="fnmatch pattern of case names")
+    run_options.add_argument("--database", default="*", help="fnmatch pattern of dialect names")
+    run_options.add_argument("--repeat", type=int, default=5, help="number of repeats of time measurement")
+    run_options.add_argument("--rounds", type=int, default=1, help="number of runs, the best results of the runs are used")
+
+    compare_options = argparse.ArgumentParser(add_help=False)
+    compare_options.add_argument("--tolerance", type=float, default=0.5, help="allowed ratio of time increase")
+    compare_options.add_argument("--memory-tolerance", type=float, default=0.1, help="allowed ratio of peak memory increase")
+    compare_options.add_argument("--absolute", action="store_true", help="compare seconds instead of normalized time")
+    compare_options.add_argument("--reference-tolerance", type=float, default=0.25, help="allowed ratio of time increase from the A/B reference")
+
+    command = commands.add_parser("run", parents=[run_options], help="run and save the results")
+    command.add_argument("-o", "--output", help="results JSON file")
+
+    command = commands.add_parser("baseline", parents=[run_options], help="run and save the results as baseline")
+    command.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+
+    command = commands.add_parser("reference", help="run the engine cases with ddlparse of the tree and save them as the reference of the baseline")
+    command.add_argument("path", help="directory of the tree which contains the ddlparse package")
+    command.add_argument("--case", default="engine_*", help="fnmatch pattern of case names")
+    command.add_argument("--database", default="*", help="fnmatch pattern of dialect names")
+    command.add_argument("--repeat", type=int, default=5, help="number of repeats of time measurement")
+    command.add_argument("--rounds", type=int, default=3, help="number of rounds of the tree and the current tree alternately")
+    command.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+
+    command = commands.add_parser("compare", parents=[compare_options], help="compare the results with the baseline")
+    command.add_argument("baseline", help="baseline JSON file")
+    command.add_argument("results", help="results JSON file")
+
+    command = commands.add_parser("check", parents=[run_options, compare_options], help="run and compare with the baseline")
+    command.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    command.add_argument("-o", "--output", help="results JSON file")
+    command.add_argument("--reference", metavar="PATH", help="directory of the tree to run the engine cases alternately with the current tree")
+    command.add_argument("--reference-rounds", type=int, default=3, help="number of rounds of the tree and the current tree alternately")
+
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 2
+
+    if args.command == "reference":
+        # Both trees are run alternately in child processes and the best of the rounds is saved, to reduce the machine load difference
+        references, currents = interleave(args.path, args.case, args.database, args.repeat, args.rounds)
+
+        baseline = _load(args.baseline)
+        baseline["reference"] = references
+        baseline["results"].update(currents["results"])
+        _save(args.baseline, baseline)
+
+    if args.command in ("run", "baseline", "check"):
+        results = _best_results([run(args.case, args.database, args.repeat) for _ in range(args.rounds)])
+
+        # The reference results are kept by the update of the baseline
+        if args.command == "baseline" and os.path.exists(args.baseline):
+            previous = _load(args.baseline)
+            if "reference" in previous:
+                results["reference"] = previous["reference"]
+
+        output = args.baseline if args.command == "baseline" else args.output
+        if output is not None:
+            _save(output, results)
+
+    if args.command in ("compare", "check"):
+        baseline = _load(args.baseline)
+        current = _load(args.results) if args.command == "compare" else results
+        references = None
+
+        # The engine cases of the current tree are also taken from the child processes, same as the reference
+        if args.command == "check" and args.reference is not None and any(fnmatch.fnmatch(case.name, args.case) for case in ENGINE_CASES):
+            references, currents = interleave(args.reference, "engine_*", args.database, args.repeat, args.reference_rounds)
+            current["results"].update((key, result) for key, result in currents["results"].items() if key in current["results"])
+
+        if compare(baseline, current, args.tolerance, args.memory_tolerance, args.absolute, references, args.reference_tolerance):
+            return 1
+
+    return 0
+
+
+def _compare_result(key, base, result, metric, limit, regressions, out):
+    ratio = result[metric] / base[metric] if base[metric] else 1.0
+    regressed = ratio > 1.0 + limit
+
+    if regressed:
+        regressions.append(key)
+
+    if out is not None:
+        print("{:<48} : {:>12.6g} -> {:>12.6g} {:<10} : {:>+7.1%}{}".format(
+            key, base[metric], result[metric], metric, ratio - 1.0, "  REGRESSION" if regressed else ""), file=out)
+
+
+def _best(func, repeat, min_seconds=0.2):
+    """Best seconds of func of repeats, func is looped in each repeat until min_seconds like timeit"""
+
+    elapsed = []
+    number = 1
+
+    for _ in range(repeat):
+        gc.collect()
+
+        total = 0.0
+        loops = 0
+
+        while loops < number or total < min_seconds:
+            start = time.perf_counter()
+            func()
+            total += time.perf_counter() - start
+            loops += 1
+
+        number = loops
+        elapsed.append(total / loops)
+
+    return min(elapsed)
+
+
+def _best_results(runs):
+    """Results of the first run, with the best time or the least peak memory of each key of the runs"""
+
+    best = runs[0]
+
+    for key in best["results"]:
+        best["results"][key] = min((run["results"][key] for run in runs), key=lambda result: result.get("seconds", result.get("peak_bytes")))
+
+    return best
+
+
+def _peak(func):
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    del result
+    return peak
+
+
+def _time_result(columns, seconds):
+    return OrderedDict([
+        ("columns", columns),
+        ("seconds", seconds),
+        ("normalized", None),
+        ("columns_per_second", round(columns / seconds)),
+    ])
+
+
+def _format_result(key, result):
+    if "peak_bytes" in result:
+        return "{:<48} : peak {:>8.1f} KB, {:>8.1f} bytes/column".format(key, result["peak_bytes"] / 1024, result["bytes_per_column"])
+
+    return "{:<48} : {:>8.4f} sec, {:>9} columns/sec".format(key, result["seconds"], result["columns_per_second"])
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f, object_pairs_hook=OrderedDict)
+
+
+def _save(path, results):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
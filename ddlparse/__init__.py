@@ -14,4 +14,4 @@ __author__       = 'Shinichi Takii'
 __author_email__ = 'shinichi.takii@shaketh.com'
 __url__          = 'http://github.com/shinichi-takii/ddlparse'
 
-__all__ = ['DdlParse', 'DdlParseTable', 'DdlParseColumn', 'DdlParseColumnDict']
+__all__ = ['DdlParse', 'DdlParseTable', 'DdlParseColumn', 'DdlParseColumnDict', 'DdlParseTableDict', 'DdlParseColumnStore', 'DdlParseBigQueryWriter', 'DdlParseEmitter', 'DdlParseEmitTarget', 'DdlParseEmitColumn', 'DdlParseBigQueryFieldsTarget', 'DdlParseBigQuerySchemaTarget', 'DdlParseBigQueryDdlTarget', 'DdlParseCache', 'DdlParseDiskCache', 'DdlParseProfile', 'DdlParseTrace', 'DdlParseBudgetError']
@@ -7,18 +7,19 @@
 
 """Parse DDL statements"""
 
-import re, textwrap, json
-from collections import OrderedDict
+import re, textwrap, json, codecs, mmap, os, sys, time, functools, threading, hashlib, pickle, warnings
+from array import array
+from collections import OrderedDict, deque
 from enum import IntEnum
-
-from pyparsing import CaselessKeyword, Forward, Word, Regex, alphanums, \
-    delimitedList, Suppress, Optional, Group, OneOrMore
+from importlib import import_module
 
 
 class DdlParseBase():
 
-    NAME_CASE = IntEnum("NAME_CASE", "original lower upper")
-    DATABASE = IntEnum("DATABASE", "mysql, postgresql, oracle, redshift")
+    __slots__ = ()
+
+    NAME_CASE = IntEnum("NAME_CASE", "original lower upper", qualname="DdlParseBase.NAME_CASE")
+    DATABASE = IntEnum("DATABASE", "mysql, postgresql, oracle, redshift", qualname="DdlParseBase.DATABASE")
 
     def __init__(self, source_database=None):
         self._source_database = source_database
@@ -39,6 +40,8 @@ class DdlParseBase():
 
 class DdlParseTableColumnBase(DdlParseBase):
 
+    __slots__ = ("_source_database", "_name")
+
     def __init__(self, source_database=None):
         super().__init__(source_database)
         self._name = ""
@@ -74,6 +77,42 @@ class DdlParseTableColumnBase(DdlParseBase):
 class DdlParseColumn(DdlParseTableColumnBase):
     """Column define info"""
 
+    # Compact model of many columns (e.g. warehouse catalog) : no instance dict, and boolean flags in a bitfield
+    __slots__ = ("_data_type", "_length", "_scale", "_array_dimensional", "_flags",
+                 "_constraint", "_default", "_comment", "_encode", "_character_set", "_source_span", "_bigquery_data_type")
+
+    _NOT_NULL = 1 << 0
+    _PRIMARY_KEY = 1 << 1
+    _UNIQUE = 1 << 2
+    _AUTO_INCREMENT = 1 << 3
+    _DISTKEY = 1 << 4
+    _SORTKEY = 1 << 5
+    _UNSIGNED = 1 << 6
+    _ZEROFILL = 1 << 7
+
+    # BigQuery data type = {source_database: [data type, ...], ...} in order of priority, built once
+    _BQ_DATA_TYPE_DIC = OrderedDict()
+    _BQ_DATA_TYPE_DIC["STRING"] = {None: [re.compile(r"(STRING|CHAR|TEXT|CLOB|JSON|UUID)")]}
+    _BQ_DATA_TYPE_DIC["INTEGER"] = {None: [re.compile(r"INT|SERIAL|YEAR")]}
+    _BQ_DATA_TYPE_DIC["FLOAT"] = {None: [re.compile(r"(FLOAT|DOUBLE)"), "REAL", "MONEY"]}
+    _BQ_DATA_TYPE_DIC["DATETIME"] = {
+        None: ["DATETIME", "TIMESTAMP", "TIMESTAMP WITHOUT TIME ZONE"],
+        DdlParseBase.DATABASE.oracle: ["DATE"]
+    }
+    _BQ_DATA_TYPE_DIC["TIMESTAMP"] = {None: ["TIMESTAMPTZ", "TIMESTAMP WITH TIME ZONE"]}
+    _BQ_DATA_TYPE_DIC["DATE"] = {None: ["DATE"]}
+    _BQ_DATA_TYPE_DIC["TIME"] = {None: ["TIME"]}
+    _BQ_DATA_TYPE_DIC["BOOLEAN"] = {None: [re.compile(r"BOOL")]}
+    _BQ_DATA_TYPE_DIC["BYTES"] = {None: ["BYTES", "BINARY", "VARBINARY", "BYTEA"]}
+
+    _BQ_NUMERIC_DATA_TYPES = frozenset(["NUMERIC", "NUMBER", "DECIMAL", "DEC", "FIXED"])
+
+    # BigQuery Standard SQL data type of Legacy SQL data type, if different
+    _BQ_STANDARD_DATA_TYPE_DIC = {"INTEGER": "INT64", "FLOAT": "FLOAT64", "BOOLEAN": "BOOL"}
+
+    # Index of BigQuery data type by (source_database, data_type), None if decided by precision and scale
+    _bq_data_type_index = {}
+
     def __init__(self, name, data_type_array, array_brackets=None, constraint=None, source_database=None):
         """
         :param data_type_array[]: Column data type ['data type name'] or ['data type name', '(length)'] or ['data type name', '(precision, scale)']
@@ -84,9 +123,33 @@ class DdlParseColumn(DdlParseTableColumnBase):
 
         super().__init__(source_database)
         self._name = name
+        self._flags = 0
         self._set_data_type(data_type_array)
         self.constraint = constraint
         self._array_dimensional = 0 if array_brackets is None else array_brackets.count('[]')
+        self._source_span = None
+
+    @classmethod
+    def _from_values(cls, name, data_type, array_brackets=None, constraint=None, source_database=None):
+        """
+        Column from the structured values of parse actions, without scanning the tokens again
+
+        :param data_type: Data type values of _data_type_values()
+        :param array_brackets: Column array brackets string '[]' or '[][]...'
+        :param constraint: Constraint values of _constraint_values(), None if no constraint
+        :param source_database: enum DdlParse.DATABASE
+        """
+
+        col = cls.__new__(cls)
+        col._source_database = source_database
+        col._name = name
+        col._data_type, col._length, col._scale, col._flags = data_type
+        col._set_constraint_values(cls._constraint_values(None, None) if constraint is None else constraint)
+        col._array_dimensional = 0 if array_brackets is None else array_brackets.count('[]')
+        col._source_span = None
+        col._bigquery_data_type = None
+
+        return col
 
     @property
     def data_type(self):
@@ -94,11 +157,11 @@ class DdlParseColumn(DdlParseTableColumnBase):
 
     @property
     def is_unsigned(self):
-        return self._numeric_is_unsigned
+        return self._get_flag(self._UNSIGNED)
 
     @property
     def is_zerofill(self):
-        return self._numeric_is_zerofill
+        return self._get_flag(self._ZEROFILL)
 
     @property
     def length(self):
@@ -113,26 +176,66 @@ class DdlParseColumn(DdlParseTableColumnBase):
         return self._scale
 
     def _set_data_type(self, data_type_array):
-        self._data_type = ' '.join(data_type_array["type_name"]).upper()
-        self._numeric_is_unsigned = True if "unsigned" in data_type_array else False
-        self._numeric_is_zerofill = True if "zerofill" in data_type_array else False
-        self._length = None
-        self._scale = None
+        length, scale = None, None
 
         if "length" in data_type_array:
             matches = re.findall(r"([\d\*]+)\s*,*\s*(\d*)", data_type_array["length"])
             if len(matches) > 0:
-                self._length = matches[0][0] if matches[0][0] == "*" else int(matches[0][0])
-                self._scale = None if len(matches[0]) < 2 or matches[0][1] == "" or int(matches[0][1]) == 0 else int(matches[0][1])
+                length, scale = matches[0]
+
+        self._data_type, self._length, self._scale, flags = self._data_type_values(
+            data_type_array["type_name"], length, scale, "unsigned" in data_type_array, "zerofill" in data_type_array)
+        self._flags = self._flags & ~(self._UNSIGNED | self._ZEROFILL) | flags
+        self._bigquery_data_type = None
+
+    @classmethod
+    def _data_type_values(cls, type_name, length, scale, unsigned, zerofill):
+        """
+        Structured values of column data type
+
+        :param type_name[]: Data type name words
+        :param length: Length or precision string, digits or '*', None if not specified
+        :param scale: Scale string, digits or empty, None if not specified
+        :param unsigned: UNSIGNED attribute is specified
+        :param zerofill: ZEROFILL attribute is specified
+        :return: (data type, length, scale, flags)
+        """
+
+        return (
+            # Data type names are shared by the columns
+            sys.intern(' '.join(type_name).upper()),
+            None if length is None else length if length == "*" else int(length),
+            None if not scale or int(scale) == 0 else int(scale),
+            (cls._UNSIGNED if unsigned else 0) | (cls._ZEROFILL if zerofill else 0))
+
+    def _copy_data_type(self, column):
+        """Copy data type of the other column, constraints are not changed"""
+
+        self._data_type = column._data_type
+        self._set_flag(self._UNSIGNED, column.is_unsigned)
+        self._set_flag(self._ZEROFILL, column.is_zerofill)
+        self._length = column._length
+        self._scale = column._scale
+        self._array_dimensional = column._array_dimensional
+        self._bigquery_data_type = None
+
+    def _get_flag(self, flag):
+        return self._flags & flag != 0
+
+    def _set_flag(self, flag, value):
+        if value:
+            self._flags |= flag
+        else:
+            self._flags &= ~flag
 
 
     @property
     def constraint(self):
         """Constraint string"""
         constraint_arr = []
-        if self._not_null:
-            constraint_arr.append("PRIMARY KEY" if self._pk else "NOT NULL")
-        if self._unique:
+        if self.not_null:
+            constraint_arr.append("PRIMARY KEY" if self.primary_key else "NOT NULL")
+        if self.unique:
             constraint_arr.append("UNIQUE")
 
         return " ".join(constraint_arr)
@@ -144,9 +247,9 @@ class DdlParseColumn(DdlParseTableColumnBase):
         if type(constraint) is str:
             self._constraint = None if constraint is None else constraint.upper()
 
-            self._not_null = False if self._constraint is None or not re.search(r"(NOT NULL|PRIMARY KEY)", self._constraint) else True
-            self._pk = False if self._constraint is None or not re.search("PRIMARY KEY", self._constraint) else True
-            self._unique = False if self._constraint is None or not re.search("UNIQUE", self._constraint) else True
+            self.not_null = False if self._constraint is None or not re.search(r"(NOT NULL|PRIMARY KEY)", self._constraint) else True
+            self.primary_key = False if self._constraint is None or not re.search("PRIMARY KEY", self._constraint) else True
+            self.unique = False if self._constraint is None or not re.search("UNIQUE", self._constraint) else True
 
             self._comment = None
             if constraint is not None:
@@ -159,57 +262,57 @@ class DdlParseColumn(DdlParseTableColumnBase):
 
         # v1.7.0 or later
 
-        self._constraint = None if constraint is None else ' '.join(constraint).upper()
-
-        constraints = {}
-        constraints['null'] = ''
-        constraints['auto_increment'] = ''
-        constraints['key'] = ''
-        constraints['default'] = ''
-        constraints['comment'] = ''
-        constraints['encode'] = ''
-        constraints['distkey'] = ''
-        constraints['sortkey'] = ''
-        constraints['character_set'] = ''
-
+        groups = {}
         if constraint:
             for constraint_name, val in constraint.items():
-                constraints[constraint_name] = val
+                matcher = _DdlParseFastParser._COLUMN_CONSTRAINTS.get(constraint_name)
+                if matcher is not None and not isinstance(matcher, str):
+                    match = matcher.search(val)
+                    if match is not None:
+                        groups.update(match.groupdict())
 
+        self._set_constraint_values(self._constraint_values(constraint, groups))
 
-        self._pk = True if re.search("PRIMARY", constraints['key'], re.IGNORECASE) else False
-
-        self._not_null = False
-        if self._pk or re.search(r"(NOT\s+NULL)", constraints['null'], re.IGNORECASE):
-            self._not_null = True
-
-        self._unique = True if re.search("UNIQUE", constraints['key'], re.IGNORECASE) else False
-
-        self._auto_increment = True if len(constraints['auto_increment']) > 0 else False
-        self._distkey        = True if len(constraints['distkey']) > 0 else False
-        self._sortkey        = True if len(constraints['sortkey']) > 0 else False
-        self._character_set  = constraints['character_set'] if constraints['character_set'] else None
+    @classmethod
+    def _constraint_values(cls, constraint, groups):
+        """
+        Structured values of column constraints
 
-        self._encode = None
-        if constraint is not None:
-            matches = re.findall(r"\bENCODE\s+([A-Za-z0-9]+)\b", constraints['encode'], re.IGNORECASE)
-            if len(matches) > 0:
-                self._encode = matches[0]
-
-        self._default = None
-        if constraint is not None:
-            matches = re.findall(
-                r"\bDEFAULT\b\s+(?:((?:[A-Za-z0-9_\.\'\" -\{\}]|[^\x01-\x7E])*\:\:(?:character varying)?[A-Za-z0-9\[\]]+)|(?:\')((?:\\\'|[^\']|,)+)(?:\')|(?:\")((?:\\\"|[^\"]|,)+)(?:\")|([^,\s]+))",
-                constraints['default'],
-                re.IGNORECASE)
-            if len(matches) > 0:
-                self._default = ''.join(matches[0])
+        :param constraint: Column constraint strings {'null': 'NOT NULL', 'default': "DEFAULT 'abc'", ...} or None
+        :param groups: Named groups matched by the column constraint patterns of parser
+        :return: (constraint string, flags, default, comment, encode, character set)
+        """
 
-        self._comment = None
-        if constraint is not None:
-            matches = re.findall(r"\bCOMMENT\b\s+(?:(?:\')((?:\\\'|[^\']|,)+)(?:\')|(?:\")((?:\\\"|[^\"]|,)+)(?:\")|([^,\s]+))", constraints['comment'], re.IGNORECASE)
-            if len(matches) > 0:
-                self._comment = ''.join(matches[0])
+        if constraint is None:
+            return None, 0, None, None, None, None
+
+        key_type = (groups.get("key_type") or "").upper()
+
+        flags = 0
+        if key_type == "PRIMARY":
+            flags |= cls._PRIMARY_KEY | cls._NOT_NULL
+        elif key_type == "UNIQUE":
+            flags |= cls._UNIQUE
+        if groups.get("not_null"):
+            flags |= cls._NOT_NULL
+        if constraint.get("auto_increment"):
+            flags |= cls._AUTO_INCREMENT
+        if constraint.get("distkey"):
+            flags |= cls._DISTKEY
+        if constraint.get("sortkey"):
+            flags |= cls._SORTKEY
+
+        return (
+            ' '.join(constraint.values()).upper(),
+            flags,
+            ''.join(groups.get(name) or '' for name in ("default_cast", "default_single", "default_double", "default_word")) or None,
+            ''.join(groups.get(name) or '' for name in ("comment_single", "comment_double", "comment_word")) or None,
+            groups.get("encode_type"),
+            constraint.get("character_set") or None)
+
+    def _set_constraint_values(self, values):
+        self._constraint, flags, self._default, self._comment, self._encode, self._character_set = values
+        self._flags = self._flags & (self._UNSIGNED | self._ZEROFILL) | flags
 
 
     @property
@@ -233,41 +336,61 @@ class DdlParseColumn(DdlParseTableColumnBase):
         """array dimensional number"""
         return self._array_dimensional
 
+    @property
+    def source_span(self):
+        """
+        (start, end) offsets of column definition in DDL script, None if unknown
+
+        Offsets are relative to each CREATE TABLE statement for DdlParse.iter_tables() and the other multiple tables APIs.
+        None after the table is altered by DdlParse.alter() or DdlParse.replay().
+        """
+        span = self._source_span
+        if span is None or type(span) is tuple:
+            return span
+        return span >> 32, span & 0xFFFFFFFF
+
+    @source_span.setter
+    def source_span(self, span):
+        # Packed into an int (a tuple is 3 objects), the tuple is built on access. Offsets over 4 GiB are kept as is
+        if span is not None and 0 <= span[1] < 1 << 32:
+            span = span[0] << 32 | span[1]
+        self._source_span = span
+
     @property
     def not_null(self):
-        return self._not_null
+        return self._get_flag(self._NOT_NULL)
 
     @not_null.setter
     def not_null(self, flag):
-        self._not_null = flag
+        self._set_flag(self._NOT_NULL, flag)
 
     @property
     def primary_key(self):
-        return self._pk
+        return self._get_flag(self._PRIMARY_KEY)
 
     @primary_key.setter
     def primary_key(self, flag):
-        self._pk = flag
+        self._set_flag(self._PRIMARY_KEY, flag)
 
     @property
     def unique(self):
-        return self._unique
+        return self._get_flag(self._UNIQUE)
 
     @unique.setter
     def unique(self, flag):
-        self._unique = flag
+        self._set_flag(self._UNIQUE, flag)
 
     @property
     def auto_increment(self):
-        return self._auto_increment
+        return self._get_flag(self._AUTO_INCREMENT)
 
     @property
     def distkey(self):
-        return self._distkey
+        return self._get_flag(self._DISTKEY)
 
     @property
     def sortkey(self):
-        return self._sortkey
+        return self._get_flag(self._SORTKEY)
 
     @property
     def encode(self):
@@ -281,41 +404,50 @@ class DdlParseColumn(DdlParseTableColumnBase):
     def character_set(self):
         return self._character_set
 
+    @property
+    def source_database(self):
+        """
+        Source database option
+
+        :param source_database: enum DdlParse.DATABASE
+        """
+        return super().source_database
+
+    @source_database.setter
+    def source_database(self, source_database):
+        super(self.__class__, self.__class__).source_database.__set__(self, source_database)
+        self._bigquery_data_type = None
+
     @property
     def bigquery_data_type(self):
         """Get BigQuery Legacy SQL data type"""
 
-        # BigQuery data type = {source_database: [data type, ...], ...}
-        BQ_DATA_TYPE_DIC = OrderedDict()
-        BQ_DATA_TYPE_DIC["STRING"] = {None: [re.compile(r"(STRING|CHAR|TEXT|CLOB|JSON|UUID)")]}
-        BQ_DATA_TYPE_DIC["INTEGER"] = {None: [re.compile(r"INT|SERIAL|YEAR")]}
-        BQ_DATA_TYPE_DIC["FLOAT"] = {None: [re.compile(r"(FLOAT|DOUBLE)"), "REAL", "MONEY"]}
-        BQ_DATA_TYPE_DIC["DATETIME"] = {
-            None: ["DATETIME", "TIMESTAMP", "TIMESTAMP WITHOUT TIME ZONE"],
-            self.DATABASE.oracle: ["DATE"]
-        }
-        BQ_DATA_TYPE_DIC["TIMESTAMP"] = {None: ["TIMESTAMPTZ", "TIMESTAMP WITH TIME ZONE"]}
-        BQ_DATA_TYPE_DIC["DATE"] = {None: ["DATE"]}
-        BQ_DATA_TYPE_DIC["TIME"] = {None: ["TIME"]}
-        BQ_DATA_TYPE_DIC["BOOLEAN"] = {None: [re.compile(r"BOOL")]}
-        BQ_DATA_TYPE_DIC["BYTES"] = {None: ["BYTES", "BINARY", "VARBINARY", "BYTEA"]}
+        # Memoized until data type or source database is changed
+        if self._bigquery_data_type is None:
+            profile = _LOCAL.profile
+            if profile is None:
+                self._bigquery_data_type = self._map_bigquery_data_type()
+            else:
+                profile._enter("bigquery_data_type")
+                try:
+                    self._bigquery_data_type = self._map_bigquery_data_type()
+                finally:
+                    profile._exit()
 
-        for bq_type, conditions in BQ_DATA_TYPE_DIC.items():
-            for source_db, source_datatypes in conditions.items():
-                for source_datatype in source_datatypes:
+        return self._bigquery_data_type
 
-                    if isinstance(source_datatype, str):
-                        if self._data_type == source_datatype \
-                            and (  self._source_database == source_db
-                                or (self._source_database is not None and source_db is None)):
-                            return bq_type
+    def _map_bigquery_data_type(self):
+        key = (self._source_database, self._data_type)
 
-                    elif re.search(source_datatype, self._data_type) \
-                        and (  self._source_database == source_db
-                            or (self._source_database is not None and source_db is None)):
-                        return bq_type
+        try:
+            bq_type = self._bq_data_type_index[key]
+        except KeyError:
+            bq_type = self._bq_data_type_index[key] = self._find_bigquery_data_type(*key)
+
+        if bq_type is not None:
+            return bq_type
 
-        if self._data_type in ["NUMERIC", "NUMBER", "DECIMAL", "DEC", "FIXED"]:
+        if self._data_type in self._BQ_NUMERIC_DATA_TYPES:
             if self._length is None:
                 if self._source_database in [self.DATABASE.oracle, self.DATABASE.postgresql]:
                     return "NUMERIC"
@@ -335,6 +467,26 @@ class DdlParseColumn(DdlParseTableColumnBase):
 
         raise ValueError("Unknown data type : '{}'".format(self._data_type))
 
+    @classmethod
+    def _find_bigquery_data_type(cls, source_database, data_type):
+        """Find BigQuery data type by the rules of _BQ_DATA_TYPE_DIC, return None if no rule matches"""
+
+        for bq_type, conditions in cls._BQ_DATA_TYPE_DIC.items():
+            for source_db, source_datatypes in conditions.items():
+                if source_db is not None and source_db != source_database:
+                    continue
+
+                for source_datatype in source_datatypes:
+
+                    if isinstance(source_datatype, str):
+                        if data_type == source_datatype:
+                            return bq_type
+
+                    elif source_datatype.search(data_type):
+                        return bq_type
+
+        return None
+
     @property
     def bigquery_legacy_data_type(self):
         """Get BigQuery Legacy SQL data type"""
@@ -347,14 +499,7 @@ class DdlParseColumn(DdlParseTableColumnBase):
 
         legacy_data_type = self.bigquery_data_type
 
-        if legacy_data_type == "INTEGER":
-            return "INT64"
-        elif legacy_data_type == "FLOAT":
-            return "FLOAT64"
-        elif legacy_data_type == "BOOLEAN":
-            return "BOOL"
-
-        return legacy_data_type
+        return self._BQ_STANDARD_DATA_TYPE_DIC.get(legacy_data_type, legacy_data_type)
 
     @property
     def bigquery_mode(self):
@@ -370,12 +515,27 @@ class DdlParseColumn(DdlParseTableColumnBase):
     def to_bigquery_field(self, name_case=DdlParseBase.NAME_CASE.original):
         """Generate BigQuery JSON field define"""
 
-        col_name = self.get_name(name_case)
-        mode = self.bigquery_mode
+        return _JSON_ENCODER.encode(self.to_bigquery_schema(name_case))
+
+    def to_bigquery_schema(self, name_case=DdlParseBase.NAME_CASE.original):
+        """
+        Generate BigQuery field define of dict, same as json.loads() of to_bigquery_field()
+
+        :param name_case: name case type
+            * DdlParse.NAME_CASE.original : Return to no convert
+            * DdlParse.NAME_CASE.lower : Return to lower
+            * DdlParse.NAME_CASE.upper : Return to upper
+
+        :return: BigQuery field define of OrderedDict, with nested RECORD fields of multiple dimensional array
+        """
+
+        return self._bigquery_schema(self.get_name(name_case), self.bigquery_legacy_data_type, self.bigquery_mode, self.description, self.array_dimensional)
 
-        if self.array_dimensional <= 1:
+    @staticmethod
+    def _bigquery_schema(col_name, data_type, mode, description, array_dimensional):
+        if array_dimensional <= 1:
             # no or one dimensional array data type
-            type = self.bigquery_legacy_data_type
+            type = data_type
 
         else:
             # multiple dimensional array data type
@@ -384,46 +544,221 @@ class DdlParseColumn(DdlParseTableColumnBase):
             fields = OrderedDict()
             fields_cur = fields
 
-            for i in range(1, self.array_dimensional):
-                is_last = True if i == self.array_dimensional - 1 else False
+            for i in range(1, array_dimensional):
+                is_last = True if i == array_dimensional - 1 else False
 
                 fields_cur['fields'] = [OrderedDict()]
                 fields_cur = fields_cur['fields'][0]
 
                 fields_cur['name'] = "dimension_{}".format(i)
-                fields_cur['type'] = self.bigquery_legacy_data_type if is_last else "RECORD"
-                fields_cur['mode'] = self.bigquery_mode if is_last else "REPEATED"
+                fields_cur['type'] = data_type if is_last else "RECORD"
+                fields_cur['mode'] = mode if is_last else "REPEATED"
 
         col = OrderedDict()
         col['name'] = col_name
         col['type'] = type
         col['mode'] = mode
-        if self.description is not None:
-            col['description'] = self.description
-        if self.array_dimensional > 1:
+        if description is not None:
+            col['description'] = description
+        if array_dimensional > 1:
             col['fields'] = fields['fields']
 
-        return json.dumps(col, ensure_ascii=False)
+        return col
+
+    @staticmethod
+    def _bigquery_ddl(col_name, data_type, not_null, description, array_dimensional):
+        if array_dimensional < 1:
+            # no array data type
+            type = data_type
+            not_null = " NOT NULL" if not_null else ""
+
+        else:
+            # one or multiple dimensional array data type
+            type_front = "ARRAY<"
+            type_back = ">"
+            for i in range(1, array_dimensional):
+                type_front += "STRUCT<dimension_{} ARRAY<".format(i)
+                type_back += ">>"
+
+            type = "{}{}{}".format(type_front, data_type, type_back)
+            not_null = ""
+
+        return "{name} {type}{not_null}{description}".format(
+            name=col_name,
+            type=type,
+            not_null=not_null,
+            description=' OPTIONS (description = "{}")'.format(description.replace('"', '\\"')) if description is not None else "",
+        )
 
 
-class DdlParseColumnDict(OrderedDict, DdlParseBase):
+class DdlParseColumnDict(dict, DdlParseBase):
     """
     Columns dictionary collection
 
-    * Orderd dictionary
+    * Orderd dictionary (insertion order of dict)
     * Dict with case insensitive keys
       (SQL is case insensitive)
+    * Lookup by column ordinal
     """
 
+    __slots__ = ("_source_database", "_folded_keys", "_aliases", "_ordinals")
+
     def __init__(self, source_database=None):
         super().__init__()
         self.source_database = source_database
 
+        # Spellings of the column names other than the case-folded key, cached on lookup of the existing columns only,
+        # and the reverse index to remove them with the column. Ordinals are indexed on demand
+        self._folded_keys = {}
+        self._aliases = {}
+        self._ordinals = None
+
+    def __reduce__(self):
+        return self.__class__, (self._source_database,), None, None, iter(dict.items(self))
+
     def __getitem__(self, key):
-        return super().__getitem__(key.lower())
+        # Hot path : no method call for the case-folded key and the cached spelling
+        try:
+            return dict.__getitem__(self, self._folded_keys.get(key, key))
+        except KeyError:
+            pass
+        return dict.__getitem__(self, self._fold(key))
 
     def __setitem__(self, key, value):
-        super().__setitem__(key.lower(), value)
+        folded_key = self._fold(key)
+
+        if not dict.__contains__(self, folded_key):
+            self._ordinals = None
+
+        dict.__setitem__(self, folded_key, value)
+
+    def __delitem__(self, key):
+        self._ordinals = None
+        folded_key = self._fold(key)
+        dict.__delitem__(self, folded_key)
+        self._forget(folded_key)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, self._fold(key))
+
+    def get(self, key, default=None):
+        return dict.get(self, self._fold(key), default)
+
+    def pop(self, key, *args):
+        self._ordinals = None
+        folded_key = self._fold(key)
+        value = dict.pop(self, folded_key, *args)
+        self._forget(folded_key)
+        return value
+
+    def popitem(self, last=True):
+        self._ordinals = None
+        if last:
+            key, value = dict.popitem(self)
+        else:
+            if not self:
+                raise KeyError("dictionary is empty")
+            key = next(iter(self))
+            value = dict.pop(self, key)
+        self._forget(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        # dict.update() does not call __setitem__()
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        self._ordinals = None
+        self._folded_keys.clear()
+        self._aliases.clear()
+        dict.clear(self)
+
+    def move_to_end(self, key, last=True):
+        """Move the column to the end, or to the beginning if last is False, same as OrderedDict.move_to_end()"""
+
+        self._ordinals = None
+        key = self._fold(key)
+        value = dict.pop(self, key)
+
+        if last:
+            dict.__setitem__(self, key, value)
+        else:
+            items = list(dict.items(self))
+            dict.clear(self)
+            dict.__setitem__(self, key, value)
+            dict.update(self, items)
+
+    def copy(self):
+        columns = self.__class__(self.source_database)
+        dict.update(columns, self)
+        return columns
+
+    def at(self, ordinal):
+        """
+        Column by the ordinal
+
+        :param ordinal: Ordinal of the column from 0, negative is from the last column
+        """
+
+        return dict.__getitem__(self, self._ordinal_index()[0][ordinal])
+
+    def index(self, column_name):
+        """
+        Ordinal of the column from 0
+
+        :param column_name: Column name
+        """
+
+        return self._ordinal_index()[1][self._fold(column_name)]
+
+    def _fold(self, key):
+        """Case-folded key, keys other than str are never case-folded, and not found"""
+
+        folded_key = self._folded_keys.get(key, key)
+        if dict.__contains__(self, folded_key) or not isinstance(key, str):
+            return folded_key
+
+        folded_key = key.lower()
+        if folded_key != key and dict.__contains__(self, folded_key):
+            # Cache the spelling of the existing column, e.g. the column names of table constraints
+            self._folded_keys[key] = folded_key
+            aliases = self._aliases.get(folded_key)
+            if aliases is None:
+                # Single spelling without a set, the common case
+                self._aliases[folded_key] = key
+            elif isinstance(aliases, str):
+                self._aliases[folded_key] = {aliases, key}
+            else:
+                aliases.add(key)
+
+        return folded_key
+
+    def _forget(self, folded_key):
+        """Remove the cached spellings of the column name case-folded to folded_key"""
+
+        aliases = self._aliases.pop(folded_key, None)
+        if aliases is not None:
+            for key in (aliases,) if isinstance(aliases, str) else aliases:
+                del self._folded_keys[key]
+
+    def _ordinal_index(self):
+        """([folded key, ...], {folded key: ordinal, ...}), built once until the columns are added, deleted or moved"""
+
+        if self._ordinals is None:
+            keys = list(dict.keys(self))
+            self._ordinals = (keys, {key: ordinal for ordinal, key in enumerate(keys)})
+
+        return self._ordinals
 
     def append(self, column_name, data_type_array=None, array_brackets=None, constraint=None, source_database=None):
         if source_database is None:
@@ -433,6 +768,63 @@ class DdlParseColumnDict(OrderedDict, DdlParseBase):
         self.__setitem__(column_name, column)
         return column
 
+    def move(self, column_name, after=None, first=False):
+        """
+        Move the column.
+
+        :param column_name: Column name
+        :param after: Column name to move after, None is the last column
+        :param first: Move to the first column
+        """
+
+        key = self._fold(column_name)
+        self.move_to_end(key, last=not first)
+
+        if after is not None and not first and self._fold(after) != key:
+            # KeyError if not exists
+            self[after]
+            keys = list(super().keys())
+            for following_key in keys[keys.index(self._fold(after)) + 1:-1]:
+                self.move_to_end(following_key)
+
+    def replace(self, column_name, column):
+        """
+        Replace the column at the same position.
+
+        :param column_name: Column name to be replaced
+        :param column: DdlParseColumn, new column which can have the other name
+        """
+
+        key = self._fold(column_name)
+        new_key = self._fold(column.name)
+        # KeyError if not exists
+        self[column_name]
+
+        if new_key != key and new_key in self:
+            raise ValueError("Column already exists: {}".format(column.name))
+
+        keys = list(super().keys())
+        del self[column_name]
+        self[column.name] = column
+
+        for following_key in keys[keys.index(key) + 1:]:
+            self.move_to_end(following_key)
+
+    def rename(self, column_name, new_column_name):
+        """
+        Rename the column at the same position.
+
+        :param column_name: Column name
+        :param new_column_name: New column name
+        """
+
+        if self._fold(new_column_name) != self._fold(column_name) and new_column_name in self:
+            raise ValueError("Column already exists: {}".format(new_column_name))
+
+        column = self[column_name]
+        column.name = new_column_name
+        self.replace(column_name, column)
+
     def to_bigquery_fields(self, name_case=DdlParseBase.NAME_CASE.original):
         """
         Generate BigQuery JSON fields define
@@ -452,15 +844,35 @@ class DdlParseColumnDict(OrderedDict, DdlParseBase):
 
         return "[{}]".format(",".join(bq_fields))
 
+    def to_bigquery_schema(self, name_case=DdlParseBase.NAME_CASE.original):
+        """
+        Generate BigQuery fields define of list, same as json.loads() of to_bigquery_fields()
+
+        :param name_case: name case type
+            * DdlParse.NAME_CASE.original : Return to no convert
+            * DdlParse.NAME_CASE.lower : Return to lower
+            * DdlParse.NAME_CASE.upper : Return to upper
+
+        :return: BigQuery fields define of list of OrderedDict
+        """
+
+        return [col.to_bigquery_schema(name_case) for col in self.values()]
+
 
 class DdlParseTable(DdlParseTableColumnBase):
     """Table define info"""
 
+    __slots__ = ("_schema", "_is_temp", "_columns", "_definitions")
+
     def __init__(self, source_database=None):
         super().__init__(source_database)
         self._schema = None
         self._columns = DdlParseColumnDict(source_database)
 
+        # Table constraint definitions in order : ((start, end), type, [column name, ...]),
+        # the column definitions are the columns with source_span, see DdlParse._table_definitions()
+        self._definitions = []
+
     @property
     def source_database(self):
         """
@@ -512,6 +924,20 @@ class DdlParseTable(DdlParseTableColumnBase):
 
         return self._columns.to_bigquery_fields(name_case)
 
+    def to_bigquery_schema(self, name_case=DdlParseBase.NAME_CASE.original):
+        """
+        Generate BigQuery fields define of list, same as json.loads() of to_bigquery_fields()
+
+        :param name_case: name case type
+            * DdlParse.NAME_CASE.original : Return to no convert
+            * DdlParse.NAME_CASE.lower : Return to lower
+            * DdlParse.NAME_CASE.upper : Return to upper
+
+        :return: BigQuery fields define of list of OrderedDict
+        """
+
+        return self._columns.to_bigquery_schema(name_case)
+
     def to_bigquery_ddl(self, name_case=DdlParseBase.NAME_CASE.original):
         """
         Generate BigQuery CREATE TABLE statements
@@ -524,6 +950,14 @@ class DdlParseTable(DdlParseTableColumnBase):
         :return: BigQuery CREATE TABLE statements
         """
 
+        cols_defs = []
+        for col in self.columns.values():
+            cols_defs.append(DdlParseColumn._bigquery_ddl(
+                col.get_name(name_case), col.bigquery_standard_data_type, col.not_null, col.description, col.array_dimensional))
+
+        return self._bigquery_ddl(name_case, cols_defs)
+
+    def _bigquery_ddl(self, name_case, cols_defs):
         if self.schema is None:
             dataset = "dataset"
         elif name_case == self.NAME_CASE.lower:
@@ -533,34 +967,6 @@ class DdlParseTable(DdlParseTableColumnBase):
         else:
             dataset = self.schema
 
-        cols_defs = []
-        for col in self.columns.values():
-            col_name = col.get_name(name_case)
-
-            if col.array_dimensional < 1:
-                # no array data type
-                type = col.bigquery_standard_data_type
-                not_null = " NOT NULL" if col.not_null else ""
-
-            else:
-                # one or multiple dimensional array data type
-                type_front = "ARRAY<"
-                type_back = ">"
-                for i in range(1, col.array_dimensional):
-                    type_front += "STRUCT<dimension_{} ARRAY<".format(i)
-                    type_back += ">>"
-
-                type = "{}{}{}".format(type_front, col.bigquery_standard_data_type, type_back)
-                not_null = ""
-
-            # cols_defs.append("{name} {type}{not_null}".format(
-            cols_defs.append("{name} {type}{not_null}{description}".format(
-                name=col_name,
-                type=type,
-                not_null=not_null,
-                description=' OPTIONS (description = "{}")'.format(col.description.replace('"', '\\"')) if col.description is not None else "",
-            ))
-
         return textwrap.dedent(
             """\
             #standardSQL
@@ -574,175 +980,3925 @@ class DdlParseTable(DdlParseTableColumnBase):
         )
 
 
-class DdlParse(DdlParseBase):
-    """DDL parser"""
+class DdlParseTableDict(OrderedDict, DdlParseBase):
+    """
+    Tables dictionary collection
 
-    _LPAR, _RPAR, _COMMA, _SEMICOLON, _DOT, _DOUBLEQUOTE, _BACKQUOTE, _SPACE = map(Suppress, "(),;.\"` ")
-    _CREATE, _TABLE, _TEMP, _CONSTRAINT, _NOT_NULL, _PRIMARY_KEY, _UNIQUE, _UNIQUE_KEY, _FOREIGN_KEY, _REFERENCES, _KEY, _CHAR_SEMANTICS, _BYTE_SEMANTICS = \
-        map(CaselessKeyword, "CREATE, TABLE, TEMP, CONSTRAINT, NOT NULL, PRIMARY KEY, UNIQUE, UNIQUE KEY, FOREIGN KEY, REFERENCES, KEY, CHAR, BYTE".replace(", ", ",").split(","))
-    _TYPE_UNSIGNED, _TYPE_ZEROFILL = \
-        map(CaselessKeyword, "UNSIGNED, ZEROFILL".replace(", ", ",").split(","))
-    _COL_ATTR_DISTKEY, _COL_ATTR_SORTKEY, _COL_ATTR_CHARACTER_SET = \
-        map(CaselessKeyword, "DISTKEY, SORTKEY, CHARACTER SET".replace(", ", ",").split(","))
-    _FK_MATCH = \
-        CaselessKeyword("MATCH") + Word(alphanums + "_")
-    _FK_ON, _FK_ON_OPT_RESTRICT, _FK_ON_OPT_CASCADE, _FK_ON_OPT_SET_NULL, _FK_ON_OPT_NO_ACTION = \
-        map(CaselessKeyword, "ON, RESTRICT, CASCADE, SET NULL, NO ACTION".replace(", ", ",").split(","))
-    _FK_ON_DELETE = \
-        _FK_ON + CaselessKeyword("DELETE") + (_FK_ON_OPT_RESTRICT | _FK_ON_OPT_CASCADE | _FK_ON_OPT_SET_NULL | _FK_ON_OPT_NO_ACTION)
-    _FK_ON_UPDATE = \
-        _FK_ON + CaselessKeyword("UPDATE") + (_FK_ON_OPT_RESTRICT | _FK_ON_OPT_CASCADE | _FK_ON_OPT_SET_NULL | _FK_ON_OPT_NO_ACTION)
-    _SUPPRESS_QUOTE = _BACKQUOTE | _DOUBLEQUOTE
-
-    _COMMENT = Suppress("--" + Regex(r".+"))
-
-
-    _CREATE_TABLE_STATEMENT = Suppress(_CREATE) + Optional(_TEMP)("temp") + Suppress(_TABLE) + Optional(Suppress(CaselessKeyword("IF NOT EXISTS"))) \
-        + Optional(_SUPPRESS_QUOTE) + Optional(Word(alphanums + "_")("schema") + Optional(_SUPPRESS_QUOTE) + _DOT + Optional(_SUPPRESS_QUOTE)) + Word(alphanums + "_<>")("table") + Optional(_SUPPRESS_QUOTE) \
-        + _LPAR \
-        + delimitedList(
-            OneOrMore(
-                _COMMENT
-                |
-                # Ignore Index
-                Suppress(_KEY + Word(alphanums + "_'`() "))
-                |
-                Group(
-                    Optional(Suppress(_CONSTRAINT) + Optional(_SUPPRESS_QUOTE) + Word(alphanums + "_")("name") + Optional(_SUPPRESS_QUOTE))
-                    + (
-                        (
-                            (_PRIMARY_KEY ^ _UNIQUE ^ _UNIQUE_KEY ^ _NOT_NULL)("type")
-                            + Optional(_SUPPRESS_QUOTE) + Optional(Word(alphanums + "_"))("name") + Optional(_SUPPRESS_QUOTE)
-                            + _LPAR + Group(delimitedList(Optional(_SUPPRESS_QUOTE) + Word(alphanums + "_") + Optional(_SUPPRESS_QUOTE)))("constraint_columns") + _RPAR
-                        )
-                        |
-                        (
-                            (_FOREIGN_KEY)("type")
-                            + _LPAR + Group(delimitedList(Optional(_SUPPRESS_QUOTE) + Word(alphanums + "_") + Optional(_SUPPRESS_QUOTE)))("constraint_columns") + _RPAR
-                            + Optional(Suppress(_REFERENCES)
-                                + Optional(_SUPPRESS_QUOTE) + Word(alphanums + "_")("references_table") + Optional(_SUPPRESS_QUOTE)
-                                + _LPAR + Group(delimitedList(Optional(_SUPPRESS_QUOTE) + Word(alphanums + "_") + Optional(_SUPPRESS_QUOTE)))("references_columns") + _RPAR
-                                + Optional(_FK_MATCH)("references_fk_match")  # MySQL
-                                + Optional(_FK_ON_DELETE)("references_fk_on_delete")  # MySQL
-                                + Optional(_FK_ON_UPDATE)("references_fk_on_update")  # MySQL
-                            )
-                        )
-                    )
-                )("constraint")
-                |
-                Group(
-                    ((_SUPPRESS_QUOTE + Word(alphanums + " _")("name") + _SUPPRESS_QUOTE) ^ (Optional(_SUPPRESS_QUOTE) + Word(alphanums + "_")("name") + Optional(_SUPPRESS_QUOTE)))
-                    + Group(
-                        Group(
-                            Word(alphanums + "_")
-                            + Optional(CaselessKeyword("WITHOUT TIME ZONE") ^ CaselessKeyword("WITH TIME ZONE") ^ CaselessKeyword("PRECISION") ^ CaselessKeyword("VARYING"))
-                        )("type_name")
-                        + Optional(_LPAR + Regex(r"[\d\*]+\s*,*\s*\d*")("length") + Optional(_CHAR_SEMANTICS | _BYTE_SEMANTICS)("semantics") + _RPAR)
-                        + Optional(_TYPE_UNSIGNED)("unsigned")
-                        + Optional(_TYPE_ZEROFILL)("zerofill")
-                    )("type")
-                    + Optional(Word(r"\[\]"))("array_brackets")
-                    + Optional(
-                        Regex(r"(?!--)", re.IGNORECASE)
-                        + Group(
-                            Optional(Regex(r"\b(?:NOT\s+)?NULL?\b", re.IGNORECASE))("null")
-                            & Optional(Regex(r"\bAUTO_INCREMENT\b", re.IGNORECASE))("auto_increment")
-                            & Optional(Regex(r"\b(UNIQUE|PRIMARY)(?:\s+KEY)?\b", re.IGNORECASE))("key")
-                            & Optional(Regex(
-                                r"\bDEFAULT\b\s+(?:((?:[A-Za-z0-9_\.\'\" -\{\}]|[^\x01-\x7E])*\:\:(?:character varying)?[A-Za-z0-9\[\]]+)|(?:\')((?:\\\'|[^\']|,)+)(?:\')|(?:\")((?:\\\"|[^\"]|,)+)(?:\")|([^,\s]+))",
-                                re.IGNORECASE))("default")
-                            & Optional(Regex(r"\bCOMMENT\b\s+(\'(\\\'|[^\']|,)+\'|\"(\\\"|[^\"]|,)+\"|[^,\s]+)", re.IGNORECASE))("comment")
-                            & Optional(Regex(r"\bENCODE\s+[A-Za-z0-9]+\b", re.IGNORECASE))("encode")  # Redshift
-                            & Optional(_COL_ATTR_DISTKEY)("distkey")  # Redshift
-                            & Optional(_COL_ATTR_SORTKEY)("sortkey")  # Redshift
-                            & Optional(Suppress(_COL_ATTR_CHARACTER_SET) + Word(alphanums + "_")("character_set"))  # MySQL
-                        )("constraint")
-                    )
-                )("column")
-                |
-                _COMMENT
-            )
-        )("columns")
-
-    _DDL_PARSE_EXPR = Forward()
-    _DDL_PARSE_EXPR << OneOrMore(_COMMENT | _CREATE_TABLE_STATEMENT)
-
-
-    def __init__(self, ddl=None, source_database=None):
-        super().__init__(source_database)
-        self._ddl = ddl
-        self._table = DdlParseTable(source_database)
+    * Orderd dictionary
+    * Dict with case insensitive keys, "schema.table" or "table"
+      (SQL is case insensitive)
+    """
 
-    @property
-    def source_database(self):
+    def __init__(self, source_database=None):
+        super().__init__()
+        self.source_database = source_database
+
+    def __getitem__(self, key):
+        return super().__getitem__(key.lower())
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key.lower(), value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key.lower())
+
+    def __contains__(self, key):
+        return super().__contains__(key.lower())
+
+    @staticmethod
+    def key(schema, name):
         """
-        Source database option
+        Key of the table.
 
-        :param source_database: enum DdlParse.DATABASE
+        :param schema: Schema name, None if the table name is not qualified
+        :param name: Table name
+        :return: "schema.table" or "table"
         """
-        return super().source_database
 
-    @source_database.setter
-    def source_database(self, source_database):
-        super(self.__class__, self.__class__).source_database.__set__(self, source_database)
-        self._table.source_database = source_database
+        return name if schema is None else "{}.{}".format(schema, name)
+
+
+class DdlParseColumnStore():
+    """
+    Columnar store of the columns of tables
+
+    * Names, data types, lengths, scales and flags of columns are stored in parallel arrays
+    * Bulk queries over many columns (e.g. warehouse catalog) return masks, NumPy arrays if enabled
+    * DdlParseColumn of a stored column is available on demand
+    """
+
+    # Values of lengths and scales arrays
+    LENGTH_NONE = -1
+    LENGTH_ASTERISK = -2
+    SCALE_NONE = -1
+
+    _FLAGS = OrderedDict([
+        ("not_null", DdlParseColumn._NOT_NULL),
+        ("primary_key", DdlParseColumn._PRIMARY_KEY),
+        ("unique", DdlParseColumn._UNIQUE),
+        ("auto_increment", DdlParseColumn._AUTO_INCREMENT),
+        ("distkey", DdlParseColumn._DISTKEY),
+        ("sortkey", DdlParseColumn._SORTKEY),
+        ("unsigned", DdlParseColumn._UNSIGNED),
+        ("zerofill", DdlParseColumn._ZEROFILL),
+    ])
+
+    # Arrays of values by the codes of categories
+    _CATEGORY_ARRAYS = {"data_types": "data_type_codes", "bigquery_data_types": "bigquery_data_type_codes"}
+
+    def __init__(self, tables=None, use_numpy=None):
+        """
+        :param tables: DdlParseTable iterable, the columns are appended
+        :param use_numpy: Return arrays and masks as NumPy arrays, None is True if NumPy is installed
+        """
+
+        if use_numpy is None:
+            try:
+                import_module("numpy")
+                use_numpy = True
+            except ImportError:
+                use_numpy = False
+        elif use_numpy:
+            import_module("numpy")
+
+        self._use_numpy = use_numpy
+
+        self._tables = []
+        self._table_indexes = array("L")
+        self._names = []
+        self._source_databases = array("B")
+        self._data_types = []
+        self._data_type_codes = array("L")
+        self._lengths = array("q")
+        self._scales = array("q")
+        self._flags = array("H")
+        self._array_dimensionals = array("H")
+        self._bigquery_data_types = []
+        self._bigquery_data_type_codes = array("L")
+
+        # Values only for DdlParseColumn of stored columns
+        self._constraints = []
+        self._defaults = []
+        self._comments = []
+        self._encodes = []
+        self._character_sets = []
+
+        self._category_codes = {}
+        self._numpy_arrays = {}
+
+        if tables is not None:
+            self.extend(tables)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __getitem__(self, index):
+        return self.column(index)
 
     @property
-    def ddl(self):
-        """DDL script"""
-        return self._ddl
+    def use_numpy(self):
+        """Arrays and masks are NumPy arrays"""
+        return self._use_numpy
 
-    @ddl.setter
-    def ddl(self, ddl):
-        self._ddl = ddl
+    @property
+    def tables(self):
+        """Table keys "schema.table" or "table", in order of appended"""
+        return list(self._tables)
 
-    def parse(self, ddl=None, source_database=None):
+    @property
+    def table_indexes(self):
+        """Index of tables for each column"""
+        return self._array("table_indexes")
+
+    @property
+    def names(self):
+        """Column names"""
+        return self._array("names")
+
+    @property
+    def data_types(self):
+        """Data types"""
+        return self._array("data_types")
+
+    @property
+    def lengths(self):
+        """Lengths or precisions, LENGTH_NONE if not specified and LENGTH_ASTERISK if '*'"""
+        return self._array("lengths")
+
+    @property
+    def scales(self):
+        """Scales, SCALE_NONE if not specified"""
+        return self._array("scales")
+
+    @property
+    def flags(self):
+        """Bit flags of flag_mask()"""
+        return self._array("flags")
+
+    @property
+    def array_dimensionals(self):
+        """Array dimensionals, 0 if not array"""
+        return self._array("array_dimensionals")
+
+    @property
+    def bigquery_data_types(self):
+        """BigQuery Legacy SQL data types, None if unknown data type"""
+        return self._array("bigquery_data_types")
+
+    def append(self, table):
         """
-        Parse DDL script.
+        Append the columns of the table
 
-        :param ddl: DDL script
-        :return: DdlParseTable, Parsed table define info.
+        :param table: DdlParseTable
         """
 
-        if ddl is not None:
-            self._ddl = ddl
+        table_index = len(self._tables)
+        self._tables.append(DdlParseTableDict.key(table.schema, table.name))
+
+        for col in table.columns.values():
+            try:
+                bq_type = col.bigquery_data_type
+            except ValueError:
+                bq_type = None
+
+            self._table_indexes.append(table_index)
+            self._names.append(col.name)
+            self._source_databases.append(0 if col.source_database is None else col.source_database)
+            self._data_type_codes.append(self._category_code("data_types", self._data_types, col.data_type))
+            self._lengths.append(self.LENGTH_NONE if col.length is None else self.LENGTH_ASTERISK if col.length == "*" else col.length)
+            self._scales.append(self.SCALE_NONE if col.scale is None else col.scale)
+            self._flags.append(col._flags)
+            self._array_dimensionals.append(col.array_dimensional)
+            self._bigquery_data_type_codes.append(self._category_code("bigquery_data_types", self._bigquery_data_types, bq_type))
+
+            self._constraints.append(col._constraint)
+            self._defaults.append(col.default)
+            self._comments.append(col.comment)
+            self._encodes.append(col.encode)
+            self._character_sets.append(col.character_set)
+
+        self._numpy_arrays.clear()
+
+    def extend(self, tables):
+        """
+        Append the columns of tables
 
-        if source_database is not None:
-            self.source_database = source_database
+        :param tables: DdlParseTable iterable
+        """
 
-        if self._ddl is None:
-            raise ValueError("DDL is not specified")
+        for table in tables:
+            self.append(table)
+
+    def column(self, index):
+        """
+        DdlParseColumn of the stored column, a new object for each call
+
+        :param index: Index of column
+        """
 
-        ret = self._DDL_PARSE_EXPR.parseString(self._ddl)
-        # print(ret.dump())
+        length, scale, flags = self._lengths[index], self._scales[index], self._flags[index]
 
-        if "schema" in ret:
-            self._table.schema = ret["schema"]
+        return DdlParseColumn._from_values(
+            self._names[index],
+            (
+                self._data_types[self._data_type_codes[index]],
+                None if length == self.LENGTH_NONE else "*" if length == self.LENGTH_ASTERISK else length,
+                None if scale == self.SCALE_NONE else scale,
+                flags),
+            "[]" * self._array_dimensionals[index],
+            (self._constraints[index], flags, self._defaults[index], self._comments[index], self._encodes[index], self._character_sets[index]),
+            None if self._source_databases[index] == 0 else DdlParseBase.DATABASE(self._source_databases[index]))
+
+    def columns(self, mask=None):
+        """
+        Yield DdlParseColumn of the stored columns
 
-        self._table.name = ret["table"]
-        self._table.is_temp = True if "temp" in ret else False
+        :param mask: Mask of columns, all columns if None
+        """
 
-        for ret_col in ret["columns"]:
+        for index in range(len(self)) if mask is None else self.indices(mask):
+            yield self.column(int(index))
 
-            if ret_col.getName() == "column":
-                # add column
-                col = self._table.columns.append(
-                    column_name=ret_col["name"],
-                    data_type_array=ret_col["type"],
-                    array_brackets=ret_col['array_brackets'] if "array_brackets" in ret_col else None,
-                    constraint=ret_col['constraint'] if "constraint" in ret_col else None)
+    def indices(self, mask):
+        """
+        Indices of columns of the mask
 
-            elif ret_col.getName() == "constraint":
-                # set column constraint
-                for col_name in ret_col["constraint_columns"]:
-                    col = self._table.columns[col_name]
-
-                    if ret_col["type"] == "PRIMARY KEY":
-                        col.not_null = True
-                        col.primary_key = True
-                    elif ret_col["type"] in ["UNIQUE", "UNIQUE KEY"]:
-                        col.unique = True
-                    elif ret_col["type"] == "NOT NULL":
-                        col.not_null = True
-
-        return self._table
+        :param mask: Mask of columns
+        """
+
+        if self._use_numpy:
+            return import_module("numpy").flatnonzero(mask)
+
+        return [index for index, selected in enumerate(mask) if selected]
+
+    def mask(self, data_type=None, bigquery_data_type=None, **flags):
+        """
+        Mask of columns matching all conditions, e.g. mask(data_type="TIMESTAMP", not_null=True)
+
+        :param data_type: Data type or data types list, case insensitive
+        :param bigquery_data_type: BigQuery Legacy SQL data type or data types list, case insensitive
+        :param flags: Flag conditions not_null, primary_key, unique, auto_increment, distkey, sortkey, unsigned, zerofill = True or False
+        """
+
+        masks = []
+
+        if data_type is not None:
+            masks.append(self._category_mask("data_types", data_type))
+
+        if bigquery_data_type is not None:
+            masks.append(self._category_mask("bigquery_data_types", bigquery_data_type))
+
+        for flag_name, value in flags.items():
+            masks.append(self.flag_mask(flag_name, value))
+
+        return self._and_masks(masks)
+
+    def flag_mask(self, flag_name, value=True):
+        """
+        Mask of columns by the flag
+
+        :param flag_name: not_null, primary_key, unique, auto_increment, distkey, sortkey, unsigned, zerofill
+        :param value: Flag value
+        """
+
+        if flag_name not in self._FLAGS:
+            raise ValueError("Unknown flag : '{}'".format(flag_name))
+
+        flag = self._FLAGS[flag_name]
+
+        if self._use_numpy:
+            return (self._array("flags") & flag != 0) == bool(value)
+
+        return [(flags & flag != 0) == bool(value) for flags in self._flags]
+
+    def _category_code(self, array_name, categories, value):
+        codes = self._category_codes.setdefault(array_name, {})
+
+        if value not in codes:
+            codes[value] = len(categories)
+            categories.append(value)
+
+        return codes[value]
+
+    def _category_mask(self, name, values):
+        if isinstance(values, str):
+            values = [values]
+
+        values = set(value.upper() for value in values)
+        matched_codes = set(code for code, category in enumerate(getattr(self, "_" + name)) if category in values)
+
+        if self._use_numpy:
+            return import_module("numpy").isin(self._array(self._CATEGORY_ARRAYS[name]), list(matched_codes))
+
+        return [code in matched_codes for code in getattr(self, "_" + self._CATEGORY_ARRAYS[name])]
+
+    def _and_masks(self, masks):
+        if self._use_numpy:
+            numpy = import_module("numpy")
+            result = numpy.ones(len(self), dtype=bool)
+            for mask in masks:
+                result &= mask
+            return result
+
+        return [all(selected) for selected in zip(*masks)] if masks else [True] * len(self)
+
+    def _array(self, name):
+        """Array of the columns, NumPy array is converted once until the next append"""
+
+        if name in self._numpy_arrays:
+            return self._numpy_arrays[name]
+
+        values = getattr(self, "_" + name)
+
+        if not self._use_numpy:
+            if name in self._CATEGORY_ARRAYS:
+                return [values[code] for code in getattr(self, "_" + self._CATEGORY_ARRAYS[name])]
+            return list(values)
+
+        numpy = import_module("numpy")
+
+        if name in self._CATEGORY_ARRAYS:
+            result = numpy.array(values, dtype=object)[self._array(self._CATEGORY_ARRAYS[name])]
+        elif name in ["names"]:
+            result = numpy.array(values, dtype=object)
+        else:
+            result = numpy.array(values, dtype=values.typecode)
+
+        self._numpy_arrays[name] = result
+        return result
+
+
+class DdlParseBigQueryWriter():
+    """
+    Streaming writer of BigQuery JSON schema
+
+    * Write the JSON fields of tables to a text file-like object column by column,
+      without building the JSON string of tables
+    * fields() and tables() return the same schema as Python lists and dicts
+    """
+
+    def __init__(self, file, name_case=DdlParseBase.NAME_CASE.original):
+        """
+        :param file: Text file-like object to write
+        :param name_case: name case type
+            * DdlParse.NAME_CASE.original : Return to no convert
+            * DdlParse.NAME_CASE.lower : Return to lower
+            * DdlParse.NAME_CASE.upper : Return to upper
+        """
+
+        self._file = file
+        self._name_case = name_case
+
+    @property
+    def name_case(self):
+        """Name case type"""
+        return self._name_case
+
+    def write_fields(self, table):
+        """
+        Write BigQuery JSON fields define of the table, same as DdlParseTable.to_bigquery_fields()
+
+        :param table: DdlParseTable or DdlParseColumnDict
+        """
+
+        write = self._file.write
+        write("[")
+
+        for i, col in enumerate(self._columns(table)):
+            if i > 0:
+                write(",")
+            write(_JSON_ENCODER.encode(col.to_bigquery_schema(self._name_case)))
+
+        write("]")
+
+    def write_tables(self, tables):
+        """
+        Write JSON object of BigQuery JSON fields define of tables, {"schema.table": [fields], ...}
+
+        :param tables: DdlParseTable iterable or DdlParseTableDict, e.g. DdlParse.iter_tables()
+        """
+
+        write = self._file.write
+        write("{")
+
+        for i, table in enumerate(self._tables(tables)):
+            if i > 0:
+                write(",")
+            write(_JSON_ENCODER.encode(self._table_key(table, self._name_case)))
+            write(":")
+            self.write_fields(table)
+
+        write("}")
+
+    @classmethod
+    def fields(cls, table, name_case=DdlParseBase.NAME_CASE.original):
+        """
+        BigQuery fields define of the table, list of OrderedDict same as json.loads() of to_bigquery_fields()
+
+        :param table: DdlParseTable or DdlParseColumnDict
+        :param name_case: name case type
+        """
+
+        return table.to_bigquery_schema(name_case)
+
+    @classmethod
+    def tables(cls, tables, name_case=DdlParseBase.NAME_CASE.original):
+        """
+        BigQuery fields define of tables, OrderedDict {"schema.table": [fields], ...}
+
+        :param tables: DdlParseTable iterable or DdlParseTableDict
+        :param name_case: name case type
+        """
+
+        return OrderedDict((cls._table_key(table, name_case), cls.fields(table, name_case)) for table in cls._tables(tables))
+
+    @staticmethod
+    def _columns(table):
+        return (table.columns if isinstance(table, DdlParseTable) else table).values()
+
+    @staticmethod
+    def _tables(tables):
+        return tables.values() if isinstance(tables, DdlParseTableDict) else tables
+
+    @staticmethod
+    def _table_key(table, name_case):
+        schema = table.schema
+
+        if schema is not None and name_case == DdlParseBase.NAME_CASE.lower:
+            schema = schema.lower()
+        elif schema is not None and name_case == DdlParseBase.NAME_CASE.upper:
+            schema = schema.upper()
+
+        return DdlParseTableDict.key(schema, table.get_name(name_case))
+
+
+class DdlParseEmitColumn():
+    """
+    Derived values of the column for schema emission
+
+    * Computed once for each column by DdlParseEmitter, and shared by all targets
+    """
+
+    __slots__ = ("column", "name", "bigquery_mode", "description", "not_null", "array_dimensional",
+                 "_bigquery_legacy_data_type", "_bigquery_schema")
+
+    def __init__(self, column, name_case=DdlParseBase.NAME_CASE.original):
+        """
+        :param column: DdlParseColumn
+        :param name_case: name case type
+            * DdlParse.NAME_CASE.original : Return to no convert
+            * DdlParse.NAME_CASE.lower : Return to lower
+            * DdlParse.NAME_CASE.upper : Return to upper
+        """
+
+        self.column = column
+        self.name = column.get_name(name_case)
+        self.bigquery_mode = column.bigquery_mode
+        self.description = column.description
+        self.not_null = column.not_null
+        self.array_dimensional = column.array_dimensional
+        self._bigquery_legacy_data_type = None
+        self._bigquery_schema = None
+
+    @property
+    def bigquery_legacy_data_type(self):
+        """
+        BigQuery Legacy SQL data type, same as DdlParseColumn.bigquery_legacy_data_type
+
+        * Mapped on first access, the targets without BigQuery data type do not fail on unknown data type
+        """
+
+        if self._bigquery_legacy_data_type is None:
+            self._bigquery_legacy_data_type = self.column.bigquery_data_type
+
+        return self._bigquery_legacy_data_type
+
+    @property
+    def bigquery_standard_data_type(self):
+        """BigQuery Standard SQL data type, same as DdlParseColumn.bigquery_standard_data_type"""
+
+        legacy_data_type = self.bigquery_legacy_data_type
+
+        return DdlParseColumn._BQ_STANDARD_DATA_TYPE_DIC.get(legacy_data_type, legacy_data_type)
+
+    @property
+    def bigquery_schema(self):
+        """BigQuery field define of OrderedDict, same as DdlParseColumn.to_bigquery_schema()"""
+
+        if self._bigquery_schema is None:
+            self._bigquery_schema = DdlParseColumn._bigquery_schema(
+                self.name, self.bigquery_legacy_data_type, self.bigquery_mode, self.description, self.array_dimensional)
+
+        return self._bigquery_schema
+
+
+class DdlParseEmitTarget():
+    """
+    Target writer of DdlParseEmitter
+
+    * Override begin(), column() and end() to write a custom target
+    """
+
+    def begin(self, table, name_case):
+        """
+        Begin the emission of the table
+
+        :param table: DdlParseTable
+        :param name_case: name case type
+        """
+
+        pass
+
+    def column(self, column):
+        """
+        Emit the column
+
+        :param column: DdlParseEmitColumn
+        """
+
+        pass
+
+    def end(self):
+        """
+        End the emission of the table
+
+        :return: Result of the target for the table
+        """
+
+        return None
+
+
+class DdlParseBigQueryFieldsTarget(DdlParseEmitTarget):
+    """Target of BigQuery JSON fields define, same as DdlParseTable.to_bigquery_fields()"""
+
+    def begin(self, table, name_case):
+        self._fields = []
+
+    def column(self, column):
+        self._fields.append(_JSON_ENCODER.encode(column.bigquery_schema))
+
+    def end(self):
+        return "[{}]".format(",".join(self._fields))
+
+
+class DdlParseBigQuerySchemaTarget(DdlParseEmitTarget):
+    """Target of BigQuery fields define of list of OrderedDict, same as DdlParseTable.to_bigquery_schema()"""
+
+    def begin(self, table, name_case):
+        self._fields = []
+
+    def column(self, column):
+        self._fields.append(column.bigquery_schema)
+
+    def end(self):
+        return self._fields
+
+
+class DdlParseBigQueryDdlTarget(DdlParseEmitTarget):
+    """Target of BigQuery CREATE TABLE statements, same as DdlParseTable.to_bigquery_ddl()"""
+
+    def begin(self, table, name_case):
+        self._table = table
+        self._name_case = name_case
+        self._cols_defs = []
+
+    def column(self, column):
+        self._cols_defs.append(DdlParseColumn._bigquery_ddl(
+            column.name, column.bigquery_standard_data_type, column.not_null, column.description, column.array_dimensional))
+
+    def end(self):
+        return self._table._bigquery_ddl(self._name_case, self._cols_defs)
+
+
+class DdlParseEmitter():
+    """
+    Single-pass schema emitter of multiple targets
+
+    * Walk the columns of the table once, and feed the derived values of each column (DdlParseEmitColumn) to all targets
+    * Targets are the instances of DdlParseEmitTarget, registered by name
+    * The targets keep the state of the table being emitted, do not share an emitter between threads
+    """
+
+    def __init__(self, name_case=DdlParseBase.NAME_CASE.original, targets=None):
+        """
+        :param name_case: name case type
+            * DdlParse.NAME_CASE.original : Return to no convert
+            * DdlParse.NAME_CASE.lower : Return to lower
+            * DdlParse.NAME_CASE.upper : Return to upper
+        :param targets: Iterable of (name, DdlParseEmitTarget) or dict of targets,
+            default is "bigquery_fields", "bigquery_schema" and "bigquery_ddl" targets
+        """
+
+        self._name_case = name_case
+        self._targets = OrderedDict()
+
+        if targets is None:
+            targets = [
+                ("bigquery_fields", DdlParseBigQueryFieldsTarget()),
+                ("bigquery_schema", DdlParseBigQuerySchemaTarget()),
+                ("bigquery_ddl", DdlParseBigQueryDdlTarget()),
+            ]
+        elif isinstance(targets, dict):
+            targets = targets.items()
+
+        for name, target in targets:
+            self.register(name, target)
+
+    @property
+    def name_case(self):
+        """Name case type"""
+        return self._name_case
+
+    @property
+    def targets(self):
+        """Registered targets, OrderedDict of name and DdlParseEmitTarget"""
+        return OrderedDict(self._targets)
+
+    def register(self, name, target):
+        """
+        Register the target, replace the target of the same name
+
+        :param name: Target name, the key of the result of emit()
+        :param target: DdlParseEmitTarget
+
+        :return: self
+        """
+
+        self._targets[name] = target
+        return self
+
+    def unregister(self, name):
+        """
+        Unregister the target
+
+        :param name: Target name
+
+        :return: self
+        """
+
+        del self._targets[name]
+        return self
+
+    def emit(self, table):
+        """
+        Emit the table to all targets
+
+        :param table: DdlParseTable
+
+        :return: OrderedDict of target name and result of the target
+        """
+
+        name_case = self._name_case
+        targets = list(self._targets.values())
+
+        for target in targets:
+            target.begin(table, name_case)
+
+        emit_columns = [target.column for target in targets]
+
+        for col in table.columns.values():
+            column = DdlParseEmitColumn(col, name_case)
+
+            for emit_column in emit_columns:
+                emit_column(column)
+
+        return OrderedDict((name, target.end()) for name, target in zip(self._targets, targets))
+
+    def emit_tables(self, tables):
+        """
+        Emit tables to all targets
+
+        :param tables: DdlParseTable iterable or DdlParseTableDict, e.g. DdlParse.iter_tables()
+
+        :return: Generator of (DdlParseTable, OrderedDict of target name and result of the target)
+        """
+
+        for table in DdlParseBigQueryWriter._tables(tables):
+            yield table, self.emit(table)
+
+
+class DdlParseCache():
+    """
+    Content-addressed LRU cache of parse results
+
+    * Key is the hash of DDL script (surrounding whitespace is ignored) and source database
+    * The table define info is stored as pickled bytes, a new copy is returned for each hit
+    * The raw constraint text is always stored, and dropped on hit by DdlParse of keep_constraint_text=False
+    * Unpickling can execute arbitrary code, unpickle a pickled DdlParseCache from trusted sources only
+    * Thread safe, and shareable by multiple DdlParse instances
+    """
+
+    def __init__(self, maxsize=128):
+        """
+        :param maxsize: Maximum number of cached tables, None is unlimited
+        """
+
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self):
+        """Maximum number of cached tables, None is unlimited"""
+        return self._maxsize
+
+    @property
+    def hits(self):
+        """Number of cache hits"""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Number of cache misses"""
+        return self._misses
+
+    def get(self, ddl, source_database=None):
+        """
+        Get the cached table define info.
+
+        :param ddl: DDL script
+        :param source_database: enum DdlParse.DATABASE
+        :return: DdlParseTable, New copy of cached table define info. None if not cached.
+        """
+
+        key = self._key(ddl, source_database)
+
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+
+        return pickle.loads(data)
+
+    def put(self, ddl, source_database, table):
+        """
+        Cache the table define info.
+
+        :param ddl: DDL script
+        :param source_database: enum DdlParse.DATABASE
+        :param table: DdlParseTable, parsed table define info
+        """
+
+        key = self._key(ddl, source_database)
+        data = pickle.dumps(table, pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+
+            if self._maxsize is not None and len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Clear the cached tables and statistics"""
+
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    @staticmethod
+    def _key(ddl, source_database):
+        return hashlib.sha256(ddl.strip().encode("utf-8", "surrogatepass")).digest(), \
+            None if source_database is None else int(source_database)
+
+
+class DdlParseDiskCache(DdlParseCache):
+    """
+    Persistent parse results cache in SQLite database file
+
+    * Key is the hash of DDL script (surrounding whitespace is ignored), source database and ddlparse version
+    * Shareable by multiple processes and runs, safe for concurrent writers
+    * The least recently used tables are evicted over the total size, the total size is kept up to date by the triggers
+    * close() or with block closes the SQLite connections of all threads, a later use reopens them
+    * The cached tables are unpickled and unpickling can execute arbitrary code,
+      so the database file must be writable by trusted users only (e.g. not a shared temporary directory)
+    """
+
+    # Pickle protocol readable by all supported Python versions
+    _PICKLE_PROTOCOL = 4
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, timeout=30.0):
+        """
+        :param path: SQLite database file path, created if not exists
+        :param max_bytes: Maximum total size of cached tables in bytes, None is unlimited
+        :param timeout: Seconds to wait for the lock of the other writers
+        """
+
+        super().__init__(maxsize=None)
+
+        from . import __version__
+
+        self._path = path
+        self._max_bytes = max_bytes
+        self._timeout = timeout
+        self._version = __version__
+        self._local = threading.local()
+        self._connections = []
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM ddlparse_cache").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        del state["_local"]
+        del state["_connections"]
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._local = threading.local()
+        self._connections = []
+
+    @property
+    def path(self):
+        """SQLite database file path"""
+        return self._path
+
+    @property
+    def max_bytes(self):
+        """Maximum total size of cached tables in bytes, None is unlimited"""
+        return self._max_bytes
+
+    @property
+    def size(self):
+        """Total size of cached tables in bytes"""
+        return self._connection().execute("SELECT total FROM ddlparse_cache_size").fetchone()[0]
+
+    def get(self, ddl, source_database=None):
+        key = self._disk_key(ddl, source_database)
+        conn = self._connection()
+
+        row = conn.execute("SELECT data FROM ddlparse_cache WHERE key = ?", (key,)).fetchone()
+
+        table = None
+        if row is not None:
+            try:
+                table = pickle.loads(row[0])
+            except Exception:
+                # Broken or incompatible data is discarded
+                with conn:
+                    conn.execute("DELETE FROM ddlparse_cache WHERE key = ?", (key,))
+            else:
+                with conn:
+                    conn.execute("UPDATE ddlparse_cache SET accessed = ? WHERE key = ?", (time.time(), key))
+
+        with self._lock:
+            if table is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+
+        return table
+
+    def put(self, ddl, source_database, table):
+        key = self._disk_key(ddl, source_database)
+        data = pickle.dumps(table, self._PICKLE_PROTOCOL)
+        conn = self._connection()
+
+        with conn:
+            # DELETE and INSERT instead of REPLACE, the delete trigger of REPLACE fires only with recursive triggers
+            conn.execute("DELETE FROM ddlparse_cache WHERE key = ?", (key,))
+            conn.execute(
+                "INSERT INTO ddlparse_cache (key, data, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()))
+
+            if self._max_bytes is not None:
+                self._evict(conn)
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM ddlparse_cache")
+
+        super().clear()
+
+    def close(self):
+        """Close the SQLite connections of all threads, call after the use of all threads"""
+
+        with self._lock:
+            connections = self._connections
+            self._connections = []
+            self._local = threading.local()
+
+        for conn in connections:
+            conn.close()
+
+    def _evict(self, conn):
+        """Evict the least recently used tables over the maximum total size"""
+
+        size = conn.execute("SELECT total FROM ddlparse_cache_size").fetchone()[0]
+        if size <= self._max_bytes:
+            return
+
+        evict_keys = []
+        for key, key_size in conn.execute("SELECT key, size FROM ddlparse_cache ORDER BY accessed"):
+            if size <= self._max_bytes:
+                break
+            evict_keys.append((key,))
+            size -= key_size
+
+        conn.executemany("DELETE FROM ddlparse_cache WHERE key = ?", evict_keys)
+
+    def _spec(self):
+        """Arguments of DdlParseDiskCache to reopen the same cache, e.g. in the worker processes of DdlParse.parse_many()"""
+        return self._path, self._max_bytes, self._timeout
+
+    def _disk_key(self, ddl, source_database):
+        digest, source_database = self._key(ddl, source_database)
+        return "{}:{}:{}".format(digest.hex(), source_database, self._version)
+
+    def _connection(self):
+        """SQLite connection per thread"""
+
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            import sqlite3
+
+            # Closed by close() in the other thread
+            conn = sqlite3.connect(self._path, timeout=self._timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                # Write lock first, the other processes may create the tables at the same time
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS ddlparse_cache "
+                    "(key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)")
+                conn.execute("CREATE INDEX IF NOT EXISTS ddlparse_cache_accessed ON ddlparse_cache (accessed)")
+
+                # Running total size of the cached tables, eviction needs no scan under the maximum total size
+                conn.execute("CREATE TABLE IF NOT EXISTS ddlparse_cache_size (total INTEGER NOT NULL)")
+                conn.execute(
+                    "INSERT INTO ddlparse_cache_size SELECT COALESCE(SUM(size), 0) FROM ddlparse_cache "
+                    "WHERE NOT EXISTS (SELECT * FROM ddlparse_cache_size)")
+                conn.execute(
+                    "CREATE TRIGGER IF NOT EXISTS ddlparse_cache_insert AFTER INSERT ON ddlparse_cache "
+                    "BEGIN UPDATE ddlparse_cache_size SET total = total + new.size; END")
+                conn.execute(
+                    "CREATE TRIGGER IF NOT EXISTS ddlparse_cache_delete AFTER DELETE ON ddlparse_cache "
+                    "BEGIN UPDATE ddlparse_cache_size SET total = total - old.size; END")
+
+            with self._lock:
+                self._connections.append(conn)
+            local.conn = conn
+
+        return conn
+
+
+class DdlParseProfile():
+    """
+    Per-phase profile of parse, wall time and call counts per phase and per table
+
+    * Active in the thread within the with block, parse of DdlParse without profile has no measurement
+    * Phases are the self time without the nested phases, except "parse" which is the wall time of the table
+        * parse : Parse of the table (CREATE TABLE statement), including the other phases
+        * cache : Lookup and store of DdlParse.cache
+        * fast_parse : Matching of the fast parser engine, including the fallback attempts
+        * grammar : Matching of pyparsing grammar
+        * column_values : Data type and constraint values of columns, from the matched tokens
+        * walk : Walk of the parse results to DdlParseTable
+        * column : DdlParseColumn construction
+        * bigquery_data_type : BigQuery data type mapping, on first access of DdlParseColumn.bigquery_data_type
+    * Phases out of the parse of a table (e.g. bigquery_data_type) are recorded to the total stats only
+    * Not thread safe, the parse in other threads (e.g. DdlParse.aparse(), DdlParse.parse_many()) is not profiled
+    """
+
+    PHASES = ("parse", "cache", "fast_parse", "grammar", "column_values", "walk", "column", "bigquery_data_type")
+
+    def __init__(self, callback=None):
+        """
+        :param callback: Function called with the table and its stats after the parse of each table,
+            callback(DdlParseTable, OrderedDict of phase and (calls, seconds))
+        """
+
+        self._callback = callback
+        self._stats = OrderedDict()
+        self._tables = OrderedDict()
+        self._table_stats = None
+        self._stack = []
+        self._previous = []
+
+    def __enter__(self):
+        self._previous.append(_LOCAL.profile)
+        _LOCAL.profile = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _LOCAL.profile = self._previous.pop()
+
+        if self._table_stats is not None:
+            self._end_table(None)
+
+    @property
+    def callback(self):
+        """Function called with the table and its stats after the parse of each table"""
+        return self._callback
+
+    @property
+    def stats(self):
+        """Total stats, OrderedDict of phase and (calls, seconds)"""
+        return self._ordered(self._stats)
+
+    @property
+    def tables(self):
+        """Stats per table, OrderedDict of "schema.table" and OrderedDict of phase and (calls, seconds)"""
+        return OrderedDict((key, self._ordered(stats)) for key, stats in self._tables.items())
+
+    def clear(self):
+        """Clear the stats"""
+
+        self._stats.clear()
+        self._tables.clear()
+
+    @property
+    def _in_table(self):
+        return self._table_stats is not None
+
+    def _begin_table(self):
+        # Close the phases left open by the exception of the previous table
+        if self._table_stats is not None:
+            self._end_table(None)
+
+        self._table_stats = {}
+        self._enter("parse")
+
+    def _end_table(self, table):
+        while self._stack:
+            self._exit()
+
+        table_stats, self._table_stats = self._table_stats, None
+        self._merge(self._stats, table_stats)
+
+        if table is None:
+            return
+
+        self._merge(self._tables.setdefault(DdlParseTableDict.key(table.schema, table.name), {}), table_stats)
+
+        if self._callback is not None:
+            self._callback(table, self._ordered(table_stats))
+
+    def _enter(self, phase):
+        self._stack.append([phase, time.perf_counter(), 0.0])
+
+    def _exit(self):
+        phase, start, nested = self._stack.pop()
+        elapsed = time.perf_counter() - start
+
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+        self._merge(self._stats if self._table_stats is None else self._table_stats,
+                    {phase: (1, elapsed if phase == "parse" else elapsed - nested)})
+
+    @staticmethod
+    def _merge(stats, other):
+        for phase, (calls, seconds) in other.items():
+            total_calls, total_seconds = stats.get(phase, (0, 0.0))
+            stats[phase] = (total_calls + calls, total_seconds + seconds)
+
+    @classmethod
+    def _ordered(cls, stats):
+        return OrderedDict((phase, stats[phase]) for phase in cls.PHASES if phase in stats)
+
+
+class DdlParseTrace():
+    """
+    Trace of pyparsing grammar elements, to find the backtracking of pathological DDL
+
+    * Active in the thread within the with block, record the attempts, successes, failures and time of each grammar element
+    * Debug mode, the parse is several times slower while tracing
+    * Only the pyparsing grammar is traced, the DDL parsed by the fast parser engine without fallback has no records
+    * The cached results of packrat memoization are not attempts
+    * Export the self time of grammar element stacks as collapsed stacks of flamegraph.pl, e.g. "ddl_parse_expr;And#1;Group:column 1234"
+    * Not thread safe, the parse in other threads is not traced
+    """
+
+    # Labels of grammar elements by id, built on first use
+    _labels = None
+    _expressions = None
+
+    # Maximum length of the label of unnamed grammar element
+    _LABEL_LENGTH = 48
+
+    def __init__(self):
+        self._stats = {}
+        self._stacks = {}
+        self._stack = []
+        self._active = {}
+        self._previous = []
+
+    def __enter__(self):
+        roots = self._roots()
+        self._build_labels(roots)
+        _DdlParseElementHook._install(roots)
+
+        self._previous.append(_LOCAL.trace)
+        _LOCAL.trace = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _LOCAL.trace = self._previous.pop()
+        _DdlParseElementHook._uninstall(self._roots())
+
+    @property
+    def stats(self):
+        """
+        Stats of grammar elements in descending order of self time, OrderedDict of label and OrderedDict of
+            * attempts : Number of parse attempts
+            * successes : Number of matches
+            * failures : Number of mismatches, the backtracking
+            * time : Seconds including the nested elements
+            * self_time : Seconds without the nested elements
+            * expression : Grammar expression of the element
+        """
+
+        return OrderedDict(
+            (label, OrderedDict([
+                ("attempts", attempts), ("successes", successes), ("failures", failures),
+                ("time", time_total), ("self_time", self_time), ("expression", self._expressions[label]),
+            ]))
+            for label, (attempts, successes, failures, time_total, self_time)
+            in sorted(self._stats.items(), key=lambda item: item[1][4], reverse=True))
+
+    def collapsed_stacks(self):
+        """
+        Collapsed stacks of flamegraph.pl, self time in microseconds of each grammar element stack
+
+        :return: List of "label;label;... microseconds"
+        """
+
+        return ["{} {}".format(stack, round(seconds * 1000000)) for stack, seconds in self._stacks.items() if round(seconds * 1000000) > 0]
+
+    def write_collapsed(self, file):
+        """
+        Write the collapsed stacks of flamegraph.pl, e.g. flamegraph.pl trace.folded > trace.svg
+
+        :param file: File path or text file-like object
+        """
+
+        if isinstance(file, str) or hasattr(file, "__fspath__"):
+            with open(file, "w", encoding="utf-8") as f:
+                self.write_collapsed(f)
+            return
+
+        for line in self.collapsed_stacks():
+            file.write(line)
+            file.write("\n")
+
+    def clear(self):
+        """Clear the stats"""
+
+        self._stats.clear()
+        self._stacks.clear()
+
+    def _parse(self, element, instring, loc, *args, **kwargs):
+        label = self._labels[id(element)]
+        parent = self._stack[-1] if self._stack else None
+        frame = [label if parent is None else "{};{}".format(parent[0], label), 0.0]
+
+        self._stack.append(frame)
+        self._active[label] = self._active.get(label, 0) + 1
+        success = False
+        start = time.perf_counter()
+
+        try:
+            result = element._parseNoCache(instring, loc, *args, **kwargs)
+            success = True
+            return result
+
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            self._active[label] -= 1
+
+            if parent is not None:
+                parent[1] += elapsed
+
+            stats = self._stats.get(label)
+            if stats is None:
+                stats = self._stats[label] = [0, 0, 0, 0.0, 0.0]
+
+            stats[0] += 1
+            stats[1 if success else 2] += 1
+            if self._active[label] == 0:
+                # Time of the outermost recursion only
+                stats[3] += elapsed
+            stats[4] += elapsed - frame[1]
+
+            self._stacks[frame[0]] = self._stacks.get(frame[0], 0.0) + elapsed - frame[1]
+
+    @staticmethod
+    def _roots():
+        return [DdlParse._DDL_PARSE_EXPR, DdlParse._DDL_SCAN_EXPR]
+
+    @classmethod
+    def _build_labels(cls, roots):
+        if cls._labels is not None:
+            return
+
+        root_names = dict((id(element), name) for name, element in _DdlParseGrammar._grammar.items())
+        labels = {}
+        expressions = {}
+
+        for index, element in enumerate(_DdlParseElementHook._grammar_elements(roots)):
+            expression = " ".join(str(element).split())
+            name = getattr(element, "customName", None) or element.resultsName
+
+            if id(element) in root_names:
+                label = root_names[id(element)]
+            elif name:
+                label = "{}:{}".format(type(element).__name__, name)
+            elif len(expression) <= cls._LABEL_LENGTH:
+                label = expression
+            else:
+                label = "{}#{}".format(type(element).__name__, index)
+
+            # Separator of collapsed stacks
+            label = label.replace(";", ",")
+
+            labels[id(element)] = label
+            expressions.setdefault(label, expression)
+
+        cls._expressions = expressions
+        cls._labels = labels
+
+
+class _DdlParseScanner():
+    """
+    Statement scanner
+
+    Find the CREATE TABLE statements by a quote, comment and parenthesis aware scan,
+    the other statements (e.g. INSERT data of dump) are skipped without parsing.
+    Statements are delimited by semicolon.
+
+    DDL script is fed as one or more chunks of str or bytes (e.g. mmap),
+    only the unscanned tail and the current CREATE TABLE statement are buffered.
+
+    With migration=True, ALTER TABLE, DROP TABLE and RENAME TABLE statements are also found.
+
+    Quoted strings follow the rules of source database:
+        * PostgreSQL and Oracle : standard conforming strings, the quote is escaped by doubling only (e.g. 'C:\\'),
+          and the backslash escape of PostgreSQL escape string (e.g. E'It\\'s')
+        * MySQL, Redshift and the others : the quote is escaped by backslash or doubling
+    """
+
+    # Minimum length of data to check the head of statement, before the last chunk
+    _HEAD_LOOKAHEAD = 64
+
+    _PATTERNS = {}
+
+    def __init__(self, migration=False, source_database=None):
+        """
+        :param migration: Find ALTER TABLE, DROP TABLE and RENAME TABLE statements too
+        :param source_database: enum DdlParse.DATABASE, rules of quoted strings
+        """
+
+        self._migration = migration
+        self._source_database = source_database
+        self._buffer = None
+        self._pos = 0           # scan position in buffer
+        self._start = None      # start position of CREATE TABLE statement in buffer
+        self._head = None       # None: head of statement is not checked yet, or "create", "copy", "other"
+        self._depth = 0         # depth of parentheses
+        self._closer = None     # closer of quoted string or comment in scanning
+
+    @classmethod
+    def _patterns(cls, data, source_database=None):
+        """Compiled patterns for str or bytes data and the quoted string rules of source database"""
+
+        kind = str if isinstance(data, str) else bytes
+        standard_strings = source_database in (DdlParseBase.DATABASE.postgresql, DdlParseBase.DATABASE.oracle)
+        escape_strings = source_database == DdlParseBase.DATABASE.postgresql
+        hash_comments = source_database == DdlParseBase.DATABASE.mysql
+        key = (kind, standard_strings, escape_strings, hash_comments)
+
+        if key not in cls._PATTERNS:
+            to_kind = (lambda s: s) if kind is str else (lambda s: s.encode("ascii"))
+            p = {}
+
+            # Body of quoted string, the quote is escaped by backslash or doubling (doubled quote is scanned as two strings)
+            backslash_bodies = {"'": r"(?:[^'\\]|\\.)*", '"': r'(?:[^"\\]|\\.)*'}
+            bodies = {"'": r"[^']*", '"': r'[^"]*'} if standard_strings else backslash_bodies
+            strings = r"""'{}'|"{}"|""".format(bodies["'"], bodies['"'])
+            # PostgreSQL escape string, E'...'
+            escape_string = r"(?<!\w)[Ee]'"
+            if escape_strings:
+                strings = escape_string + backslash_bodies["'"] + "'|" + strings
+
+            # Tokens that change the scan state,
+            # or parenthesized group which has no nested parentheses and comments (e.g. row of INSERT)
+            p["token"] = re.compile(to_kind(
+                r"""\((?:""" + strings + r"""[^'"`();$/\-""" + ("#" if hash_comments else "") + r"""]|-(?!-)|/(?!\*)|\$(?!(?:[A-Za-z_]\w*)?\$))*\)"""
+                + ("|" + escape_string if escape_strings else "")
+                + r"""|['"`();]|--|/\*|\$(?:[A-Za-z_]\w*)?\$""" + ("|#" if hash_comments else "")), re.DOTALL)
+            # Token that might be continued to the next chunk
+            p["partial_token"] = re.compile(to_kind(r"(?:-|/|\$(?:[A-Za-z_]\w*)?" + (r"|(?<!\w)[Ee]" if escape_strings else "") + r")\Z"))
+            # Body of quoted string or identifier, by the opening token
+            p["quote_body"] = {
+                to_kind("'"): re.compile(to_kind(bodies["'"]), re.DOTALL),
+                to_kind('"'): re.compile(to_kind(bodies['"']), re.DOTALL),
+                to_kind("`"): re.compile(to_kind(r"[^`]*")),
+            }
+            if escape_strings:
+                for opener in ("E'", "e'"):
+                    p["quote_body"][to_kind(opener)] = re.compile(to_kind(backslash_bodies["'"]), re.DOTALL)
+            p["closer"] = {
+                to_kind("--"): to_kind("\n"),
+                to_kind("/*"): to_kind("*/"),
+                # MySQL comment
+                to_kind("#"): to_kind("\n"),
+            }
+            p["semicolon"], p["lpar"], p["rpar"] = map(to_kind, ";()")
+
+            # Blanks and comments before statement
+            p["blank"] = re.compile(to_kind(r"(?:\s|--[^\n]*\n|/\*.*?\*/" + (r"|#[^\n]*\n" if hash_comments else "") + r")*"), re.DOTALL)
+            p["comment"] = re.compile(to_kind(r"--|/\*" + ("|#" if hash_comments else "")))
+            p["create_table"] = re.compile(to_kind(r"CREATE\s+(?:TEMP\s+)?TABLE\b"), re.IGNORECASE)
+            p["migration"] = re.compile(to_kind(r"(?:ALTER|DROP|RENAME)\s+TABLE\b"), re.IGNORECASE)
+
+            # PostgreSQL dump data, follow "COPY ... FROM stdin;" until the line of "\." (LF or CRLF, or at the end of DDL script)
+            p["copy"] = re.compile(to_kind(r"COPY\b"), re.IGNORECASE)
+            p["copy_from_stdin"] = re.compile(to_kind(r"\bFROM\s+STDIN\s*\Z"), re.IGNORECASE)
+            p["copy_data_closer"] = re.compile(to_kind(r"\n\\\.\r?\n"))
+            p["copy_data_end"] = re.compile(to_kind(r"\n\\\.\r?\Z"))
+
+            cls._PATTERNS[key] = p
+
+        return cls._PATTERNS[key]
+
+    def feed(self, data, final=False):
+        """
+        Feed DDL script and scan statements.
+
+        :param data: Chunk of DDL script, str or bytes-like object
+        :param final: True if it is the last chunk
+        :return: Generator of CREATE TABLE (and migration) statement, str or bytes
+        """
+
+        self._append(data)
+
+        buf = self._buffer
+        p = self._patterns(buf, self._source_database)
+
+        while True:
+            if self._head == "copy_data":
+                if not self._skip_copy_data(buf, p, final):
+                    return
+
+            if self._head is None:
+                if self._pos >= len(buf) or not self._scan_head(buf, p, final):
+                    return
+
+            end = self._scan_statement(buf, p, final)
+            if end is None:
+                return
+
+            head, start = self._head, self._start
+
+            if head in ("create", "migration"):
+                yield buf[start:end]
+
+            self._pos = end + 1
+            self._head = None
+            self._start = None
+            self._depth = 0
+
+            if head == "copy" and p["copy_from_stdin"].search(buf[start:end]):
+                # Data of COPY statement follows
+                self._head = "copy_data"
+
+    def _append(self, data):
+        if self._buffer is None:
+            self._buffer = data
+            return
+
+        # Discard scanned data, except for the current statement to be kept
+        keep = self._pos if self._start is None else self._start
+        self._buffer = self._buffer[keep:] + data
+        self._pos -= keep
+        if self._start is not None:
+            self._start -= keep
+
+    def _scan_head(self, buf, p, final):
+        """Check the head of statement, return False if more data is required"""
+
+        pos = p["blank"].match(buf, self._pos).end()
+
+        if not final and (len(buf) - pos < self._HEAD_LOOKAHEAD or p["comment"].match(buf, pos)):
+            return False
+
+        self._pos = pos
+
+        if p["create_table"].match(buf, pos):
+            self._head = "create"
+            self._start = pos
+        elif self._migration and p["migration"].match(buf, pos):
+            self._head = "migration"
+            self._start = pos
+        elif p["copy"].match(buf, pos):
+            self._head = "copy"
+            self._start = pos
+        else:
+            self._head = "other"
+
+        return True
+
+    def _skip_copy_data(self, buf, p, final):
+        """Skip data of COPY statement, return False if more data is required"""
+
+        found = p["copy_data_closer"].search(buf, self._pos)
+        if found is None and final:
+            found = p["copy_data_end"].search(buf, self._pos)
+
+        if found is None and not final:
+            # Keep the closer which might be continued to the next chunk, "\n\\.\r\n" without the last character
+            self._pos = max(self._pos, len(buf) - 4)
+            return False
+
+        self._pos = len(buf) if found is None else found.end()
+        self._head = None
+        return True
+
+    def _scan_statement(self, buf, p, final):
+        """Return position of semicolon at the end of statement, or None if more data is required"""
+
+        pos = self._pos
+
+        while True:
+            if self._closer is not None:
+                closer = self._closer
+
+                if closer in p["quote_body"]:
+                    pos = p["quote_body"][closer].match(buf, pos).end()
+                    # Closing quote of the opening token (e.g. E')
+                    closer = closer[-1:]
+                    found = buf[pos:pos + 1] == closer
+                else:
+                    found_pos = buf.find(closer, pos)
+                    found = found_pos >= 0
+                    pos = found_pos if found else max(pos, len(buf) - len(closer) + 1)
+
+                if not found:
+                    if final:
+                        return len(buf)
+                    self._pos = pos
+                    return None
+
+                pos += len(closer)
+                self._closer = None
+
+            match = p["token"].search(buf, pos)
+            if match is None:
+                if final:
+                    return len(buf)
+                partial = p["partial_token"].search(buf, pos)
+                self._pos = len(buf) if partial is None else partial.start()
+                return None
+
+            token = match.group()
+            pos = match.end()
+
+            if token == p["semicolon"]:
+                if self._depth == 0:
+                    return match.start()
+            elif token == p["lpar"]:
+                self._depth += 1
+            elif token[:1] == p["lpar"]:
+                # parenthesized group
+                pass
+            elif token == p["rpar"]:
+                self._depth = max(self._depth - 1, 0)
+            else:
+                # quoted string, comment or PostgreSQL dollar quoted string
+                self._closer = p["closer"].get(token, token)
+
+
+class _DdlParseElementHook():
+    """
+    Parse method hook of DdlParse grammar elements, packrat memoization scoped to DdlParse grammar
+
+    Unlike ParserElement.enablePackrat(), the global state of pyparsing is never changed.
+    The hook is set to the DdlParse grammar elements only while packrat parsing, DdlParseTrace or the deadline of DdlParse.timeout is running,
+    and the cache is held per thread.
+    """
+
+    _lock = threading.Lock()
+    _active_count = 0
+    _elements = None
+    _local = threading.local()
+
+    def __init__(self, roots, cache_size=128, memoize=True):
+        """
+        :param roots: Root grammar elements
+        :param cache_size: Maximum number of cached parse results, None is unlimited
+        :param memoize: False sets the parse method hook only, for the deadline check of grammar elements
+        """
+        self._roots = roots
+        self._cache_size = cache_size
+        self._memoize = memoize
+        self._outer_cache = None
+
+    def __enter__(self):
+        self._install(self._roots)
+
+        if self._memoize:
+            self._outer_cache = getattr(self._local, "cache", None)
+            self._local.cache = (OrderedDict(), self._cache_size)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._memoize:
+            self._local.cache = self._outer_cache
+        self._uninstall(self._roots)
+
+    @classmethod
+    def _install(cls, roots):
+        """Set the parse method hook to the grammar elements, counted by the active scopes"""
+
+        with cls._lock:
+            if _DdlParseElementHook._active_count == 0:
+                for element in cls._grammar_elements(roots):
+                    element._parse = functools.partial(cls._parse_hook, element)
+            _DdlParseElementHook._active_count += 1
+
+    @classmethod
+    def _uninstall(cls, roots):
+        with cls._lock:
+            _DdlParseElementHook._active_count -= 1
+            if _DdlParseElementHook._active_count == 0:
+                for element in cls._grammar_elements(roots):
+                    del element._parse
+
+    @classmethod
+    def _grammar_elements(cls, roots):
+        """All grammar elements reachable from the roots"""
+
+        if cls._elements is None:
+            elements = []
+            visited = set()
+            stack = list(roots)
+
+            while stack:
+                element = stack.pop()
+                if id(element) in visited:
+                    continue
+                visited.add(id(element))
+                elements.append(element)
+
+                stack.extend(getattr(element, "exprs", []))
+                if getattr(element, "expr", None) is not None:
+                    stack.append(element.expr)
+
+            cls._elements = elements
+
+        return cls._elements
+
+    @classmethod
+    def _parse_hook(cls, element, instring, loc, *args, **kwargs):
+        from pyparsing import ParseBaseException
+
+        local = _LOCAL
+        if local.deadline is not None:
+            # time.perf_counter() costs more than the most of grammar elements
+            local.countdown -= 1
+            if local.countdown <= 0:
+                local.countdown = _DdlParseBudget.CHECK_INTERVAL
+                _DdlParseBudget._check_deadline(local.deadline)
+
+        trace = local.trace
+        parse = element._parseNoCache if trace is None else functools.partial(trace._parse, element)
+
+        cache = getattr(cls._local, "cache", None)
+        if cache is None:
+            # Parse out of packrat scope (e.g. the other thread, or DdlParseTrace without packrat)
+            return parse(instring, loc, *args, **kwargs)
+
+        cache, cache_size = cache
+
+        # Arguments : doActions (pyparsing 2) or do_actions (pyparsing 3), callPreParse
+        do_actions = args[0] if len(args) > 0 else kwargs.get("do_actions", kwargs.get("doActions", True))
+        call_pre_parse = args[1] if len(args) > 1 else kwargs.get("callPreParse", True)
+        key = (element, instring, loc, do_actions, call_pre_parse)
+
+        value = cache.get(key)
+        if value is None:
+            try:
+                loc_end, tokens = parse(instring, loc, *args, **kwargs)
+            except ParseBaseException as e:
+                # cache a copy of the exception, without the traceback
+                cls._set_cache(cache, cache_size, key, e.__class__(*e.args))
+                raise
+
+            cls._set_cache(cache, cache_size, key, (loc_end, tokens.copy()))
+            return loc_end, tokens
+
+        if isinstance(value, Exception):
+            raise value
+
+        return value[0], value[1].copy()
+
+    @staticmethod
+    def _set_cache(cache, cache_size, key, value):
+        cache[key] = value
+        if cache_size is not None and len(cache) > cache_size:
+            cache.popitem(last=False)
+
+
+class _DdlParseGrammar():
+    """
+    pyparsing grammar of DdlParse, built on first access
+
+    Defer the import of pyparsing and the grammar construction from the import of ddlparse.
+    """
+
+    _lock = threading.Lock()
+    _grammar = None
+
+    def __init__(self, name):
+        """
+        :param name: Grammar name of DdlParse._build_grammar() results
+        """
+        self._name = name
+
+    def __get__(self, instance, owner):
+        if _DdlParseGrammar._grammar is None:
+            with self._lock:
+                if _DdlParseGrammar._grammar is None:
+                    _DdlParseGrammar._grammar = owner._build_grammar()
+
+        return _DdlParseGrammar._grammar[self._name]
+
+
+class _DdlParseAsyncTables():
+    """
+    Async iterator of DdlParse.aiter_tables()
+
+    The chunks are read by the sync read() method and scanned in the executor, no CPU and IO work runs on the event loop.
+    The scanned statements are parsed in the executor, up to _MAX_PENDING statements at once, and yielded in input order.
+    """
+
+    _READ_CHUNK_SIZE = 64 * 1024
+    _MAX_PENDING = 8
+
+    def __init__(self, parser, stream, source_database, encoding, executor):
+        """
+        :param parser: DdlParse
+        :param stream: DDL script, see DdlParse.aiter_tables()
+        :param source_database: enum DdlParse.DATABASE
+        :param encoding: Encoding of bytes DDL script
+        :param executor: concurrent.futures.Executor, None is the default executor of the event loop
+        """
+
+        self._parser = parser
+        self._stream = stream if isinstance(stream, (str, bytes, bytearray)) or hasattr(stream, "read") else stream.__aiter__()
+        self._offset = 0
+        self._source_database = source_database
+        self._encoding = encoding
+        self._executor = executor
+
+        self._scanner = _DdlParseScanner(source_database=source_database)
+        self._decoder = parser._stream_decoder(encoding)
+        self._empty_chunk = None
+        self._eof = False
+
+        self._statements = deque()
+        self._futures = deque()
+        self._tables = deque()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+
+        while not self._tables:
+            # Parse the scanned statements in the executor
+            while self._statements and len(self._futures) < self._MAX_PENDING:
+                statement, statement_encoding = self._statements.popleft()
+                self._futures.append(loop.run_in_executor(
+                    self._executor, self._parser._parse_statement_tables, self._source_database, statement, statement_encoding))
+
+            if self._futures and (self._eof or len(self._futures) >= self._MAX_PENDING):
+                self._tables.extend(await self._futures.popleft())
+            elif not self._eof:
+                await self._scan(loop)
+            else:
+                raise StopAsyncIteration
+
+        return self._tables.popleft()
+
+    async def _scan(self, loop):
+        chunk = await self._read(loop)
+        final = len(chunk) == 0
+
+        # One scan at a time, the scanner and the decoder are not shared by the other threads
+        statements, statement_encoding = await loop.run_in_executor(
+            self._executor, self._parser._scan_chunk, self._scanner, self._decoder, chunk, final, self._encoding)
+        self._statements.extend((statement, statement_encoding) for statement in statements)
+        self._eof = final
+
+    async def _read(self, loop):
+        """Read the next chunk, empty chunk of the same type at the end"""
+
+        import inspect
+
+        if isinstance(self._stream, (str, bytes, bytearray)):
+            chunk = self._stream[self._offset:self._offset + self._READ_CHUNK_SIZE]
+            self._offset += len(chunk)
+        elif hasattr(self._stream, "read"):
+            if inspect.iscoroutinefunction(self._stream.read):
+                chunk = await self._stream.read(self._READ_CHUNK_SIZE)
+            else:
+                # Blocking read of sync file object
+                chunk = await loop.run_in_executor(self._executor, self._stream.read, self._READ_CHUNK_SIZE)
+                if hasattr(chunk, "__await__"):
+                    chunk = await chunk
+        else:
+            try:
+                chunk = await self._stream.__anext__()
+            except StopAsyncIteration:
+                chunk = b"" if self._empty_chunk is None else self._empty_chunk
+
+        if self._empty_chunk is None:
+            self._empty_chunk = chunk[:0]
+
+        return chunk
+
+
+class DdlParseBudgetError(ValueError):
+    """Parse budget is exceeded, see DdlParse.max_ddl_size, DdlParse.max_columns and DdlParse.timeout"""
+
+    def __init__(self, budget, limit):
+        """
+        :param budget: Name of the exceeded budget, "max_ddl_size", "max_columns" or "timeout"
+        :param limit: Limit of the budget
+        """
+
+        super().__init__(budget, limit)
+        self.budget = budget
+        self.limit = limit
+
+    def __str__(self):
+        return "Parse budget is exceeded : {} = {}".format(self.budget, self.limit)
+
+
+class _DdlParseBudget():
+    """
+    Wall-clock deadline of DdlParse.timeout and column count of DdlParse.max_columns, active in the thread within the with block
+
+    The deadline is fixed on creation and may be entered multiple times, the nested deadline never extends the outer one.
+    It is checked on entering (the statement boundary), every CHECK_INTERVAL grammar elements by the parse method hook of _DdlParseElementHook,
+    and between definitions by the fast parser engine. A single regular expression match is not interrupted.
+    The columns are counted by the parse action of the column grammar element while matching, per CREATE TABLE statement.
+    """
+
+    # Number of grammar elements between the deadline checks
+    CHECK_INTERVAL = 256
+
+    def __init__(self, timeout, max_columns=None):
+        """
+        :param timeout: Seconds, None is no deadline
+        :param max_columns: Maximum number of columns of each CREATE TABLE statement, None is unlimited
+        """
+        self._deadline = None if timeout is None else (time.perf_counter() + timeout, timeout)
+        self._max_columns = max_columns
+        self._previous = []
+
+    def __enter__(self):
+        deadline = _LOCAL.deadline
+        if self._deadline is not None and (deadline is None or self._deadline[0] < deadline[0]):
+            deadline = self._deadline
+
+        if deadline is not None:
+            self._check_deadline(deadline)
+
+        self._previous.append((_LOCAL.deadline, _LOCAL.columns))
+        _LOCAL.deadline = deadline
+
+        # [maximum, count], the column count belongs to the parser of the statement and is never inherited
+        _LOCAL.columns = None if self._max_columns is None else [self._max_columns, 0]
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _LOCAL.deadline, _LOCAL.columns = self._previous.pop()
+
+    @staticmethod
+    def _check_deadline(deadline):
+        """Raise DdlParseBudgetError if the deadline is passed"""
+
+        if time.perf_counter() > deadline[0]:
+            raise DdlParseBudgetError("timeout", deadline[1])
+
+
+class _DdlParseFallback(Exception):
+    """DDL is not supported by the fast parser engine"""
+
+
+class _DdlParseFastParser():
+    """
+    Fast parser engine
+
+    Single-pass recursive descent parser for the common subset of CREATE TABLE statement,
+    gives the same results as the pyparsing grammar of DdlParse.
+    Raise _DdlParseFallback on anything that it does not understand.
+    """
+
+    _WHITESPACE = re.compile(r"[ \n\t\r]*")
+    _COMMENT = re.compile(r"--[ \t\r]*[^ \t\r\n][^\n]*")
+    _QUOTE = "`\""
+    _IDENT_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$")
+
+    _WORD = re.compile(r"[A-Za-z0-9_]+")
+    _NAME_WITH_SPACE = re.compile(r"[A-Za-z0-9_ ]+")
+    _TABLE_NAME = re.compile(r"[A-Za-z0-9_<>]+")
+    _INDEX = re.compile(r"[A-Za-z0-9_'`() ]+")
+    _LENGTH = re.compile(r"(?P<length_value>[\d\*]+)\s*,*\s*(?P<scale_value>\d*)")
+    _ARRAY_BRACKETS = re.compile(r"[\\\[\]]+")
+
+    _TYPE_NAME_SUFFIXES = ("WITHOUT TIME ZONE", "WITH TIME ZONE", "PRECISION", "VARYING")
+    _CONSTRAINT_TYPES = ("PRIMARY KEY", "UNIQUE KEY", "UNIQUE", "NOT NULL")
+
+    # Column constraints in order of the grammar : name = regex or keyword
+    _COLUMN_CONSTRAINTS = OrderedDict([
+        ("null", re.compile(r"\b(?:(?P<not_null>NOT\s+NULL)\b|(?:NOT\s+)?NULL?\b)", re.IGNORECASE)),
+        ("auto_increment", re.compile(r"\bAUTO_INCREMENT\b", re.IGNORECASE)),
+        ("key", re.compile(r"\b(?P<key_type>UNIQUE|PRIMARY)(?:\s+KEY)?\b", re.IGNORECASE)),
+        ("default", re.compile(
+            r"\bDEFAULT\b\s+(?:(?P<default_cast>(?:[A-Za-z0-9_\.\'\" -\{\}]|[^\x01-\x7E])*\:\:(?:character varying)?[A-Za-z0-9\[\]]+)|(?:\')(?P<default_single>(?:\\\'|[^\'])+)(?:\')|(?:\")(?P<default_double>(?:\\\"|[^\"])+)(?:\")|(?P<default_word>[^,\s]+))",
+            re.IGNORECASE)),
+        ("comment", re.compile(r"\bCOMMENT\b\s+(?:(?:\')(?P<comment_single>(?:\\\'|[^\'])+)(?:\')|(?:\")(?P<comment_double>(?:\\\"|[^\"])+)(?:\")|(?P<comment_word>[^,\s]+))", re.IGNORECASE)),
+        ("encode", re.compile(r"\bENCODE\s+(?P<encode_type>[A-Za-z0-9]+)\b", re.IGNORECASE)),
+        ("distkey", "DISTKEY"),
+        ("sortkey", "SORTKEY"),
+        ("character_set", "CHARACTER SET"),
+    ])
+
+    def __init__(self, max_columns=None, deadline=None):
+        """
+        :param max_columns: Maximum number of columns, raise DdlParseBudgetError while parsing if exceeded. None is unlimited.
+        :param deadline: Deadline of _DdlParseBudget checked between definitions, None is no deadline
+        """
+        self._max_columns = max_columns
+        self._deadline = deadline
+        self._column_count = 0
+
+    def parse(self, ddl):
+        """
+        Parse CREATE TABLE statement.
+
+        :param ddl: DDL script
+        :return: (schema, table name, temporary table flag, [(definition type, values), ...], end position)
+        """
+
+        self._ddl = ddl
+        self._column_count = 0
+
+        pos = self._required(self._keyword(self._skip_comments(0), "CREATE"))
+
+        temp_pos = self._keyword(pos, "TEMP")
+        is_temp = temp_pos is not None
+        if is_temp:
+            pos = temp_pos
+
+        pos = self._required(self._keyword(pos, "TABLE"))
+        pos = self._optional(self._keyword(pos, "IF NOT EXISTS"), pos)
+
+        pos, schema, name = self._parse_table_name(pos)
+        pos = self._required(self._literal(pos, "("))
+
+        # column and constraint definitions
+        definitions = []
+        while True:
+            pos = self._parse_definition(pos, definitions)
+
+            comma_pos = self._literal(pos, ",")
+            if comma_pos is None:
+                break
+
+            pos = comma_pos
+
+            if self._literal(pos, ")") is not None:
+                # trailing comma
+                break
+
+        end = self._literal(pos, ")")
+        if end is None:
+            # the grammar does not require the closing parenthesis,
+            # but the definitions which are not delimited by comma are not supported
+            if self._skip(pos) < len(self._ddl):
+                raise _DdlParseFallback()
+            end = pos
+
+        return schema, name, is_temp, definitions, end
+
+    def parse_definitions(self, ddl, start, end):
+        """
+        Parse column and table constraint definitions in the range of DDL script.
+
+        :param ddl: DDL script
+        :param start: Start offset of the first definition
+        :param end: End offset of the last definition
+        :return: [(definition type, values), ...]
+        """
+
+        self._ddl = ddl
+
+        definitions = []
+        pos = start
+        while True:
+            count = len(definitions)
+            pos = self._parse_definition(pos, definitions)
+
+            # Comment or index only definition is not supported
+            if len(definitions) == count:
+                raise _DdlParseFallback()
+
+            definition_end = definitions[-1][1]["span"][1]
+            if definition_end == end:
+                return definitions
+
+            comma_pos = self._literal(pos, ",")
+            if definition_end > end or comma_pos is None or comma_pos > end:
+                raise _DdlParseFallback()
+
+            pos = comma_pos
+
+    def _parse_table_name(self, pos):
+        """Parse [schema.]table, return (position, schema, table name)"""
+
+        pos = self._quote(pos)
+        schema = None
+        schema_match = self._regex(pos, self._WORD)
+        if schema_match is not None:
+            dot_pos = self._literal(self._quote(schema_match.end()), ".")
+            if dot_pos is not None:
+                schema = schema_match.group()
+                pos = self._quote(dot_pos)
+
+        table_match = self._required(self._regex(pos, self._TABLE_NAME))
+
+        return self._quote(table_match.end()), schema, table_match.group()
+
+    def _parse_definition(self, pos, definitions):
+        if self._deadline is not None:
+            _DdlParseBudget._check_deadline(self._deadline)
+
+        has_comment = self._ddl.startswith("--", self._skip(pos))
+        pos = self._skip_comments(pos)
+        start = pos
+        next_char = self._ddl[pos:pos + 1]
+
+        definition = None
+        index_pos = self._keyword(pos, "KEY")
+
+        if index_pos is not None:
+            # Ignore Index
+            pos = self._required(self._regex(index_pos, self._INDEX)).end()
+
+        elif any(self._keyword(pos, keyword) is not None for keyword in ("CONSTRAINT", "PRIMARY KEY", "UNIQUE", "NOT NULL", "FOREIGN KEY")):
+            pos, definition = self._parse_constraint(pos)
+
+        elif next_char != "" and next_char not in ",)-":
+            pos, definition = self._parse_column(pos)
+
+            if self._max_columns is not None:
+                self._column_count += 1
+                if self._column_count > self._max_columns:
+                    raise DdlParseBudgetError("max_columns", self._max_columns)
+
+        elif not has_comment:
+            raise _DdlParseFallback()
+
+        if definition is not None:
+            definition[1]["span"] = (start, pos)
+            definitions.append(definition)
+
+        return self._skip_comments(pos)
+
+    def _parse_constraint(self, pos):
+        constraint_pos = self._keyword(pos, "CONSTRAINT")
+        if constraint_pos is not None:
+            pos = self._quote(self._required(self._regex(self._quote(constraint_pos), self._WORD)).end())
+
+        for constraint_type in self._CONSTRAINT_TYPES:
+            type_pos = self._keyword(pos, constraint_type)
+            if type_pos is not None:
+                break
+        else:
+            raise _DdlParseFallback()
+
+        pos = self._quote(type_pos)
+        name_match = self._regex(pos, self._WORD)
+        if name_match is not None:
+            pos = name_match.end()
+        pos = self._required(self._literal(self._quote(pos), "("))
+
+        columns = []
+        while True:
+            column_match = self._required(self._regex(self._quote(pos), self._WORD))
+            columns.append(column_match.group())
+            pos = self._quote(column_match.end())
+
+            comma_pos = self._literal(pos, ",")
+            if comma_pos is None:
+                break
+            pos = comma_pos
+
+        pos = self._required(self._literal(pos, ")"))
+
+        return pos, ("constraint", {"type": constraint_type, "constraint_columns": columns})
+
+    def _parse_column(self, pos):
+        # name : "name with space" or [quote]name[quote], longest match
+        name = None
+        pos = self._skip(pos)
+
+        if self._is_quote(pos):
+            name_match = self._regex(pos + 1, self._NAME_WITH_SPACE)
+            if name_match is not None and self._is_quote(self._skip(name_match.end())):
+                name = name_match.group()
+                name_end = self._skip(name_match.end()) + 1
+
+        name_match = self._regex(self._quote(pos), self._WORD)
+        if name_match is not None and (name is None or self._quote(name_match.end()) > name_end):
+            name = name_match.group()
+            name_end = self._quote(name_match.end())
+
+        if name is None:
+            raise _DdlParseFallback()
+
+        # data type
+        type_match = self._required(self._regex(name_end, self._WORD))
+        type_name = [type_match.group()]
+        length, scale = None, None
+        pos = type_match.end()
+
+        for suffix in self._TYPE_NAME_SUFFIXES:
+            suffix_pos = self._keyword(pos, suffix)
+            if suffix_pos is not None:
+                type_name.append(suffix)
+                pos = suffix_pos
+                break
+
+        length_pos = self._literal(pos, "(")
+        if length_pos is not None:
+            length_match = self._regex(length_pos, self._LENGTH)
+            if length_match is not None:
+                semantics_pos = length_match.end()
+                for semantics in ("CHAR", "BYTE"):
+                    if self._keyword(semantics_pos, semantics) is not None:
+                        semantics_pos = self._keyword(semantics_pos, semantics)
+                        break
+                rpar_pos = self._literal(semantics_pos, ")")
+                if rpar_pos is not None:
+                    length, scale = length_match.group("length_value", "scale_value")
+                    pos = rpar_pos
+
+        attributes = {}
+        for attribute in ("UNSIGNED", "ZEROFILL"):
+            attribute_pos = self._keyword(pos, attribute)
+            attributes[attribute] = attribute_pos is not None
+            if attribute_pos is not None:
+                pos = attribute_pos
+
+        array_brackets = None
+        array_brackets_match = self._regex(pos, self._ARRAY_BRACKETS)
+        if array_brackets_match is not None:
+            array_brackets = array_brackets_match.group()
+            pos = array_brackets_match.end()
+
+        # column constraints in any order
+        constraint = None
+        groups = {}
+        if not self._ddl.startswith("--", self._skip(pos)):
+            constraint = OrderedDict()
+            matching = True
+
+            while matching:
+                matching = False
+
+                for constraint_name, matcher in list(self._COLUMN_CONSTRAINTS.items()):
+                    if constraint_name in constraint:
+                        continue
+
+                    if not isinstance(matcher, str):
+                        match = self._regex(pos, matcher)
+                        if match is None:
+                            continue
+                        constraint[constraint_name] = match.group()
+                        groups.update(match.groupdict())
+                        pos = match.end()
+
+                    else:
+                        keyword_pos = self._keyword(pos, matcher)
+                        if keyword_pos is None:
+                            continue
+
+                        if constraint_name == "character_set":
+                            character_set_match = self._regex(keyword_pos, self._WORD)
+                            if character_set_match is None:
+                                continue
+                            constraint[constraint_name] = character_set_match.group()
+                            pos = character_set_match.end()
+                        else:
+                            constraint[constraint_name] = matcher
+                            pos = keyword_pos
+
+                    matching = True
+
+        profile = _LOCAL.profile
+        if profile is not None:
+            profile._enter("column_values")
+
+        values = {
+            "name": name,
+            "type": DdlParseColumn._data_type_values(type_name, length, scale, attributes["UNSIGNED"], attributes["ZEROFILL"]),
+            "array_brackets": array_brackets,
+            "constraint": DdlParseColumn._constraint_values(constraint, groups),
+        }
+
+        if profile is not None:
+            profile._exit()
+
+        return pos, ("column", values)
+
+    def _skip(self, pos):
+        return self._WHITESPACE.match(self._ddl, pos).end()
+
+    def _skip_comments(self, pos):
+        while True:
+            pos = self._skip(pos)
+            if not self._ddl.startswith("--", pos):
+                return pos
+
+            comment_match = self._COMMENT.match(self._ddl, pos)
+            if comment_match is None:
+                # Blank comment continues to the next line
+                raise _DdlParseFallback()
+            pos = comment_match.end()
+
+    def _keyword(self, pos, keyword):
+        """Match caseless keyword, same as pyparsing.CaselessKeyword"""
+
+        pos = self._skip(pos)
+        end = pos + len(keyword)
+
+        if self._ddl[pos:end].upper() != keyword \
+            or (end < len(self._ddl) and self._ddl[end].upper() in self._IDENT_CHARS) \
+            or (pos > 0 and self._ddl[pos - 1].upper() in self._IDENT_CHARS):
+            return None
+
+        return end
+
+    def _literal(self, pos, literal):
+        pos = self._skip(pos)
+        return pos + len(literal) if self._ddl.startswith(literal, pos) else None
+
+    def _quote(self, pos):
+        """Skip optional quote"""
+        skipped = self._skip(pos)
+        return skipped + 1 if self._is_quote(skipped) else pos
+
+    def _is_quote(self, pos):
+        return pos < len(self._ddl) and self._ddl[pos] in self._QUOTE
+
+    def _regex(self, pos, regex):
+        return regex.match(self._ddl, self._skip(pos))
+
+    @staticmethod
+    def _optional(pos, default):
+        return default if pos is None else pos
+
+    @staticmethod
+    def _required(result):
+        if result is None:
+            raise _DdlParseFallback()
+        return result
+
+
+class _DdlParseMigrationParser(_DdlParseFastParser):
+    """
+    Migration statement parser
+
+    Parse ALTER TABLE, DROP TABLE and RENAME TABLE statements to the actions of table define info.
+    Column definitions are returned as the source text, to be parsed same as CREATE TABLE statement.
+    Actions which do not change the columns (e.g. index, foreign key and table options) are ignored.
+    Raise _DdlParseFallback if the table name is not found.
+    """
+
+    # Tokens of definition : quoted string, comment, parenthesis and comma
+    _DEFINITION_TOKEN = re.compile(r"""'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`|--[^\n]*|[(),]""")
+    _COLUMN_POSITION = re.compile(r"\s+(?:(FIRST)|AFTER\s+[`\"]?([A-Za-z0-9_]+)[`\"]?)\s*\Z", re.IGNORECASE)
+    _TYPE_OPTIONS = re.compile(r"\s+(?:USING|COLLATE)\b", re.IGNORECASE)
+
+    _CONSTRAINT_KEYWORDS = ("CONSTRAINT", "PRIMARY KEY", "UNIQUE", "NOT NULL", "FOREIGN KEY", "CHECK")
+    _IGNORED_KEYWORDS = ("CONSTRAINT", "PRIMARY KEY", "UNIQUE", "FOREIGN KEY", "CHECK",
+                         "INDEX", "KEY", "FULLTEXT", "SPATIAL", "PARTITION", "DEFAULT")
+
+    def parse(self, ddl):
+        """
+        Parse migration statement.
+
+        :param ddl: ALTER TABLE, DROP TABLE or RENAME TABLE statement
+        :return: [(schema, table name, (action type, arguments, ...)), ...]
+        """
+
+        self._ddl = ddl
+
+        pos = self._skip_comments(0)
+
+        alter_pos = self._keyword(pos, "ALTER")
+        if alter_pos is not None:
+            return self._parse_alter_table(self._required(self._keyword(alter_pos, "TABLE")))
+
+        drop_pos = self._keyword(pos, "DROP")
+        if drop_pos is not None:
+            return self._parse_drop_table(self._required(self._keyword(drop_pos, "TABLE")))
+
+        rename_pos = self._required(self._keyword(pos, "RENAME"))
+        return self._parse_rename_table(self._required(self._keyword(rename_pos, "TABLE")))
+
+    def _parse_alter_table(self, pos):
+        pos = self._optional(self._keyword(pos, "IF EXISTS"), pos)
+        pos = self._optional(self._keyword(pos, "ONLY"), pos)
+        pos, schema, name = self._parse_table_name(pos)
+
+        actions = []
+        while True:
+            pos = self._parse_action(self._skip_comments(pos), actions)
+
+            comma_pos = self._literal(pos, ",")
+            if comma_pos is None:
+                break
+            pos = comma_pos
+
+        return [(schema, name, action) for action in actions]
+
+    def _parse_drop_table(self, pos):
+        pos = self._optional(self._keyword(pos, "IF EXISTS"), pos)
+
+        actions = []
+        while True:
+            pos, schema, name = self._parse_table_name(pos)
+            actions.append((schema, name, ("drop_table",)))
+
+            comma_pos = self._literal(pos, ",")
+            if comma_pos is None:
+                return actions
+            pos = comma_pos
+
+    def _parse_rename_table(self, pos):
+        actions = []
+        while True:
+            pos, schema, name = self._parse_table_name(pos)
+            pos, new_schema, new_name = self._parse_table_name(self._required(self._keyword(pos, "TO")))
+            actions.append((schema, name, ("rename_table", new_schema, new_name)))
+
+            comma_pos = self._literal(pos, ",")
+            if comma_pos is None:
+                return actions
+            pos = comma_pos
+
+    def _parse_action(self, pos, actions):
+        """Parse an action of ALTER TABLE statement, return the end position of action"""
+
+        for keyword, parse_action in [
+                ("ADD", self._parse_add),
+                ("MODIFY", self._parse_modify),
+                ("CHANGE", self._parse_change),
+                ("ALTER", self._parse_alter_column),
+                ("DROP", self._parse_drop),
+                ("RENAME", self._parse_rename)]:
+            keyword_pos = self._keyword(pos, keyword)
+            if keyword_pos is not None:
+                return parse_action(keyword_pos, actions)
+
+        # table option (e.g. ENGINE, OWNER TO)
+        return self._definition_end(pos)
+
+    def _parse_add(self, pos, actions):
+        column_pos = self._keyword(pos, "COLUMN")
+        if_not_exists = False
+
+        if column_pos is not None:
+            if_not_exists_pos = self._keyword(column_pos, "IF NOT EXISTS")
+            if_not_exists = if_not_exists_pos is not None
+            pos = self._optional(if_not_exists_pos, column_pos)
+        elif self._literal(pos, "(") is not None:
+            return self._parse_column_definition_list(pos, ("add_column", False), actions)
+        elif any(self._keyword(pos, keyword) is not None for keyword in self._CONSTRAINT_KEYWORDS):
+            return self._parse_add_constraint(pos, actions)
+        elif any(self._keyword(pos, keyword) is not None for keyword in self._IGNORED_KEYWORDS):
+            return self._definition_end(pos)
+
+        return self._parse_column_definition(pos, ("add_column", if_not_exists), actions)
+
+    def _parse_add_constraint(self, pos, actions):
+        end = self._definition_end(pos)
+
+        try:
+            _, (_, values) = self._parse_constraint(pos)
+        except _DdlParseFallback:
+            # e.g. FOREIGN KEY and CHECK constraint
+            return end
+
+        actions.append(("add_constraint", values["type"], values["constraint_columns"]))
+
+        return end
+
+    def _parse_modify(self, pos, actions):
+        if self._literal(pos, "(") is not None:
+            return self._parse_column_definition_list(pos, ("modify_column", None), actions)
+
+        pos = self._optional(self._keyword(pos, "COLUMN"), pos)
+        return self._parse_column_definition(pos, ("modify_column", None), actions)
+
+    def _parse_change(self, pos, actions):
+        pos, name = self._parse_name(self._optional(self._keyword(pos, "COLUMN"), pos))
+        return self._parse_column_definition(pos, ("modify_column", name), actions)
+
+    def _parse_alter_column(self, pos, actions):
+        pos, name = self._parse_name(self._optional(self._keyword(pos, "COLUMN"), pos))
+        end = self._definition_end(pos)
+
+        type_pos = self._keyword(pos, "TYPE")
+        if type_pos is None:
+            type_pos = self._keyword(pos, "SET DATA TYPE")
+
+        if type_pos is not None:
+            data_type = self._ddl[self._skip(type_pos):end]
+            options_match = self._TYPE_OPTIONS.search(data_type)
+            if options_match is not None:
+                data_type = data_type[:options_match.start()]
+            actions.append(("alter_column_type", name, data_type))
+
+        elif self._keyword(pos, "SET NOT NULL") is not None:
+            actions.append(("set_not_null", name, True))
+
+        elif self._keyword(pos, "DROP NOT NULL") is not None:
+            actions.append(("set_not_null", name, False))
+
+        elif self._keyword(pos, "SET") is not None:
+            default_match = self._regex(self._keyword(pos, "SET"), self._COLUMN_CONSTRAINTS["default"])
+            if default_match is not None:
+                actions.append(("set_default", name, DdlParseColumn._constraint_values({"default": default_match.group()}, default_match.groupdict())[2]))
+
+        elif self._keyword(pos, "DROP DEFAULT") is not None:
+            actions.append(("set_default", name, None))
+
+        return end
+
+    def _parse_drop(self, pos, actions):
+        column_pos = self._keyword(pos, "COLUMN")
+
+        if column_pos is not None:
+            pos = column_pos
+        elif self._literal(pos, "(") is not None:
+            # Oracle : DROP (column, ...)
+            pos = self._literal(pos, "(")
+            while True:
+                pos, name = self._parse_name(pos)
+                actions.append(("drop_column", name, False))
+
+                comma_pos = self._literal(pos, ",")
+                if comma_pos is None:
+                    return self._definition_end(self._required(self._literal(pos, ")")))
+                pos = comma_pos
+        elif self._keyword(pos, "PRIMARY KEY") is not None:
+            actions.append(("drop_primary_key",))
+            return self._definition_end(pos)
+        elif self._keyword(pos, "CONSTRAINT") is not None:
+            # The columns of named constraint are unknown
+            end = self._definition_end(pos)
+            actions.append(("unsupported", "DROP " + self._ddl[self._skip(pos):end].strip()))
+            return end
+        elif any(self._keyword(pos, keyword) is not None for keyword in self._IGNORED_KEYWORDS):
+            return self._definition_end(pos)
+
+        if_exists_pos = self._keyword(pos, "IF EXISTS")
+        pos, name = self._parse_name(self._optional(if_exists_pos, pos))
+        actions.append(("drop_column", name, if_exists_pos is not None))
+
+        return self._definition_end(pos)
+
+    def _parse_rename(self, pos, actions):
+        column_pos = self._keyword(pos, "COLUMN")
+
+        if column_pos is not None:
+            pos, name = self._parse_name(column_pos)
+            pos, new_name = self._parse_name(self._required(self._keyword(pos, "TO")))
+            actions.append(("rename_column", name, new_name))
+
+        elif any(self._keyword(pos, keyword) is not None for keyword in ("INDEX", "KEY", "CONSTRAINT")):
+            pass
+
+        else:
+            to_pos = self._keyword(pos, "TO")
+            if to_pos is None:
+                to_pos = self._keyword(pos, "AS")
+
+            pos, schema, name = self._parse_table_name(self._optional(to_pos, pos))
+            column_to_pos = self._keyword(pos, "TO")
+
+            if to_pos is None and schema is None and column_to_pos is not None:
+                # PostgreSQL : RENAME column TO new_column
+                pos, new_name = self._parse_name(column_to_pos)
+                actions.append(("rename_column", name, new_name))
+            else:
+                actions.append(("rename_table", schema, name))
+
+        return self._definition_end(pos)
+
+    def _parse_column_definition_list(self, pos, action, actions):
+        """Oracle : (column definition, ...)"""
+
+        pos = self._literal(pos, "(")
+        while True:
+            pos = self._parse_column_definition(pos, action, actions)
+
+            comma_pos = self._literal(pos, ",")
+            if comma_pos is None:
+                return self._definition_end(self._required(self._literal(pos, ")")))
+            pos = comma_pos
+
+    def _parse_column_definition(self, pos, action, actions):
+        """Append action with (column definition, first, after) arguments, return the end position of definition"""
+
+        pos = self._skip(pos)
+        end = self._definition_end(pos)
+        definition = self._ddl[pos:end]
+
+        # MySQL : FIRST or AFTER column
+        first, after = False, None
+        position_match = self._COLUMN_POSITION.search(definition)
+        if position_match is not None:
+            first, after = position_match.group(1) is not None, position_match.group(2)
+            definition = definition[:position_match.start()]
+
+        actions.append(action + (definition, first, after))
+
+        return end
+
+    def _parse_name(self, pos):
+        name_match = self._required(self._regex(self._quote(pos), self._WORD))
+        return self._quote(name_match.end()), name_match.group()
+
+    def _definition_end(self, pos):
+        """Position of the comma or closing parenthesis at the end of definition"""
+
+        depth = 0
+        for match in self._DEFINITION_TOKEN.finditer(self._ddl, pos):
+            token = match.group()
+
+            if token == "(":
+                depth += 1
+            elif token in (",", ")") and depth == 0:
+                return match.start()
+            elif token == ")":
+                depth -= 1
+
+        return len(self._ddl)
+
+
+class DdlParse(DdlParseBase):
+    """DDL parser"""
+
+    ENGINE = IntEnum("ENGINE", "pyparsing, fast", qualname="DdlParse.ENGINE")
+
+    # pyparsing grammar, built on first use by DdlParse._build_grammar()
+    _DDL_PARSE_EXPR = _DdlParseGrammar("ddl_parse_expr")
+    _DDL_SCAN_EXPR = _DdlParseGrammar("ddl_scan_expr")
+
+    _CREATE_KEYWORD = re.compile(r"CREATE", re.IGNORECASE)
+
+    _READ_CHUNK_SIZE = 1024 * 1024
+
+    _ASCII_COMPATIBLE_ENCODINGS = ("ascii", "utf-8", "iso8859-1", "iso8859-15", "cp1252", "euc_jp")
+
+    # Compressed file magic number = module name
+    _COMPRESSED_FILE_MAGICS = OrderedDict([(b"\x1f\x8b", "gzip"), (b"BZh", "bz2"), (b"\xfd7zXZ\x00", "lzma")])
+
+
+    def __init__(self, ddl=None, source_database=None, packrat=False, packrat_cache_size=128, engine=ENGINE.pyparsing, cache=None,
+                 keep_constraint_text=True, max_ddl_size=None, max_columns=None, timeout=None):
+        """
+        :param ddl: DDL script
+        :param source_database: enum DdlParse.DATABASE
+        :param packrat: Enable packrat memoization of the grammar, see DdlParse.packrat
+        :param packrat_cache_size: Maximum number of packrat cache entries, None is unlimited
+        :param engine: enum DdlParse.ENGINE, see DdlParse.engine
+        :param cache: DdlParseCache, see DdlParse.cache
+        :param keep_constraint_text: Keep the raw constraint text of columns, see DdlParse.keep_constraint_text
+        :param max_ddl_size: Maximum number of characters of DDL script, see DdlParse.max_ddl_size
+        :param max_columns: Maximum number of columns of table, see DdlParse.max_columns
+        :param timeout: Wall-clock seconds of parse, see DdlParse.timeout
+        """
+
+        super().__init__(source_database)
+        self._ddl = ddl
+        self._table = DdlParseTable(source_database)
+        self._packrat = packrat
+        self._packrat_cache_size = packrat_cache_size
+        self._engine = engine
+        self._cache = cache
+        self._keep_constraint_text = keep_constraint_text
+        self._max_ddl_size = max_ddl_size
+        self._max_columns = max_columns
+        self._timeout = timeout
+
+    @property
+    def source_database(self):
+        """
+        Source database option
+
+        :param source_database: enum DdlParse.DATABASE
+        """
+        return super().source_database
+
+    @source_database.setter
+    def source_database(self, source_database):
+        super(self.__class__, self.__class__).source_database.__set__(self, source_database)
+        self._table.source_database = source_database
+
+    @property
+    def ddl(self):
+        """DDL script"""
+        return self._ddl
+
+    @ddl.setter
+    def ddl(self, ddl):
+        self._ddl = ddl
+
+    @property
+    def packrat(self):
+        """
+        Packrat memoization option
+
+        Memoize the parse results of grammar elements, to reduce the backtracking on wide tables.
+        It is scoped to the parse of DdlParse, the global state of pyparsing is never changed.
+        """
+        return self._packrat
+
+    @packrat.setter
+    def packrat(self, flag):
+        self._packrat = flag
+
+    @property
+    def packrat_cache_size(self):
+        """Maximum number of packrat cache entries, None is unlimited"""
+        return self._packrat_cache_size
+
+    @packrat_cache_size.setter
+    def packrat_cache_size(self, size):
+        self._packrat_cache_size = size
+
+    @property
+    def engine(self):
+        """
+        Parser engine option
+
+        :param engine: enum DdlParse.ENGINE
+            * DdlParse.ENGINE.pyparsing : Parse by pyparsing grammar
+            * DdlParse.ENGINE.fast : Parse the common subset of CREATE TABLE statement by hand-written parser,
+              and fall back to pyparsing grammar on anything it does not understand
+        """
+        return self._engine
+
+    @engine.setter
+    def engine(self, engine):
+        self._engine = engine
+
+    @property
+    def cache(self):
+        """
+        Parse results cache option
+
+        :param cache: DdlParseCache or DdlParseDiskCache, cache of DdlParse.parse() and DdlParse.parse_table() results.
+            None is disabled.
+        """
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache):
+        self._cache = cache
+
+    @property
+    def keep_constraint_text(self):
+        """
+        Keep the raw constraint text of parsed columns option
+
+        :param keep_constraint_text: False drops the raw constraint text to reduce the memory of many columns,
+            the properties parsed from the constraint (e.g. DdlParseColumn.not_null, DdlParseColumn.default) are not changed
+        """
+        return self._keep_constraint_text
+
+    @keep_constraint_text.setter
+    def keep_constraint_text(self, flag):
+        self._keep_constraint_text = flag
+
+    @property
+    def max_ddl_size(self):
+        """
+        Maximum input size budget option
+
+        :param max_ddl_size: Maximum number of characters of DDL script, of each CREATE TABLE statement in iter_tables(),
+            or of each DDL script in parse_many(). Raise DdlParseBudgetError before parsing if exceeded. None is unlimited.
+        """
+        return self._max_ddl_size
+
+    @max_ddl_size.setter
+    def max_ddl_size(self, size):
+        self._max_ddl_size = size
+
+    @property
+    def max_columns(self):
+        """
+        Maximum column count budget option
+
+        :param max_columns: Maximum number of columns of each parsed table, raise DdlParseBudgetError if exceeded. None is unlimited.
+            The columns are counted while matching, the rest of the table is not parsed after the limit is exceeded.
+        """
+        return self._max_columns
+
+    @max_columns.setter
+    def max_columns(self, count):
+        self._max_columns = count
+
+    @property
+    def timeout(self):
+        """
+        Wall-clock deadline budget option
+
+        :param timeout: Seconds of each parse call, of each CREATE TABLE statement in iter_tables(),
+            or of each DDL script in parse_many(). Raise DdlParseBudgetError when the deadline is passed. None is unlimited.
+            The deadline is checked per statement, per definition of the fast engine and every 256 grammar elements, a single regular expression match is not interrupted.
+        """
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, seconds):
+        self._timeout = seconds
+
+    def parse(self, ddl=None, source_database=None):
+        """
+        Parse DDL script.
+
+        :param ddl: DDL script
+        :return: DdlParseTable, Parsed table define info.
+        """
+
+        if ddl is not None:
+            self._ddl = ddl
+
+        if source_database is not None:
+            self.source_database = source_database
+
+        if self._ddl is None:
+            raise ValueError("DDL is not specified")
+
+        return self._parse_table(self._table, self._ddl)
+
+    def parse_table(self, ddl, source_database=None):
+        """
+        Parse DDL script to a new table define info.
+
+        Unlike DdlParse.parse(), the state of this instance is never changed,
+        so it is safe to call concurrently from multiple threads and to reuse the instance.
+
+        :param ddl: DDL script
+        :param source_database: enum DdlParse.DATABASE, None is DdlParse.source_database
+        :return: DdlParseTable, New parsed table define info.
+        """
+
+        if ddl is None:
+            raise ValueError("DDL is not specified")
+
+        if source_database is None:
+            source_database = self.source_database
+
+        return self._parse_table(DdlParseTable(source_database), ddl)
+
+    def _parse_table(self, table, ddl):
+        self._check_ddl_size(ddl)
+
+        with _DdlParseBudget(self._timeout, self._max_columns):
+            profile = _LOCAL.profile
+            if profile is None:
+                return self._parse_cached_table(table, ddl)
+
+            profile._begin_table()
+            parsed_table = None
+            try:
+                parsed_table = self._parse_cached_table(table, ddl)
+            finally:
+                profile._end_table(parsed_table)
+
+            return parsed_table
+
+    def _check_ddl_size(self, ddl):
+        if self._max_ddl_size is not None and len(ddl) > self._max_ddl_size:
+            raise DdlParseBudgetError("max_ddl_size", self._max_ddl_size)
+
+    def _check_columns(self, count):
+        if self._max_columns is not None and count > self._max_columns:
+            raise DdlParseBudgetError("max_columns", self._max_columns)
+
+    def _parse_cached_table(self, table, ddl):
+        if self._cache is None:
+            return self._parse_table_nocache(table, ddl)
+
+        # Source spans of cached table are relative to the DDL script without leading whitespace
+        leading_whitespace = len(ddl) - len(ddl.lstrip())
+
+        profile = _LOCAL.profile
+
+        if profile is not None:
+            profile._enter("cache")
+        cached_table = self._cache.get(ddl, table.source_database)
+        if profile is not None:
+            profile._exit()
+
+        if cached_table is None:
+            # Cached with the raw constraint text, shared by the parsers of both keep_constraint_text
+            cached_table = self._parse_table_nocache(DdlParseTable(table.source_database), ddl, keep_constraint_text=True)
+            self._shift_table_definitions(cached_table, -leading_whitespace)
+
+            if profile is not None:
+                profile._enter("cache")
+            self._cache.put(ddl, table.source_database, cached_table)
+            if profile is not None:
+                profile._exit()
+
+        self._check_columns(len(cached_table.columns))
+        self._shift_table_definitions(cached_table, leading_whitespace)
+
+        # Set same as parse results
+        if cached_table.schema is not None:
+            table.schema = cached_table.schema
+
+        table.name = cached_table.name
+        table.is_temp = cached_table.is_temp
+
+        for col in cached_table.columns.values():
+            if not self._keep_constraint_text:
+                col._constraint = None
+            table.columns[col.name] = col
+
+        table._definitions.extend(cached_table._definitions)
+
+        return table
+
+    def _parse_table_nocache(self, table, ddl, keep_constraint_text=None):
+        fast_result = self._parse_fast(ddl)
+        if fast_result is not None:
+            self._set_fast_table(table, fast_result, keep_constraint_text)
+            return table
+
+        profile = _LOCAL.profile
+        if profile is not None:
+            profile._enter("grammar")
+
+        if self._packrat or _LOCAL.deadline is not None:
+            with self._grammar_scope():
+                ret = self._DDL_PARSE_EXPR.parseString(ddl)
+        else:
+            ret = self._DDL_PARSE_EXPR.parseString(ddl)
+
+        if profile is not None:
+            profile._exit()
+
+        self._set_table(table, ret, ddl, keep_constraint_text)
+
+        return table
+
+    def iter_tables(self, ddl=None, source_database=None):
+        """
+        Parse DDL script that contains multiple CREATE TABLE statements.
+
+        Tables are yielded one at a time as soon as each CREATE TABLE statement is matched,
+        so a whole schema dump can be parsed in a single pass.
+        Statements are delimited by semicolon, and only the CREATE TABLE statements are
+        passed to the parser, so the other statements (e.g. INSERT data) are skipped quickly.
+        A CREATE TABLE statement which is not matched (e.g. CREATE TABLE ... LIKE) raises ParseException same as DdlParse.parse().
+
+        :param ddl: DDL script
+        :return: Generator of DdlParseTable, New parsed table define info for each CREATE TABLE statement.
+        """
+
+        if ddl is not None:
+            self._ddl = ddl
+
+        if source_database is not None:
+            self.source_database = source_database
+
+        if self._ddl is None:
+            raise ValueError("DDL is not specified")
+
+        return self._iter_tables(self._ddl, self.source_database)
+
+    def _iter_tables(self, ddl, source_database):
+        return self._iter_statement_tables(_DdlParseScanner(source_database=source_database).feed(ddl, final=True), source_database)
+
+    def iter_tables_from_file(self, file, source_database=None, encoding="utf-8"):
+        """
+        Parse DDL script file that contains multiple CREATE TABLE statements.
+
+        The file is scanned through mmap or in chunks, so the whole DDL script is never loaded into memory.
+        With ASCII compatible encodings (e.g. UTF-8), the statements other than CREATE TABLE are not even decoded.
+
+        :param file: DDL script file
+            * File path : gzip, bzip2 and xz compressed files are decompressed on the fly
+            * File object : binary or text mode (e.g. gzip.open(path))
+            * bytes, bytearray or mmap
+        :param source_database: enum DdlParse.DATABASE, None is DdlParse.source_database
+        :param encoding: Encoding of DDL script file
+        :return: Generator of DdlParseTable, New parsed table define info for each CREATE TABLE statement.
+        """
+
+        if source_database is None:
+            source_database = self.source_database
+
+        # Check unknown encoding
+        codecs.lookup(encoding)
+
+        return self._iter_file_tables(file, encoding, source_database)
+
+    def _iter_file_tables(self, file, encoding, source_database):
+        if isinstance(file, str) or hasattr(file, "__fspath__"):
+            with open(file, "rb") as f:
+                magic = f.read(len(max(self._COMPRESSED_FILE_MAGICS, key=len)))
+                f.seek(0)
+
+                for compressed_magic, module_name in self._COMPRESSED_FILE_MAGICS.items():
+                    if magic.startswith(compressed_magic):
+                        with import_module(module_name).open(f) as stream:
+                            yield from self._iter_stream_tables(stream, encoding, source_database)
+                        return
+
+                if not self._is_ascii_compatible(encoding) or os.fstat(f.fileno()).st_size == 0:
+                    yield from self._iter_stream_tables(f, encoding, source_database)
+                    return
+
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    yield from self._iter_file_tables(mm, encoding, source_database)
+
+        elif isinstance(file, (bytes, bytearray, mmap.mmap)):
+            if not self._is_ascii_compatible(encoding):
+                yield from self._iter_tables(codecs.decode(file[:], encoding), source_database)
+                return
+
+            yield from self._iter_statement_tables(_DdlParseScanner(source_database=source_database).feed(file, final=True), source_database, encoding)
+
+        else:
+            yield from self._iter_stream_tables(file, encoding, source_database)
+
+    def _iter_stream_tables(self, stream, encoding, source_database):
+        scanner = _DdlParseScanner(source_database=source_database)
+        decoder = self._stream_decoder(encoding)
+
+        while True:
+            chunk = stream.read(self._READ_CHUNK_SIZE)
+            final = len(chunk) == 0
+
+            statements, statement_encoding = self._scan_chunk(scanner, decoder, chunk, final, encoding)
+            yield from self._iter_statement_tables(statements, source_database, statement_encoding)
+
+            if final:
+                return
+
+    def _stream_decoder(self, encoding):
+        """Incremental decoder of the chunks, None if the statements are scanned without decoding"""
+        return None if self._is_ascii_compatible(encoding) else codecs.getincrementaldecoder(encoding)()
+
+    @staticmethod
+    def _scan_chunk(scanner, decoder, chunk, final, encoding):
+        """Scan the chunk of DDL script, return (statements, encoding of statements)"""
+
+        if isinstance(chunk, str) or decoder is None:
+            return scanner.feed(chunk, final), None if isinstance(chunk, str) else encoding
+
+        return scanner.feed(decoder.decode(chunk, final), final), None
+
+    def _parse_statement_tables(self, source_database, statement, encoding):
+        return list(self._iter_statement_tables([statement], source_database, encoding))
+
+    def parse_many(self, ddls, source_database=None, workers=None, chunksize=16, ordered=True, encoding="utf-8", return_exceptions=False):
+        """
+        Parse a collection of DDL scripts across the worker processes.
+
+        The DDL scripts are sent to the worker processes in chunks, and the parsed tables come back in chunks.
+        Each worker process is initialized once with a warm grammar, and uses the parser options of this instance.
+        DdlParseDiskCache of DdlParse.cache is reopened by path in the worker processes and shared with them,
+        but the hits and misses of the worker processes are not counted by this instance.
+        DdlParseCache (in memory) is not used, it is not shared across the processes.
+
+        :param ddls: Iterable of DDL scripts, each DDL script is parsed same as DdlParse.parse()
+            * str : DDL script
+            * Path-like object (e.g. pathlib.Path) : DDL script file, read in the worker process
+        :param source_database: enum DdlParse.DATABASE, None is DdlParse.source_database
+        :param workers: Number of worker processes, None is the number of CPUs
+        :param chunksize: Number of DDL scripts sent to a worker process at once
+        :param ordered: Yield tables in input order if True, or in completion order of chunks if False
+        :param encoding: Encoding of DDL script files
+        :param return_exceptions: Yield the exception of a failed DDL script (e.g. DdlParseBudgetError) in place of its table
+            and continue, instead of raising it
+        :return: Generator of DdlParseTable, New parsed table define info for each DDL script.
+        """
+
+        if source_database is None:
+            source_database = self.source_database
+
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be greater than 0")
+
+        if chunksize < 1:
+            raise ValueError("chunksize must be greater than 0")
+
+        # Check unknown encoding
+        codecs.lookup(encoding)
+
+        return self._iter_many_tables(ddls, source_database, workers or os.cpu_count() or 1, chunksize, ordered, encoding, return_exceptions)
+
+    def _iter_many_tables(self, ddls, source_database, workers, chunksize, ordered, encoding, return_exceptions):
+        from concurrent.futures import ProcessPoolExecutor
+
+        options = {"packrat": self._packrat, "packrat_cache_size": self._packrat_cache_size, "engine": self._engine,
+                   "keep_constraint_text": self._keep_constraint_text, "max_ddl_size": self._max_ddl_size,
+                   "max_columns": self._max_columns, "timeout": self._timeout,
+                   "disk_cache": self._cache._spec() if isinstance(self._cache, DdlParseDiskCache) else None}
+
+        # initializer is supported from Python 3.7, otherwise the worker is initialized on the first chunk
+        executor_options = {"initializer": _parse_many_initializer, "initargs": (options,)} if sys.version_info >= (3, 7) else {}
+
+        with ProcessPoolExecutor(workers, **executor_options) as executor:
+            futures = deque()
+
+            try:
+                chunk = []
+                for ddl in ddls:
+                    chunk.append(ddl)
+                    if len(chunk) < chunksize:
+                        continue
+
+                    futures.append(executor.submit(_parse_many_worker, options, chunk, source_database, encoding, return_exceptions))
+                    chunk = []
+
+                    # Limit the pending chunks, DDL scripts may be a lazy iterable
+                    if len(futures) >= workers * 2:
+                        yield from self._pop_many_tables(futures, ordered)
+
+                if chunk:
+                    futures.append(executor.submit(_parse_many_worker, options, chunk, source_database, encoding, return_exceptions))
+
+                while futures:
+                    yield from self._pop_many_tables(futures, ordered)
+
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    @staticmethod
+    def _pop_many_tables(futures, ordered):
+        """Pop the parsed tables of the first chunk, in input order or in completion order"""
+
+        from concurrent.futures import wait, FIRST_COMPLETED
+
+        if ordered:
+            future = futures.popleft()
+        else:
+            future = next(iter(wait(futures, return_when=FIRST_COMPLETED).done))
+            futures.remove(future)
+
+        return future.result()
+
+    async def aparse(self, ddl, source_database=None, executor=None):
+        """
+        Parse DDL script to a new table define info in the executor, same as DdlParse.parse_table().
+
+        :param ddl: DDL script
+        :param source_database: enum DdlParse.DATABASE, None is DdlParse.source_database
+        :param executor: concurrent.futures.Executor, None is the default executor of the event loop
+        :return: DdlParseTable, New parsed table define info.
+        """
+
+        import asyncio
+
+        return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(self.parse_table, ddl, source_database))
+
+    def aiter_tables(self, stream, source_database=None, encoding="utf-8", executor=None):
+        """
+        Parse DDL script that contains multiple CREATE TABLE statements asynchronously, same as DdlParse.iter_tables().
+
+        The stream is read and scanned in chunks, and each CREATE TABLE statement is parsed, in the executor.
+        Only the coroutine read() method and the async iterable are awaited in the event loop.
+
+        :param stream: DDL script
+            * str, bytes or bytearray
+            * Object with read(size) method or coroutine (e.g. asyncio.StreamReader)
+            * Async iterable of str or bytes chunks
+        :param source_database: enum DdlParse.DATABASE, None is DdlParse.source_database
+        :param encoding: Encoding of bytes DDL script
+        :param executor: concurrent.futures.Executor, None is the default executor of the event loop
+        :return: Async iterator of DdlParseTable, New parsed table define info for each CREATE TABLE statement.
+        """
+
+        if stream is None:
+            raise ValueError("DDL is not specified")
+
+        if source_database is None:
+            source_database = self.source_database
+
+        # Check unknown encoding
+        codecs.lookup(encoding)
+
+        return _DdlParseAsyncTables(self, stream, source_database, encoding, executor)
+
+    def _iter_statement_tables(self, statements, source_database, encoding=None):
+        for statement in statements:
+            if encoding is not None:
+                statement = codecs.decode(statement, encoding)
+
+            # Budgets of each statement, the deadline is not active while the tables are yielded
+            self._check_ddl_size(statement)
+            deadline = _DdlParseBudget(self._timeout, self._max_columns)
+
+            # Phases of the statement are recorded to the profile, the open phases of a failed statement are closed by the next one
+            profile = _LOCAL.profile
+            if profile is not None:
+                profile._begin_table()
+
+            with deadline:
+                fast_result = self._parse_fast(statement)
+            if fast_result is not None and not self._CREATE_KEYWORD.search(statement, fast_result[-1]):
+                table = DdlParseTable(source_database)
+                with deadline:
+                    self._set_fast_table(table, fast_result)
+
+                if profile is not None:
+                    profile._end_table(table)
+
+                yield table
+                continue
+
+            if profile is not None:
+                profile._enter("grammar")
+
+            if self._packrat or self._timeout is not None:
+                with deadline, self._grammar_scope():
+                    rets = list(self._DDL_SCAN_EXPR.scanString(statement))
+            elif self._max_columns is not None:
+                with deadline:
+                    rets = list(self._DDL_SCAN_EXPR.scanString(statement))
+            elif profile is not None:
+                rets = list(self._DDL_SCAN_EXPR.scanString(statement))
+            else:
+                rets = self._DDL_SCAN_EXPR.scanString(statement)
+
+            if profile is not None:
+                profile._exit()
+
+            table = None
+            for ret, _, _ in rets:
+                if "table" not in ret:
+                    # comment line
+                    continue
+
+                table = DdlParseTable(source_database)
+                with deadline:
+                    self._set_table(table, ret, statement)
+
+                if profile is not None and profile._in_table:
+                    profile._end_table(table)
+
+                yield table
+
+            if table is None:
+                if profile is not None:
+                    profile._end_table(None)
+
+                # CREATE TABLE statement is not matched (e.g. CREATE TABLE ... LIKE), raise the same error as DdlParse.parse()
+                with deadline:
+                    self._DDL_PARSE_EXPR.parseString(statement)
+
+    def _grammar_scope(self):
+        """Scope of grammar matching, packrat memoization or the deadline check of grammar elements"""
+        return _DdlParseElementHook((self._DDL_PARSE_EXPR, self._DDL_SCAN_EXPR), self._packrat_cache_size, memoize=self._packrat)
+
+    @classmethod
+    def _is_ascii_compatible(cls, encoding):
+        """Whether the bytes of ASCII characters never appear in multibyte characters"""
+        return codecs.lookup(encoding).name in cls._ASCII_COMPATIBLE_ENCODINGS
+
+    def reparse(self, table, ddl, offset, length, replacement):
+        """
+        Re-parse the table define info for a text edit of DDL script.
+
+        Only the edited column definitions are parsed again, and the columns of the table are updated in place.
+        The whole DDL script is parsed again if the edit is not within the column definitions
+        (e.g. table name, table constraint or comment).
+
+        :param table: DdlParseTable, parsed from the DDL script by DdlParse.parse() or DdlParse.parse_table()
+        :param ddl: DDL script before the edit
+        :param offset: Offset of the edit in DDL script
+        :param length: Length of the replaced text
+        :param replacement: Replacement text
+        :return: DdlParseTable, updated table define info of DDL script after the edit,
+            ddl[:offset] + replacement + ddl[offset + length:]
+        """
+
+        if offset < 0 or length < 0 or offset + length > len(ddl):
+            raise ValueError("Edit is out of the DDL script")
+
+        new_ddl = ddl[:offset] + replacement + ddl[offset + length:]
+        delta = len(replacement) - length
+
+        definitions = self._table_definitions(table)
+        if definitions is None:
+            # Source spans are unknown, e.g. the table altered by DdlParse.alter()
+            return self._reparse_table(table, new_ddl)
+
+        spans = [definition.source_span if isinstance(definition, DdlParseColumn) else definition[0] for definition in definitions]
+
+        # Edited column definitions
+        first = next((i for i, span in enumerate(spans) if offset <= span[1]), None)
+        last = next((i for i in range(len(spans) - 1, -1, -1) if spans[i][0] <= offset + length), None)
+
+        if first is None or last is None or first > last \
+            or not spans[first][0] <= offset or not offset + length <= spans[last][1] \
+            or any(not isinstance(definition, DdlParseColumn) for definition in definitions[first:last + 1]):
+            return self._reparse_table(table, new_ddl)
+
+        start, end = spans[first][0], spans[last][1] + delta
+
+        try:
+            new_definitions = _DdlParseFastParser().parse_definitions(new_ddl, start, end)
+        except _DdlParseFallback:
+            return self._reparse_table(table, new_ddl)
+
+        # Replay the definitions to a new table same as parse results, the table is updated only on success
+        new_table = DdlParseTable(table.source_database)
+
+        try:
+            for definition in definitions[:first]:
+                self._set_definition(new_table, definition)
+
+            self._set_fast_definitions(new_table, new_definitions)
+
+            following = len(new_table._definitions)
+            for definition in definitions[last + 1:]:
+                self._set_definition(new_table, definition)
+
+        except Exception:
+            # e.g. the table constraint of the renamed column
+            return self._reparse_table(table, new_ddl)
+
+        self._check_columns(len(new_table.columns))
+
+        # Columns are shifted in place, and the table constraint definitions are replaced
+        self._shift_definitions([definition for definition in definitions[last + 1:] if isinstance(definition, DdlParseColumn)], delta)
+        following_definitions = new_table._definitions[following:]
+        self._shift_definitions(following_definitions, delta)
+        new_table._definitions[following:] = following_definitions
+
+        table.columns.clear()
+        table.columns.update(new_table.columns)
+        table._definitions = new_table._definitions
+
+        return table
+
+    def _reparse_table(self, table, ddl):
+        new_table = self._parse_table(DdlParseTable(table.source_database), ddl)
+
+        table.schema = new_table.schema
+        table.name = new_table.name
+        table.is_temp = new_table.is_temp
+
+        table.columns.clear()
+        table.columns.update(new_table.columns)
+        table._definitions = new_table._definitions
+
+        return table
+
+    def alter(self, table, ddl):
+        """
+        Apply ALTER TABLE statements to the table define info in place.
+
+        Supported actions are ADD [IF NOT EXISTS], DROP [IF EXISTS], MODIFY, CHANGE and RENAME COLUMN,
+        ALTER COLUMN TYPE, SET NOT NULL, DROP NOT NULL, SET DEFAULT and DROP DEFAULT,
+        ADD CONSTRAINT (PRIMARY KEY, UNIQUE and NOT NULL), DROP PRIMARY KEY and RENAME TO.
+        DROP CONSTRAINT is not supported, because the columns of named constraint are unknown, and warns.
+        The other actions (e.g. index, foreign key and table options) do not change the columns and are ignored,
+        and so are the statements of the other tables.
+
+        :param table: DdlParseTable
+        :param ddl: DDL script of ALTER TABLE statements
+        :return: DdlParseTable, altered table define info (same instance)
+        """
+
+        if ddl is None:
+            raise ValueError("DDL is not specified")
+
+        for statement in _DdlParseScanner(migration=True, source_database=table.source_database).feed(ddl, final=True):
+            if self._CREATE_KEYWORD.match(statement):
+                continue
+
+            # Match the table before the actions (e.g. RENAME TO) are applied
+            actions = [
+                action for schema, name, action in self._parse_migration(statement)
+                if action[0] != "drop_table" and name.lower() == table.name.lower()
+                and (schema is None or table.schema is None or schema.lower() == table.schema.lower())]
+
+            for action in actions:
+                self._alter_table(table, action)
+
+        return table
+
+    def replay(self, migrations, source_database=None, checkpoint_dir=None, checkpoint_interval=100, checkpoint_keep=2, encoding="utf-8"):
+        """
+        Replay migration DDL scripts to the table define infos of the current schema.
+
+        CREATE TABLE, ALTER TABLE (same as DdlParse.alter()), DROP TABLE and RENAME TABLE statements
+        are applied in order, the other statements are skipped.
+        With checkpoint_dir, a snapshot of the tables is saved every checkpoint_interval migrations and
+        at the end, and the replay is resumed from the newest snapshot of the same migrations.
+        The older snapshots of the same migrations are removed except the newest checkpoint_keep snapshots.
+        Snapshots are stored by pickle, so checkpoint_dir must be writable by trusted users only.
+
+        :param migrations: Iterable of migration DDL scripts in order
+            * str : DDL script
+            * Path-like object (e.g. pathlib.Path) : DDL script file
+        :param source_database: enum DdlParse.DATABASE, None is DdlParse.source_database
+        :param checkpoint_dir: Directory of snapshot files, created if not exists. None is no snapshot.
+        :param checkpoint_interval: Number of migrations between snapshots
+        :param checkpoint_keep: Number of the newest snapshots kept, None keeps all snapshots
+        :param encoding: Encoding of DDL script files
+        :return: DdlParseTableDict, table define infos keyed by "schema.table" or "table"
+        """
+
+        if source_database is None:
+            source_database = self.source_database
+
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be greater than 0")
+
+        if checkpoint_keep is not None and checkpoint_keep < 1:
+            raise ValueError("checkpoint_keep must be greater than 0")
+
+        ddls = []
+        for ddl in migrations:
+            if not isinstance(ddl, str):
+                with open(ddl, encoding=encoding) as f:
+                    ddl = f.read()
+            ddls.append(ddl)
+
+        # Digest of the migrations up to each index, snapshot is valid only for the same migrations
+        from . import __version__
+
+        digest = hashlib.sha256("{}:{}".format(__version__, None if source_database is None else int(source_database)).encode())
+        digests = [digest.hexdigest()]
+        for ddl in ddls:
+            digest.update(hashlib.sha256(ddl.encode("utf-8", "surrogatepass")).digest())
+            digests.append(digest.hexdigest())
+
+        tables, start = None, 0
+        if checkpoint_dir is not None:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+            tables, start = self._load_checkpoint(checkpoint_dir, digests)
+
+        if tables is None:
+            tables = DdlParseTableDict(source_database)
+
+        for index in range(start, len(ddls)):
+            self._replay_migration(tables, ddls[index])
+
+            if checkpoint_dir is not None and ((index + 1) % checkpoint_interval == 0 or index + 1 == len(ddls)):
+                self._save_checkpoint(checkpoint_dir, self._checkpoint_name(index + 1, digests[index + 1]), tables)
+
+                if checkpoint_keep is not None:
+                    self._prune_checkpoints(checkpoint_dir, digests[:index + 2], checkpoint_keep)
+
+        return tables
+
+    def _replay_migration(self, tables, ddl):
+        for statement in _DdlParseScanner(migration=True, source_database=tables.source_database).feed(ddl, final=True):
+            if self._CREATE_KEYWORD.match(statement):
+                for table in self._parse_statement_tables(tables.source_database, statement, None):
+                    tables[tables.key(table.schema, table.name)] = table
+                continue
+
+            previous = None
+            for schema, name, action in self._parse_migration(statement):
+                if previous is not None and previous[0] == (schema, name):
+                    # Actions of ALTER TABLE statement refer the table name before the actions (e.g. RENAME TO)
+                    table = previous[1]
+                else:
+                    key = tables.key(schema, name)
+                    if key not in tables and schema is not None:
+                        # Table created without schema name
+                        key = name
+
+                    if key not in tables:
+                        if action[0] == "drop_table":
+                            continue
+                        raise ValueError("Table is not defined: {}".format(tables.key(schema, name)))
+
+                    table = tables[key]
+
+                previous = ((schema, name), table)
+                key = tables.key(table.schema, table.name)
+
+                if action[0] == "drop_table":
+                    if key in tables:
+                        del tables[key]
+                    continue
+
+                self._alter_table(table, action)
+
+                new_key = tables.key(table.schema, table.name)
+                if new_key.lower() != key.lower():
+                    # Renamed table is moved to the end
+                    del tables[key]
+                    tables[new_key] = table
+
+    @staticmethod
+    def _parse_migration(statement):
+        try:
+            return _DdlParseMigrationParser().parse(statement)
+        except _DdlParseFallback:
+            raise ValueError("Unsupported statement: {}".format(statement))
+
+    def _alter_table(self, table, action):
+        """Apply an action of migration statement to table define info"""
+
+        action_type = action[0]
+        columns = table.columns
+
+        if action_type == "add_column":
+            _, if_not_exists, definition, first, after = action
+            if after is not None:
+                self._altered_column(columns, after)
+            for col in self._parse_columns(table.source_database, definition):
+                if col.name in columns:
+                    if if_not_exists:
+                        continue
+                    raise ValueError("Column already exists: {}".format(col.name))
+                columns[col.name] = col
+                if first or after is not None:
+                    columns.move(col.name, after, first)
+
+        elif action_type == "modify_column":
+            _, name, definition, first, after = action
+            if after is not None:
+                self._altered_column(columns, after)
+            for col in self._parse_columns(table.source_database, definition):
+                self._altered_column(columns, col.name if name is None else name)
+                columns.replace(col.name if name is None else name, col)
+                if first or after is not None:
+                    columns.move(col.name, after, first)
+
+        elif action_type == "alter_column_type":
+            _, name, data_type = action
+            for col in self._parse_columns(table.source_database, "{} {}".format(name, data_type)):
+                self._altered_column(columns, name)._copy_data_type(col)
+
+        elif action_type == "set_not_null":
+            _, name, flag = action
+            self._altered_column(columns, name).not_null = flag
+
+        elif action_type == "set_default":
+            _, name, default = action
+            self._altered_column(columns, name)._default = default
+
+        elif action_type == "add_constraint":
+            _, constraint_type, column_names = action
+            self._set_constraint(table, constraint_type, column_names)
+
+        elif action_type == "drop_primary_key":
+            for col in columns.values():
+                col.primary_key = False
+
+        elif action_type == "unsupported":
+            warnings.warn("Unsupported ALTER TABLE action is ignored, the table define info may be stale : {}".format(action[1]), stacklevel=3)
+
+        elif action_type == "drop_column":
+            _, name, if_exists = action
+            if not if_exists or name in columns:
+                self._altered_column(columns, name)
+                del columns[name]
+
+        elif action_type == "rename_column":
+            _, name, new_name = action
+            self._altered_column(columns, name)
+            columns.rename(name, new_name)
+
+        elif action_type == "rename_table":
+            _, schema, name = action
+            if schema is not None:
+                table.schema = schema
+            table.name = name
+
+        # Source spans are not relative to a DDL script any more
+        for col in columns.values():
+            col.source_span = None
+        table._definitions = []
+
+        return table
+
+    @staticmethod
+    def _altered_column(columns, name):
+        """Column to be altered, ValueError if not exists same as the table"""
+
+        if name not in columns:
+            raise ValueError("Column is not defined: {}".format(name))
+
+        return columns[name]
+
+    def _parse_columns(self, source_database, definition):
+        """Parse column definition same as CREATE TABLE statement, return the columns"""
+
+        ddl = "CREATE TABLE ddlparse_migration (\n{}\n)".format(definition)
+        table = DdlParseTable(source_database)
+
+        try:
+            self._set_fast_table(table, _DdlParseFastParser().parse(ddl))
+        except _DdlParseFallback:
+            self._set_table(table, self._DDL_PARSE_EXPR.parseString(ddl), ddl)
+
+        return list(table.columns.values())
+
+    @staticmethod
+    def _checkpoint_name(index, digest):
+        return "ddlparse-{:08d}-{}.pickle".format(index, digest[:32])
+
+    @classmethod
+    def _load_checkpoint(cls, checkpoint_dir, digests):
+        """Load the newest valid snapshot, return (tables, number of applied migrations) or (None, 0)"""
+
+        names = set(os.listdir(checkpoint_dir))
+
+        for index in range(len(digests) - 1, 0, -1):
+            name = cls._checkpoint_name(index, digests[index])
+            if name not in names:
+                continue
+
+            try:
+                with open(os.path.join(checkpoint_dir, name), "rb") as f:
+                    return pickle.load(f), index
+            except Exception:
+                # Broken or incompatible snapshot is skipped
+                continue
+
+        return None, 0
+
+    @classmethod
+    def _prune_checkpoints(cls, checkpoint_dir, digests, keep):
+        """Remove the snapshots of the migrations up to the last digest, except the newest keep snapshots"""
+
+        names = set(os.listdir(checkpoint_dir))
+        lineage = [name for name in (cls._checkpoint_name(index, digests[index]) for index in range(len(digests) - 1, 0, -1)) if name in names]
+
+        for name in lineage[keep:]:
+            try:
+                os.remove(os.path.join(checkpoint_dir, name))
+            except FileNotFoundError:
+                # Removed by the concurrent replay
+                pass
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_dir, name, tables):
+        path = os.path.join(checkpoint_dir, name)
+        temp_path = "{}.{}.tmp".format(path, os.getpid())
+
+        with open(temp_path, "wb") as f:
+            pickle.dump(tables, f, DdlParseDiskCache._PICKLE_PROTOCOL)
+
+        # Atomic for the concurrent replays
+        os.replace(temp_path, path)
+
+    @classmethod
+    def _set_definition(cls, table, definition):
+        if isinstance(definition, DdlParseColumn):
+            table.columns[definition.name] = definition
+        else:
+            cls._add_constraint_definition(table, *definition)
+
+    @staticmethod
+    def _table_definitions(table):
+        """Column and table constraint definitions in order of DDL script, None if the source spans of columns are unknown"""
+
+        definitions = list(table.columns.values())
+        if not definitions or any(col._source_span is None for col in definitions):
+            return None
+
+        if table._definitions:
+            definitions.extend(table._definitions)
+            definitions.sort(key=lambda definition: definition.source_span[0] if isinstance(definition, DdlParseColumn) else definition[0][0])
+
+        return definitions
+
+    @classmethod
+    def _shift_table_definitions(cls, table, delta):
+        """Shift the source spans of the column and table constraint definitions of table"""
+
+        cls._shift_definitions(list(table.columns.values()), delta)
+        cls._shift_definitions(table._definitions, delta)
+
+    @staticmethod
+    def _shift_definitions(definitions, delta):
+        """Shift the source spans of definitions"""
+
+        if delta == 0:
+            return
+
+        for i, definition in enumerate(definitions):
+            if isinstance(definition, DdlParseColumn):
+                start, end = definition.source_span
+                definition.source_span = (start + delta, end + delta)
+            else:
+                start, end = definition[0]
+                definitions[i] = ((start + delta, end + delta),) + definition[1:]
+
+    def _parse_fast(self, ddl):
+        """Parse by fast parser engine, return None if the fallback is required"""
+
+        if self._engine != self.ENGINE.fast:
+            return None
+
+        profile = _LOCAL.profile
+        if profile is not None:
+            profile._enter("fast_parse")
+
+        try:
+            return _DdlParseFastParser(self._max_columns, _LOCAL.deadline).parse(ddl)
+        except _DdlParseFallback:
+            return None
+        finally:
+            if profile is not None:
+                profile._exit()
+
+    def _set_fast_table(self, table, result, keep_constraint_text=None):
+        """Set parse results of fast parser engine to table define info, keep_constraint_text None is DdlParse.keep_constraint_text"""
+
+        schema, name, is_temp, definitions, _ = result
+
+        profile = _LOCAL.profile
+        if profile is not None:
+            profile._enter("walk")
+
+        if schema is not None:
+            table.schema = schema
+
+        table.name = name
+        table.is_temp = is_temp
+
+        self._set_fast_definitions(table, definitions, keep_constraint_text)
+
+        if profile is not None:
+            profile._exit()
+
+    def _set_fast_definitions(self, table, definitions, keep_constraint_text=None):
+        """Set column and table constraint definitions of fast parser engine to table define info"""
+
+        profile = _LOCAL.profile
+        if keep_constraint_text is None:
+            keep_constraint_text = self._keep_constraint_text
+
+        for definition_type, values in definitions:
+
+            if definition_type == "column":
+                # add column
+                if profile is not None:
+                    profile._enter("column")
+
+                col = DdlParseColumn._from_values(
+                    values["name"], values["type"], values["array_brackets"], values["constraint"], table.source_database)
+                self._add_column_definition(table, col, values["span"], keep_constraint_text)
+
+                if profile is not None:
+                    profile._exit()
+
+            else:
+                # set column constraint
+                self._add_constraint_definition(table, values["span"], values["type"], values["constraint_columns"])
+
+    def _set_table(self, table, ret, ddl, keep_constraint_text=None):
+        """Set parse results of CREATE TABLE statement to table define info, keep_constraint_text None is DdlParse.keep_constraint_text"""
+
+        profile = _LOCAL.profile
+        if keep_constraint_text is None:
+            keep_constraint_text = self._keep_constraint_text
+        if profile is not None:
+            profile._enter("walk")
+
+        if "schema" in ret:
+            table.schema = ret["schema"]
+
+        table.name = ret["table"]
+        table.is_temp = True if "temp" in ret else False
+
+        for definition in ret["columns"]:
+            # Source span of definition : start offset after whitespaces, end offset before whitespaces
+            start, values, end = definition
+            span = (start, self._skip_whitespace_back(ddl, end))
+
+            if definition.getName() == "column":
+                # add column, values are structured by the parse action of grammar
+                if profile is not None:
+                    profile._enter("column")
+
+                name, data_type, array_brackets, constraint = values[0]
+                col = DdlParseColumn._from_values(name, data_type, array_brackets, constraint, table.source_database)
+                self._add_column_definition(table, col, span, keep_constraint_text)
+
+                if profile is not None:
+                    profile._exit()
+
+            else:
+                # set column constraint
+                self._add_constraint_definition(table, span, values[0]["type"], list(values[0]["constraint_columns"]))
+
+        if profile is not None:
+            profile._exit()
+
+    @staticmethod
+    def _add_column_definition(table, col, span, keep_constraint_text):
+        if not keep_constraint_text:
+            col._constraint = None
+
+        col.source_span = span
+        table.columns[col.name] = col
+
+    @classmethod
+    def _add_constraint_definition(cls, table, span, constraint_type, column_names):
+        table._definitions.append((span, constraint_type, column_names))
+        cls._set_constraint(table, constraint_type, column_names)
+
+    @staticmethod
+    def _set_constraint(table, constraint_type, column_names):
+        """Set table constraint to columns"""
+
+        for col_name in column_names:
+            col = table.columns[col_name]
+
+            if constraint_type == "PRIMARY KEY":
+                col.not_null = True
+                col.primary_key = True
+            elif constraint_type in ["UNIQUE", "UNIQUE KEY"]:
+                col.unique = True
+            elif constraint_type == "NOT NULL":
+                col.not_null = True
+
+    @staticmethod
+    def _skip_whitespace_back(ddl, pos):
+        while pos > 0 and ddl[pos - 1] in " \n\t\r":
+            pos -= 1
+        return pos
+
+    @staticmethod
+    def _build_grammar():
+        """Build pyparsing grammar"""
+
+        import pyparsing
+        from pyparsing import CaselessKeyword, Forward, Word, Regex, alphanums, \
+            delimitedList, Suppress, Optional, Group, OneOrMore
+
+        # Start and end locations of the definitions, pyparsing 2 has locatedExpr() of the same results
+        Located = getattr(pyparsing, "Located", None) or pyparsing.locatedExpr
+
+        _LPAR, _RPAR, _COMMA, _SEMICOLON, _DOT, _DOUBLEQUOTE, _BACKQUOTE, _SPACE = map(Suppress, "(),;.\"` ")
+        _CREATE, _TABLE, _TEMP, _CONSTRAINT, _NOT_NULL, _PRIMARY_KEY, _UNIQUE, _UNIQUE_KEY, _FOREIGN_KEY, _REFERENCES, _KEY, _CHAR_SEMANTICS, _BYTE_SEMANTICS = \
+            map(CaselessKeyword, "CREATE, TABLE, TEMP, CONSTRAINT, NOT NULL, PRIMARY KEY, UNIQUE, UNIQUE KEY, FOREIGN KEY, REFERENCES, KEY, CHAR, BYTE".replace(", ", ",").split(","))
+        _TYPE_UNSIGNED, _TYPE_ZEROFILL = \
+            map(CaselessKeyword, "UNSIGNED, ZEROFILL".replace(", ", ",").split(","))
+        _COL_ATTR_DISTKEY, _COL_ATTR_SORTKEY, _COL_ATTR_CHARACTER_SET = \
+            map(CaselessKeyword, "DISTKEY, SORTKEY, CHARACTER SET".replace(", ", ",").split(","))
+        _FK_MATCH = \
+            CaselessKeyword("MATCH") + Word(alphanums + "_")
+        _FK_ON, _FK_ON_OPT_RESTRICT, _FK_ON_OPT_CASCADE, _FK_ON_OPT_SET_NULL, _FK_ON_OPT_NO_ACTION = \
+            map(CaselessKeyword, "ON, RESTRICT, CASCADE, SET NULL, NO ACTION".replace(", ", ",").split(","))
+        _FK_ON_DELETE = \
+            _FK_ON + CaselessKeyword("DELETE") + (_FK_ON_OPT_RESTRICT | _FK_ON_OPT_CASCADE | _FK_ON_OPT_SET_NULL | _FK_ON_OPT_NO_ACTION)
+        _FK_ON_UPDATE = \
+            _FK_ON + CaselessKeyword("UPDATE") + (_FK_ON_OPT_RESTRICT | _FK_ON_OPT_CASCADE | _FK_ON_OPT_SET_NULL | _FK_ON_OPT_NO_ACTION)
+        _SUPPRESS_QUOTE = _BACKQUOTE | _DOUBLEQUOTE
+
+        _COMMENT = Suppress("--" + Regex(r".+"))
+
+        # Token of the match object, the named groups are taken without matching again (asMatch argument of pyparsing 2 is as_match of 3).
+        # Name it by Optional or Group, the results name of the element itself is the first group of the match object
+        def _Match(pattern):
+            return Regex(pattern, 0, False, True)
+
+        _PATTERNS = _DdlParseFastParser._COLUMN_CONSTRAINTS
+
+        # Column count of DdlParse.max_columns while matching, from the table name of each CREATE TABLE statement
+        def _reset_columns(toks):
+            columns = _LOCAL.columns
+            if columns is not None:
+                columns[1] = 0
+
+        # Structured values of column from the tokens, the length and the constraints are the match objects of the patterns
+        # of fast parser engine, the column is also counted here for DdlParse.max_columns
+        def _column_values(toks):
+            local = _LOCAL
+
+            columns = local.columns
+            if columns is not None:
+                columns[1] += 1
+                if columns[1] > columns[0]:
+                    raise DdlParseBudgetError("max_columns", columns[0])
+
+            profile = local.profile
+            if profile is not None:
+                profile._enter("column_values")
+
+            column = toks[0]
+
+            data_type = column["type"]
+            length = data_type["length"][0] if "length" in data_type else None
+            data_type_values = DdlParseColumn._data_type_values(
+                data_type["type_name"],
+                None if length is None else length.group("length_value"), None if length is None else length.group("scale_value"),
+                "unsigned" in data_type, "zerofill" in data_type)
+
+            constraint_values = None
+            if "constraint" in column:
+                constraint = OrderedDict()
+                groups = {}
+                for name, val in column["constraint"].items():
+                    if isinstance(val, str):
+                        # Keyword or character set name
+                        constraint[name] = val
+                    else:
+                        constraint[name] = val.group()
+                        groups.update(val.groupdict())
+
+                constraint_values = DdlParseColumn._constraint_values(constraint, groups)
+
+            if profile is not None:
+                profile._exit()
+
+            return [(column["name"], data_type_values, column.get("array_brackets"), constraint_values)]
+
+
+        _CREATE_TABLE_STATEMENT = Suppress(_CREATE) + Optional(_TEMP)("temp") + Suppress(_TABLE) + Optional(Suppress(CaselessKeyword("IF NOT EXISTS"))) \
+            + Optional(_SUPPRESS_QUOTE) + Optional(Word(alphanums + "_")("schema") + Optional(_SUPPRESS_QUOTE) + _DOT + Optional(_SUPPRESS_QUOTE)) + Word(alphanums + "_<>").setParseAction(_reset_columns)("table") + Optional(_SUPPRESS_QUOTE) \
+            + _LPAR \
+            + delimitedList(
+                OneOrMore(
+                    _COMMENT
+                    |
+                    # Ignore Index
+                    Suppress(_KEY + Word(alphanums + "_'`() "))
+                    |
+                    Located(Group(
+                        Optional(Suppress(_CONSTRAINT) + Optional(_SUPPRESS_QUOTE) + Word(alphanums + "_")("name") + Optional(_SUPPRESS_QUOTE))
+                        + (
+                            (
+                                (_PRIMARY_KEY ^ _UNIQUE ^ _UNIQUE_KEY ^ _NOT_NULL)("type")
+                                + Optional(_SUPPRESS_QUOTE) + Optional(Word(alphanums + "_"))("name") + Optional(_SUPPRESS_QUOTE)
+                                + _LPAR + Group(delimitedList(Optional(_SUPPRESS_QUOTE) + Word(alphanums + "_") + Optional(_SUPPRESS_QUOTE)))("constraint_columns") + _RPAR
+                            )
+                            |
+                            (
+                                (_FOREIGN_KEY)("type")
+                                + _LPAR + Group(delimitedList(Optional(_SUPPRESS_QUOTE) + Word(alphanums + "_") + Optional(_SUPPRESS_QUOTE)))("constraint_columns") + _RPAR
+                                + Optional(Suppress(_REFERENCES)
+                                    + Optional(_SUPPRESS_QUOTE) + Word(alphanums + "_")("references_table") + Optional(_SUPPRESS_QUOTE)
+                                    + _LPAR + Group(delimitedList(Optional(_SUPPRESS_QUOTE) + Word(alphanums + "_") + Optional(_SUPPRESS_QUOTE)))("references_columns") + _RPAR
+                                    + Optional(_FK_MATCH)("references_fk_match")  # MySQL
+                                    + Optional(_FK_ON_DELETE)("references_fk_on_delete")  # MySQL
+                                    + Optional(_FK_ON_UPDATE)("references_fk_on_update")  # MySQL
+                                )
+                            )
+                        )
+                    ))("constraint")
+                    |
+                    Located(Group(
+                        ((_SUPPRESS_QUOTE + Word(alphanums + " _")("name") + _SUPPRESS_QUOTE) ^ (Optional(_SUPPRESS_QUOTE) + Word(alphanums + "_")("name") + Optional(_SUPPRESS_QUOTE)))
+                        + Group(
+                            Group(
+                                Word(alphanums + "_")
+                                + Optional(CaselessKeyword("WITHOUT TIME ZONE") ^ CaselessKeyword("WITH TIME ZONE") ^ CaselessKeyword("PRECISION") ^ CaselessKeyword("VARYING"))
+                            )("type_name")
+                            + Optional(_LPAR + Group(_Match(_DdlParseFastParser._LENGTH))("length") + Optional(_CHAR_SEMANTICS | _BYTE_SEMANTICS)("semantics") + _RPAR)
+                            + Optional(_TYPE_UNSIGNED)("unsigned")
+                            + Optional(_TYPE_ZEROFILL)("zerofill")
+                        )("type")
+                        + Optional(Word(r"\[\]"))("array_brackets")
+                        + Optional(
+                            Regex(r"(?!--)", re.IGNORECASE)
+                            + Group(
+                                Optional(_Match(_PATTERNS["null"]))("null")
+                                & Optional(_Match(_PATTERNS["auto_increment"]))("auto_increment")
+                                & Optional(_Match(_PATTERNS["key"]))("key")
+                                & Optional(_Match(_PATTERNS["default"]))("default")
+                                & Optional(_Match(_PATTERNS["comment"]))("comment")
+                                & Optional(_Match(_PATTERNS["encode"]))("encode")  # Redshift
+                                & Optional(_COL_ATTR_DISTKEY)("distkey")  # Redshift
+                                & Optional(_COL_ATTR_SORTKEY)("sortkey")  # Redshift
+                                & Optional(Suppress(_COL_ATTR_CHARACTER_SET) + Word(alphanums + "_")("character_set"))  # MySQL
+                            )("constraint")
+                        )
+                    ).setParseAction(_column_values))("column")
+                    |
+                    _COMMENT
+                )
+            )("columns")
+
+        _DDL_PARSE_EXPR = Forward()
+        _DDL_PARSE_EXPR << OneOrMore(_COMMENT | _CREATE_TABLE_STATEMENT)
+
+        _DDL_SCAN_EXPR = _COMMENT | _CREATE_TABLE_STATEMENT
+
+        return {"ddl_parse_expr": _DDL_PARSE_EXPR, "ddl_scan_expr": _DDL_SCAN_EXPR}
+
+
+# Shared JSON encoder of BigQuery JSON schema, json.dumps() creates an encoder for each call with the options
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+class _DdlParseLocal(threading.local):
+    """Active DdlParseProfile, DdlParseTrace, deadline of DdlParse.timeout and column count of DdlParse.max_columns of the thread"""
+
+    profile = None
+    trace = None
+    deadline = None
+    columns = None
+
+    # Parse method hook calls until the next deadline check
+    countdown = 0
+
+
+_LOCAL = _DdlParseLocal()
+
+# Parser options and parser of the worker process of DdlParse.parse_many()
+_parse_many_options = None
+_parse_many_parser = None
+
+
+def _parse_many_initializer(options):
+    """Initialize the worker process of DdlParse.parse_many() with a warm grammar"""
+
+    global _parse_many_options, _parse_many_parser
+
+    DdlParse._DDL_PARSE_EXPR
+    _parse_many_options = options
+
+    # DdlParseDiskCache is reopened by path
+    parser_options = dict(options)
+    disk_cache = parser_options.pop("disk_cache", None)
+    _parse_many_parser = DdlParse(cache=None if disk_cache is None else DdlParseDiskCache(*disk_cache), **parser_options)
+
+
+def _parse_many_worker(options, ddls, source_database, encoding, return_exceptions=False):
+    """Parse a chunk of DDL scripts in the worker process of DdlParse.parse_many()"""
+
+    if _parse_many_options != options:
+        _parse_many_initializer(options)
+
+    max_ddl_size = options.get("max_ddl_size")
+
+    tables = []
+    for ddl in ddls:
+        try:
+            if not isinstance(ddl, str):
+                with open(ddl, encoding=encoding) as f:
+                    # Read the DDL script file over max_ddl_size by one character only
+                    ddl = f.read() if max_ddl_size is None else f.read(max_ddl_size + 1)
+
+            tables.append(_parse_many_parser.parse_table(ddl, source_database))
+
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            tables.append(e)
+
+    return tables
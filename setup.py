@@ -42,6 +42,7 @@ setup(
 
     license=license,
 
+    python_requires='>=3.7',
     install_requires=_requirements(),
     tests_require=_test_requirements(),
 
@@ -60,8 +61,6 @@ setup(
         'License :: OSI Approved :: BSD License',
         'Programming Language :: Python',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
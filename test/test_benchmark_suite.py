@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+import pytest, io, json
+from collections import OrderedDict
+
+from benchmark import suite
+
+
+def time_result(seconds, calibration=0.1):
+    return OrderedDict([("columns", 100), ("seconds", seconds), ("normalized", seconds / calibration), ("columns_per_second", round(100 / seconds))])
+
+
+def memory_result(peak):
+    return OrderedDict([("columns", 100), ("peak_bytes", peak), ("bytes_per_column", round(peak / 100, 1))])
+
+
+def results(version="1.10.0", python="3.11.7", calibration=0.1, **values):
+    return OrderedDict([
+        ("ddlparse", version),
+        ("python", python),
+        ("calibration", calibration),
+        ("results", OrderedDict((key.replace("__", "/"), value) for key, value in values.items())),
+    ])
+
+
+@pytest.mark.parametrize("base, value, limit, regressed, report", [
+    (1.0, 1.5, 0.5, False, "+50.0%"),
+    (1.0, 1.51, 0.5, True, "+51.0%  REGRESSION"),
+    (1.0, 0.5, 0.0, False, "-50.0%"),
+    (0.0, 1.0, 0.0, False, "+0.0%"),
+])
+def test_compare_result(base, value, limit, regressed, report):
+    regressions = []
+    out = io.StringIO()
+    suite._compare_result("mysql/wide_10/parse_fast", {"seconds": base}, {"seconds": value}, "seconds", limit, regressions, out)
+
+    assert regressions == (["mysql/wide_10/parse_fast"] if regressed else [])
+    assert out.getvalue().startswith("mysql/wide_10/parse_fast")
+    assert out.getvalue().rstrip().endswith(report)
+
+    # Silent without out
+    regressions = []
+    suite._compare_result("mysql/wide_10/parse_fast", {"seconds": base}, {"seconds": value}, "seconds", limit, regressions, None)
+    assert regressions == (["mysql/wide_10/parse_fast"] if regressed else [])
+
+
+def test_compare():
+    baseline = results(
+        mysql__wide_10__parse_fast=time_result(0.1),
+        mysql__wide_10__memory_fast=memory_result(10000),
+        mysql__wide_10__bigquery_ddl=time_result(0.1))
+
+    # Normalized time by the tolerance of time, peak memory by the tolerance of memory
+    current = results(
+        calibration=0.2,
+        mysql__wide_10__parse_fast=time_result(0.2, calibration=0.2),
+        mysql__wide_10__memory_fast=memory_result(11001),
+        mysql__wide_10__bigquery_ddl=time_result(0.32, calibration=0.2),
+        mysql__wide_10__bigquery_fields=time_result(0.1))
+    out = io.StringIO()
+
+    assert suite.compare(baseline, current, out=out) == ["mysql/wide_10/memory_fast", "mysql/wide_10/bigquery_ddl"]
+    assert "mysql/wide_10/bigquery_fields" + " " * 19 + " : no baseline" in out.getvalue()
+    assert "warning" not in out.getvalue()
+    assert out.getvalue().endswith("2 regression(s)\n")
+
+    assert suite.compare(baseline, current, tolerance=0.7, memory_tolerance=0.2, out=None) == []
+
+    # Seconds instead of normalized time
+    assert suite.compare(baseline, current, absolute=True, out=None) == ["mysql/wide_10/parse_fast", "mysql/wide_10/memory_fast", "mysql/wide_10/bigquery_ddl"]
+
+    # Python version
+    out = io.StringIO()
+    suite.compare(baseline, results(python="3.12.0"), out=out)
+    assert out.getvalue() == "warning: Python version is different, baseline 3.11.7 : current 3.12.0\n0 regression(s)\n"
+
+
+def test_compare_reference():
+    baseline = results(
+        version="1.11.0",
+        mysql__engine_200__parse_default=time_result(0.1),
+        oracle__engine_200__parse_default=time_result(0.1))
+    baseline["reference"] = results(
+        mysql__engine_200__parse_default=time_result(0.09),
+        oracle__engine_200__parse_default=time_result(0.2))
+
+    # The stored reference is measured by another run, compared by the tolerance of baseline
+    current = results(
+        version="1.11.0",
+        calibration=0.2,
+        mysql__engine_200__parse_default=time_result(0.28, calibration=0.2),
+        oracle__engine_200__parse_default=time_result(0.26, calibration=0.2))
+    out = io.StringIO()
+
+    assert suite.compare(baseline, current, out=out) == ["reference:mysql/engine_200/parse_default"]
+    assert "reference: ddlparse 1.10.0 (stored)\n" in out.getvalue()
+    assert suite.compare(baseline, current, tolerance=0.6, out=None) == []
+
+    # The A/B reference is compared by seconds and the reference tolerance
+    references = results(
+        calibration=0.3,
+        mysql__engine_200__parse_default=time_result(0.25, calibration=0.3),
+        oracle__engine_200__parse_default=time_result(0.2, calibration=0.3),
+        redshift__engine_200__parse_default=time_result(0.25, calibration=0.3))
+    out = io.StringIO()
+
+    assert suite.compare(baseline, current, tolerance=0.6, reference=references, out=out) == ["reference:oracle/engine_200/parse_default"]
+    assert "reference: ddlparse 1.10.0 (A/B)\n" in out.getvalue()
+    assert "reference:redshift" not in out.getvalue()
+    assert suite.compare(baseline, current, tolerance=0.6, reference=references, reference_tolerance=0.35, out=None) == []
+
+
+def test_best_results():
+    runs = [
+        results(calibration=0.1, mysql__wide_10__parse_fast=time_result(0.2), mysql__wide_10__memory_fast=memory_result(1000)),
+        results(calibration=0.2, mysql__wide_10__parse_fast=time_result(0.1, calibration=0.2), mysql__wide_10__memory_fast=memory_result(2000)),
+    ]
+
+    best = suite._best_results(runs)
+    assert best["results"]["mysql/wide_10/parse_fast"] == time_result(0.1, calibration=0.2)
+    assert best["results"]["mysql/wide_10/memory_fast"] == memory_result(1000)
+
+
+def test_main_compare(tmp_path):
+    baseline_path = tmp_path / "baseline.json"
+    results_path = tmp_path / "results.json"
+
+    suite._save(str(baseline_path), results(mysql__wide_10__parse_fast=time_result(0.1)))
+    suite._save(str(results_path), results(mysql__wide_10__parse_fast=time_result(0.16)))
+    assert json.loads(results_path.read_text())["results"]["mysql/wide_10/parse_fast"]["seconds"] == 0.16
+
+    assert suite.main(["compare", str(baseline_path), str(results_path)]) == 1
+    assert suite.main(["compare", str(baseline_path), str(results_path), "--tolerance", "0.7"]) == 0
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 
-import pytest, re, textwrap
+import pytest, asyncio, io, json, os, pickle, re, sqlite3, subprocess, sys, textwrap, threading, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from enum import IntEnum
 
-from ddlparse.ddlparse import DdlParse, DdlParseColumn
+from ddlparse.ddlparse import DdlParse, DdlParseColumn, DdlParseTableDict, DdlParseColumnStore, DdlParseBigQueryWriter, DdlParseEmitter, DdlParseEmitTarget, DdlParseEmitColumn, DdlParseBigQueryFieldsTarget, DdlParseBigQuerySchemaTarget, DdlParseBigQueryDdlTarget, DdlParseCache, DdlParseDiskCache, DdlParseProfile, DdlParseTrace, DdlParseBudgetError, _DdlParseBudget, _DdlParseElementHook, _LOCAL, _DdlParseFastParser, _DdlParseFallback, _DdlParseScanner, _parse_many_worker
 
 
 TEST_DATA = {
@@ -1365,3 +1367,1895 @@ def test_constraint_compatibility():
     assert dl_col.primary_key is True
     assert dl_col.unique is False
     assert dl_col.comment == 'foo'
+
+
+def test_iter_tables():
+    ddl = """
+        -- CREATE TABLE Comment_Table (Col_01 integer);
+        CREATE TABLE Schema_01.Table_01 (
+          Col_01 varchar(100) PRIMARY KEY,
+          Col_02 integer NOT NULL
+        );
+
+        INSERT INTO Table_01 VALUES ('a', 1);
+
+        CREATE TEMP TABLE Table_02 (
+          Col_01 char(10),
+          Col_02 integer,
+          Col_03 date,
+          PRIMARY KEY (Col_02)
+        );
+        """
+
+    tables = list(DdlParse().iter_tables(ddl, DdlParse.DATABASE.oracle))
+
+    # Check each table is a fresh object
+    assert len(tables) == 2
+    assert tables[0] is not tables[1]
+
+    assert tables[0].schema == "Schema_01"
+    assert tables[0].name == "Table_01"
+    assert tables[0].is_temp is False
+    assert list(tables[0].columns.keys()) == ["col_01", "col_02"]
+    assert tables[0].columns["Col_01"].primary_key is True
+
+    assert tables[1].schema is None
+    assert tables[1].name == "Table_02"
+    assert tables[1].is_temp is True
+    assert list(tables[1].columns.keys()) == ["col_01", "col_02", "col_03"]
+    assert tables[1].columns["Col_02"].primary_key is True
+    assert tables[1].columns["Col_03"].bigquery_data_type == "DATETIME"
+    assert tables[1].source_database == DdlParse.DATABASE.oracle
+
+    # Error : CREATE TABLE statement is not matched, same as parse()
+    from pyparsing import ParseException
+
+    for engine in DdlParse.ENGINE:
+        tables = DdlParse(engine=engine).iter_tables(ddl + "CREATE TABLE Table_03 LIKE Table_02;")
+        assert [next(tables).name, next(tables).name] == ["Table_01", "Table_02"]
+        with pytest.raises(ParseException):
+            next(tables)
+
+        with pytest.raises(ParseException):
+            DdlParse(engine=engine).parse_table("CREATE TABLE Table_03 LIKE Table_02;")
+
+    # Error : DDL is not specified
+    with pytest.raises(ValueError):
+        DdlParse().iter_tables()
+
+
+def test_iter_tables_skip_statements():
+    ddl = """
+        /*!40101 SET NAMES utf8 */;
+        CREATE TABLE Table_01 (
+          Col_01 varchar(100) COMMENT 'semicolon; in comment',
+          Col_02 integer
+        );
+        INSERT INTO Table_01 VALUES ('CREATE TABLE Table_X (Col_01 integer);', 1), ("\\";", 2) -- ;
+        ;
+        /* CREATE TABLE Table_Y (Col_01 integer); */
+        CREATE FUNCTION Func_01() RETURNS integer AS $body$ CREATE TABLE Table_Z (Col_01 integer); $body$ LANGUAGE sql;
+        create table Table_02 (
+          Col_01 integer
+        ) -- comment
+        """
+
+    tables = list(DdlParse().iter_tables(ddl))
+
+    assert [table.name for table in tables] == ["Table_01", "Table_02"]
+    assert tables[0].columns["Col_01"].comment == "semicolon; in comment"
+    assert list(tables[1].columns.keys()) == ["col_01"]
+
+    # Unterminated quoted string, comment and dollar quoted string
+    for unterminated in ["'", "/*", "$$"]:
+        tables = list(DdlParse().iter_tables(ddl + "; INSERT INTO Table_01 VALUES (" + unterminated + "); CREATE TABLE Table_03 (Col_01 integer);"))
+        assert [table.name for table in tables] == ["Table_01", "Table_02"]
+
+
+@pytest.mark.parametrize(("source_database", "escaped"), [
+    (DdlParse.DATABASE.postgresql, "E'It\\'s; CREATE TABLE Table_X (Col_01 integer);'"),
+    (DdlParse.DATABASE.oracle, "'It''s; CREATE TABLE Table_X (Col_01 integer);'"),
+    (DdlParse.DATABASE.mysql, "'It\\'s; CREATE TABLE Table_X (Col_01 integer);'"),
+    (None, "'It\\'s; CREATE TABLE Table_X (Col_01 integer);'"),
+])
+def test_iter_tables_quote_escape(source_database, escaped):
+    # Standard conforming strings of PostgreSQL and Oracle, the literal ends with backslash
+    backslash = "'C:\\'" if source_database in (DdlParse.DATABASE.postgresql, DdlParse.DATABASE.oracle) else "'C:\\\\'"
+    ddl = textwrap.dedent("""\
+        CREATE TABLE Table_01 (Col_01 varchar(10) DEFAULT {0});
+        INSERT INTO Table_01 VALUES ({0}), ({1});
+        INSERT INTO Table_01 VALUES ({0}, {1});
+        CREATE TABLE Table_02 (Col_01 integer);
+        CREATE TABLE Table_03 (Col_01 integer);
+        """).format(backslash, escaped)
+
+    assert [table.name for table in DdlParse().iter_tables(ddl, source_database)] == ["Table_01", "Table_02", "Table_03"]
+
+    # Scan in chunks of str and bytes
+    for data in [ddl, ddl.encode("utf-8")]:
+        for chunk_size in [1, 3, 7]:
+            scanner = _DdlParseScanner(source_database=source_database)
+            statements = []
+            for i in range(0, len(data), chunk_size):
+                statements.extend(scanner.feed(data[i:i + chunk_size]))
+            statements.extend(scanner.feed(data[:0], final=True))
+
+            assert len(statements) == 3
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_iter_tables_copy_data(newline):
+    ddl = newline.join([
+        "CREATE TABLE Table_01 (Col_01 integer, Col_02 text);",
+        "COPY Table_01 (Col_01, Col_02) FROM stdin;",
+        "1\tIt's; CREATE TABLE Table_X (Col_01 integer);",
+        "\\.",
+        "CREATE TABLE Table_02 (Col_01 integer);",
+        "COPY Table_02 (Col_01) FROM stdin;",
+        "2",
+        "\\.",
+        "CREATE TABLE Table_03 (Col_01 integer);",
+        "COPY Table_03 (Col_01) FROM stdin;",
+        "3",
+        "\\.",
+    ])
+
+    for data in [ddl, ddl.encode("utf-8")]:
+        assert [table.name for table in DdlParse().iter_tables_from_file(data if isinstance(data, bytes) else io.StringIO(data), DdlParse.DATABASE.postgresql)] \
+            == ["Table_01", "Table_02", "Table_03"]
+
+        # Scan in chunks, the closer is split
+        for chunk_size in [1, 2, 5]:
+            scanner = _DdlParseScanner(source_database=DdlParse.DATABASE.postgresql)
+            statements = []
+            for i in range(0, len(data), chunk_size):
+                statements.extend(scanner.feed(data[i:i + chunk_size]))
+            statements.extend(scanner.feed(data[:0], final=True))
+
+            assert len(statements) == 3
+
+    # "\." at the end of DDL script
+    tables = list(DdlParse().iter_tables(ddl + newline + "CREATE TABLE Table_04 (Col_01 integer);" + newline + "COPY Table_04 (Col_01) FROM stdin;" + newline + "\\."))
+    assert [table.name for table in tables] == ["Table_01", "Table_02", "Table_03", "Table_04"]
+
+
+def test_iter_tables_mysql_hash_comment():
+    ddl = textwrap.dedent("""\
+        # don't parse; CREATE TABLE Table_X (Col_01 integer);
+        CREATE TABLE Table_01 (
+          Col_01 integer, # it's the first column
+          Col_02 integer
+        );
+        INSERT INTO Table_01 VALUES (1, 2 # don't
+        );
+        CREATE TABLE Table_02 (Col_01 integer);
+        """)
+
+    tables = list(DdlParse().iter_tables(ddl, DdlParse.DATABASE.mysql))
+    assert [table.name for table in tables] == ["Table_01", "Table_02"]
+
+    # Chunks with the comment at the head of statement
+    scanner = _DdlParseScanner(source_database=DdlParse.DATABASE.mysql)
+    statements = [statement for i in range(0, len(ddl), 4) for statement in scanner.feed(ddl[i:i + 4])]
+    statements.extend(scanner.feed("", final=True))
+    assert len(statements) == 2
+
+
+@pytest.mark.parametrize(("file_type", "encoding"), [
+    ("path", "utf-8"),
+    ("path", "utf-16"),
+    ("gzip", "utf-8"),
+    ("bz2", "utf-8"),
+    ("lzma", "utf-8"),
+    ("binary_file", "utf-8"),
+    ("binary_file", "shift_jis"),
+    ("text_file", "utf-8"),
+    ("bytes", "utf-8"),
+    ("bytes", "utf-16"),
+    ("mmap", "utf-8"),
+])
+def test_iter_tables_from_file(tmp_path, monkeypatch, file_type, encoding):
+    import bz2, gzip, lzma, mmap
+
+    ddl = """
+        CREATE TABLE Table_01 (
+          Col_01 varchar(100) PRIMARY KEY COMMENT 'コメント; ソ',
+          Col_02 integer NOT NULL -- comment
+        );
+        /* comment */ INSERT INTO Table_01 VALUES ('CREATE TABLE Table_X (Col_01 integer);', 1), ("\\";", 2);
+        COPY Table_01 (Col_01, Col_02) FROM stdin;
+        CREATE TABLE Table_Y ('Col_01 integer');
+        \\.
+        CREATE FUNCTION Func_01() RETURNS integer AS $body$ CREATE TABLE Table_Z (Col_01 integer); $body$ LANGUAGE sql;
+        CREATE TABLE Table_02 (
+          Col_01 integer
+        );
+        """
+    data = textwrap.dedent(ddl).encode(encoding)
+
+    # Scan in small chunks, to check the statements across the chunks
+    monkeypatch.setattr(DdlParse, "_READ_CHUNK_SIZE", 7)
+
+    path = tmp_path / "dump.sql"
+    if file_type in ["gzip", "bz2", "lzma"]:
+        with {"gzip": gzip, "bz2": bz2, "lzma": lzma}[file_type].open(str(path), "wb") as f:
+            f.write(data)
+    else:
+        path.write_bytes(data)
+
+    if file_type in ["path", "gzip", "bz2", "lzma"]:
+        tables = list(DdlParse().iter_tables_from_file(str(path), encoding=encoding))
+    elif file_type == "binary_file":
+        with open(str(path), "rb") as f:
+            tables = list(DdlParse().iter_tables_from_file(f, encoding=encoding))
+    elif file_type == "text_file":
+        with open(str(path), encoding=encoding) as f:
+            tables = list(DdlParse().iter_tables_from_file(f))
+    elif file_type == "bytes":
+        tables = list(DdlParse().iter_tables_from_file(data, encoding=encoding))
+    else:
+        with open(str(path), "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            tables = list(DdlParse().iter_tables_from_file(mm, encoding=encoding))
+
+    assert [table.name for table in tables] == ["Table_01", "Table_02"]
+    assert list(tables[0].columns.keys()) == ["col_01", "col_02"]
+    assert tables[0].columns["Col_01"].comment == "コメント; ソ"
+    assert tables[0].columns["Col_02"].not_null is True
+    assert list(tables[1].columns.keys()) == ["col_01"]
+
+
+def test_iter_tables_from_empty_file(tmp_path):
+    path = tmp_path / "empty.sql"
+    path.write_bytes(b"")
+
+    ddlparse = DdlParse(source_database=DdlParse.DATABASE.oracle)
+    assert list(ddlparse.iter_tables_from_file(path, DdlParse.DATABASE.mysql)) == []
+
+    # Check the state of instance is not changed
+    assert ddlparse.source_database == DdlParse.DATABASE.oracle
+
+    # Error : Unknown encoding
+    with pytest.raises(LookupError):
+        DdlParse().iter_tables_from_file(path, encoding="unknown")
+
+
+@pytest.mark.parametrize(("test_case"), TEST_DATA.keys())
+def test_parse_packrat(test_case):
+    from pyparsing import ParserElement
+
+    data = TEST_DATA[test_case]
+
+    table = DdlParse(data["ddl"], data["database"]).parse()
+    packrat_table = DdlParse(data["ddl"], data["database"], packrat=True, packrat_cache_size=16).parse()
+    packrat_tables = list(DdlParse(packrat=True).iter_tables(data["ddl"], data["database"]))
+
+    # Check same parse results
+    assert packrat_table.to_bigquery_fields() == table.to_bigquery_fields()
+    assert packrat_tables[0].to_bigquery_fields() == table.to_bigquery_fields()
+    assert [col.constraint for col in packrat_table.columns.values()] == [col.constraint for col in table.columns.values()]
+
+    # Check global state of pyparsing is not changed
+    assert ParserElement._packratEnabled is False
+    assert all("_parse" not in vars(element) for element in _DdlParseElementHook._grammar_elements([DdlParse._DDL_SCAN_EXPR]))
+
+
+def test_packrat_option():
+    ddlparse = DdlParse()
+
+    assert ddlparse.packrat is False
+    assert ddlparse.packrat_cache_size == 128
+
+    ddlparse.packrat = True
+    ddlparse.packrat_cache_size = None
+
+    assert ddlparse.packrat is True
+    assert ddlparse.packrat_cache_size is None
+
+    # Parse in the other thread while packrat parsing is running
+    tables = []
+    with _DdlParseElementHook([DdlParse._DDL_PARSE_EXPR, DdlParse._DDL_SCAN_EXPR]):
+        thread = threading.Thread(target=lambda: tables.append(DdlParse().parse(TEST_DATA["basic"]["ddl"])))
+        thread.start()
+        thread.join()
+
+    assert tables[0].name == "Sample_Table"
+
+
+def table_properties(table):
+    """Get all public properties of DdlParseTable and its columns"""
+
+    columns = []
+    for col in table.columns.values():
+        column = {}
+        for name in ["name", "data_type", "length", "precision", "scale", "is_unsigned", "is_zerofill", "array_dimensional",
+                     "not_null", "primary_key", "unique", "auto_increment", "distkey", "sortkey", "encode", "default",
+                     "character_set", "constraint", "comment", "description", "source_database", "source_span"]:
+            column[name] = getattr(col, name)
+
+        try:
+            column["bigquery"] = [col.bigquery_data_type, col.bigquery_mode, col.bigquery_legacy_data_type, col.to_bigquery_field()]
+        except ValueError as e:
+            column["bigquery"] = str(e)
+
+        columns.append(column)
+
+    try:
+        bigquery_ddl = table.to_bigquery_ddl()
+    except ValueError as e:
+        bigquery_ddl = str(e)
+
+    return {
+        "schema": table.schema,
+        "name": table.name,
+        "is_temp": table.is_temp,
+        "source_database": table.source_database,
+        "columns": columns,
+        "constraint_spans": [definition[0] for definition in table._definitions if isinstance(definition, tuple)],
+        "bigquery_ddl": bigquery_ddl,
+    }
+
+
+@pytest.mark.parametrize(("ddl", "source_database"),
+    [(data["ddl"], data["database"]) for data in TEST_DATA.values()] +
+    [(data["source_ddl"], None) for data in TEST_DATA_DDL.values()] + [
+        ("CREATE TABLE Sample_Table (Col_01 integer, KEY idx_01 (Col_01), Col_02 integer,);", None),
+        ("CREATE TABLE Sample_Table (Col_01 integer, CONSTRAINT `uq_01` UNIQUE KEY uq_01 (Col_01)", None),
+        ("CREATE TABLE Sample_Table (Col_01 varchar(10) CHARACTER SET utf8 NOT NULL, Col_02 varchar(10) CHARACTER SET)", DdlParse.DATABASE.mysql),
+    ])
+def test_parse_fast_engine(ddl, source_database):
+    table = DdlParse(ddl, source_database).parse()
+    fast_table = DdlParse(ddl, source_database, engine=DdlParse.ENGINE.fast).parse()
+    fast_tables = list(DdlParse(engine=DdlParse.ENGINE.fast).iter_tables(ddl, source_database))
+
+    # Check same parse results
+    assert table_properties(fast_table) == table_properties(table)
+
+    # Source spans of iter_tables() are relative to CREATE TABLE statement
+    assert table_properties(fast_tables[0]) == table_properties(DdlParse(ddl[ddl.upper().index("CREATE"):], source_database).parse())
+
+
+@pytest.mark.parametrize(("ddl"), [
+    # foreign key
+    "CREATE TABLE Sample_Table (Col_01 integer, FOREIGN KEY (Col_01) REFERENCES Other_Table (Col_01));",
+    # blank comment line
+    "CREATE TABLE Sample_Table (\n--\nCol_01 integer\n);",
+    # definitions which are not delimited by comma
+    "CREATE TABLE Sample_Table (Col_01 integer Col_02 integer, Col_03 integer);",
+    # empty definition
+    "CREATE TABLE Sample_Table (Col_01 integer,, Col_02 integer);",
+    # check constraint
+    "CREATE TABLE Sample_Table (Col_01 integer, CONSTRAINT ck_01 CHECK (Col_01 > 0));",
+    # constraint without column list
+    "CREATE TABLE Sample_Table (CONSTRAINT pk_01 PRIMARY KEY Col_01);",
+    # column name which is not a word
+    "CREATE TABLE Sample_Table (Col_01 integer, (Col_02) integer);",
+])
+def test_parse_fast_engine_fallback(ddl):
+    with pytest.raises(_DdlParseFallback):
+        _DdlParseFastParser().parse(ddl)
+
+    # Check same parse results by pyparsing grammar
+    table = DdlParse(ddl).parse()
+    assert table_properties(DdlParse(ddl, engine=DdlParse.ENGINE.fast).parse()) == table_properties(table)
+
+
+def test_engine_option():
+    ddlparse = DdlParse()
+
+    assert ddlparse.engine == DdlParse.ENGINE.pyparsing
+
+    ddlparse.engine = DdlParse.ENGINE.fast
+
+    assert ddlparse.engine == DdlParse.ENGINE.fast
+
+    # Parse multiple tables, fall back to pyparsing when the statement has the other CREATE TABLE
+    ddl = """
+        CREATE TABLE Sample_Table_01 (Col_01 integer) CREATE TABLE Sample_Table_02 (Col_02 integer);
+        CREATE TABLE Sample_Table_03 (Col_03 integer);
+        """
+    tables = list(ddlparse.iter_tables(ddl))
+
+    assert [table.name for table in tables] == ["Sample_Table_01", "Sample_Table_02", "Sample_Table_03"]
+
+
+def test_lazy_grammar():
+    # Check pyparsing is imported and the grammar is built on first use
+    code = textwrap.dedent("""\
+        import sys
+        from ddlparse import DdlParse
+
+        assert "pyparsing" not in sys.modules
+
+        DdlParse("CREATE TABLE Sample_Table (Col_01 integer);", engine=DdlParse.ENGINE.fast).parse()
+        assert "pyparsing" not in sys.modules
+
+        DdlParse("CREATE TABLE Sample_Table (Col_01 integer);").parse()
+        assert "pyparsing" in sys.modules
+        """)
+
+    subprocess.check_call([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    # Check the same grammar instance
+    assert DdlParse._DDL_PARSE_EXPR is DdlParse()._DDL_PARSE_EXPR
+
+
+@pytest.mark.parametrize(("engine", "ordered"), [
+    (DdlParse.ENGINE.pyparsing, True),
+    (DdlParse.ENGINE.fast, False),
+])
+def test_parse_many(tmp_path, engine, ordered):
+    ddls = [data["ddl"] for data in TEST_DATA.values()]
+
+    # DDL script file
+    ddl_file = tmp_path / "sample.sql"
+    ddl_file.write_text(TEST_DATA["basic"]["ddl"], encoding="utf-8")
+    ddls.append(ddl_file)
+
+    ddlparse = DdlParse(engine=engine)
+    tables = list(ddlparse.parse_many(iter(ddls), DdlParse.DATABASE.postgresql, workers=2, chunksize=3, ordered=ordered))
+    expected_tables = [DdlParse(ddl, DdlParse.DATABASE.postgresql).parse() for ddl in ddls[:-1] + [TEST_DATA["basic"]["ddl"]]]
+
+    # Check same parse results
+    if ordered:
+        assert [table_properties(table) for table in tables] == [table_properties(table) for table in expected_tables]
+    else:
+        assert sorted(map(repr, map(table_properties, tables))) == sorted(map(repr, map(table_properties, expected_tables)))
+
+    # Check the state of instance is not changed
+    assert ddlparse.source_database is None
+
+    # Check the worker without initializer
+    assert [table_properties(table) for table in _parse_many_worker({}, ddls[-2:], None, "utf-8")] == \
+        [table_properties(DdlParse(ddl).parse()) for ddl in [ddls[-2], TEST_DATA["basic"]["ddl"]]]
+
+
+def test_parse_many_cache(tmp_path):
+    ddls = [TEST_DATA["basic"]["ddl"], TEST_DATA["constraint_mysql"]["ddl"], TEST_DATA["basic"]["ddl"]]
+    expected_tables = [table_properties(DdlParse(ddl, DdlParse.DATABASE.mysql).parse()) for ddl in ddls]
+
+    # DdlParseDiskCache is shared by the worker processes
+    cache = DdlParseDiskCache(tmp_path / "ddlparse_cache.db")
+    ddlparse = DdlParse(cache=cache)
+
+    assert [table_properties(table) for table in ddlparse.parse_many(ddls, DdlParse.DATABASE.mysql, workers=1)] == expected_tables
+    assert len(cache) == 2
+
+    assert [table_properties(table) for table in ddlparse.parse_many(ddls, DdlParse.DATABASE.mysql, workers=1)] == expected_tables
+    assert len(cache) == 2
+    assert cache.get(ddls[0], DdlParse.DATABASE.mysql) is not None
+
+    # DdlParseCache is not used
+    cache = DdlParseCache()
+    tables = list(DdlParse(cache=cache).parse_many(ddls, DdlParse.DATABASE.mysql, workers=1))
+
+    assert [table_properties(table) for table in tables] == expected_tables
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+
+def test_parse_many_exception():
+    ddlparse = DdlParse()
+
+    # Error : invalid arguments
+    with pytest.raises(ValueError):
+        ddlparse.parse_many([], workers=0)
+
+    with pytest.raises(ValueError):
+        ddlparse.parse_many([], chunksize=0)
+
+    with pytest.raises(LookupError):
+        ddlparse.parse_many([], encoding="unknown-encoding")
+
+    # Close the generator while parsing
+    tables = ddlparse.parse_many([TEST_DATA["basic"]["ddl"]] * 10, workers=1, chunksize=1)
+    assert next(tables).name == "Sample_Table"
+    tables.close()
+
+
+def test_parse_table():
+    ddlparse = DdlParse(source_database=DdlParse.DATABASE.mysql)
+
+    # Check new table for each call
+    table_01 = ddlparse.parse_table(TEST_DATA["basic"]["ddl"])
+    table_02 = ddlparse.parse_table(TEST_DATA["basic"]["ddl"], DdlParse.DATABASE.postgresql)
+
+    assert table_01 is not table_02
+    assert table_properties(table_01) == table_properties(DdlParse(TEST_DATA["basic"]["ddl"], DdlParse.DATABASE.mysql).parse())
+    assert table_properties(table_02) == table_properties(DdlParse(TEST_DATA["basic"]["ddl"], DdlParse.DATABASE.postgresql).parse())
+
+    # Check the state of instance is not changed
+    assert ddlparse.ddl is None
+    assert ddlparse.source_database == DdlParse.DATABASE.mysql
+
+    # Error : DDL is not specified
+    with pytest.raises(ValueError):
+        ddlparse.parse_table(None)
+
+    # Parse concurrently by the shared instance
+    for engine in DdlParse.ENGINE:
+        ddlparse = DdlParse(engine=engine, packrat=engine == DdlParse.ENGINE.pyparsing)
+        results = {}
+
+        def parse(test_case):
+            results[test_case] = [table_properties(ddlparse.parse_table(TEST_DATA[test_case]["ddl"])) for _ in range(2)]
+
+        threads = [threading.Thread(target=parse, args=(test_case,)) for test_case in TEST_DATA.keys()]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for test_case, data in TEST_DATA.items():
+            assert results[test_case] == [table_properties(DdlParse(data["ddl"]).parse())] * 2
+
+
+class AsyncChunks():
+    """Async iterable of DDL script chunks"""
+
+    def __init__(self, ddl, size):
+        self._chunks = iter([ddl[i:i + size] for i in range(0, len(ddl), size)])
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def run_async(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def async_tables(tables):
+    results = []
+    async for table in tables:
+        results.append(table_properties(table))
+    return results
+
+
+def stream_reader(data):
+    stream = asyncio.StreamReader()
+    stream.feed_data(data)
+    stream.feed_eof()
+    return stream
+
+
+class AwaitableRead():
+    """read() method which is not a coroutine function, but returns an awaitable"""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def read(self, size):
+        return self._stream.read(size)
+
+
+@pytest.mark.parametrize(("stream_type", "encoding"), [
+    ("str", "utf-8"),
+    ("bytes", "utf-8"),
+    ("binary_file", "utf-16"),
+    ("stream_reader", "utf-8"),
+    ("stream_reader", "utf-16"),
+    ("awaitable_read", "utf-8"),
+    ("async_iterable", "utf-8"),
+    ("async_iterable_bytes", "shift_jis"),
+    ("async_iterable_empty", "utf-8"),
+])
+def test_aiter_tables(monkeypatch, stream_type, encoding):
+    monkeypatch.setattr("ddlparse.ddlparse._DdlParseAsyncTables._READ_CHUNK_SIZE", 7)
+    monkeypatch.setattr("ddlparse.ddlparse._DdlParseAsyncTables._MAX_PENDING", 2)
+
+    ddl = ";\n".join(data["ddl"] for data in TEST_DATA.values()) if stream_type != "async_iterable_empty" else ""
+    data = ddl.encode(encoding)
+    ddlparse = DdlParse()
+
+    # Record the threads of the scan and the sync read
+    threads = set()
+    scan_chunk = DdlParse._scan_chunk
+
+    def record_scan_chunk(*args):
+        threads.add(threading.get_ident())
+        return scan_chunk(*args)
+
+    class BinaryFile(io.BytesIO):
+        def read(self, size):
+            threads.add(threading.get_ident())
+            return super().read(size)
+
+    monkeypatch.setattr(DdlParse, "_scan_chunk", staticmethod(record_scan_chunk))
+
+    async def parse():
+        streams = {
+            "str": lambda: ddl,
+            "bytes": lambda: data,
+            "binary_file": lambda: BinaryFile(data),
+            "stream_reader": lambda: stream_reader(data),
+            "awaitable_read": lambda: AwaitableRead(stream_reader(data)),
+            "async_iterable": lambda: AsyncChunks(ddl, 50),
+            "async_iterable_bytes": lambda: AsyncChunks(data, 50),
+            "async_iterable_empty": lambda: AsyncChunks(ddl, 50),
+        }
+
+        with ThreadPoolExecutor(2) as executor:
+            return await async_tables(ddlparse.aiter_tables(streams[stream_type](), DdlParse.DATABASE.mysql, encoding, executor))
+
+    # Check same parse results
+    assert run_async(parse()) == [table_properties(table) for table in DdlParse().iter_tables(ddl, DdlParse.DATABASE.mysql)]
+
+    # Check no scan and sync read in the thread of event loop
+    assert threads and threading.get_ident() not in threads
+
+    # Check the state of instance is not changed
+    assert ddlparse.source_database is None
+
+
+def test_aparse():
+    ddlparse = DdlParse(source_database=DdlParse.DATABASE.mysql, engine=DdlParse.ENGINE.fast)
+
+    async def parse():
+        with ProcessPoolExecutor(1) as executor:
+            return await asyncio.gather(
+                ddlparse.aparse(TEST_DATA["basic"]["ddl"]),
+                ddlparse.aparse(TEST_DATA["basic"]["ddl"], DdlParse.DATABASE.postgresql, executor))
+
+    tables = run_async(parse())
+
+    # Check same parse results
+    assert table_properties(tables[0]) == table_properties(DdlParse(TEST_DATA["basic"]["ddl"], DdlParse.DATABASE.mysql).parse())
+    assert table_properties(tables[1]) == table_properties(DdlParse(TEST_DATA["basic"]["ddl"], DdlParse.DATABASE.postgresql).parse())
+
+    # Error : DDL is not specified
+    with pytest.raises(ValueError):
+        run_async(ddlparse.aparse(None))
+
+    with pytest.raises(ValueError):
+        ddlparse.aiter_tables(None)
+
+    # Error : unknown encoding
+    with pytest.raises(LookupError):
+        ddlparse.aiter_tables("", encoding="unknown-encoding")
+
+
+def test_parse_cache():
+    cache = DdlParseCache(maxsize=2)
+    ddlparse = DdlParse(cache=cache)
+
+    assert ddlparse.cache is cache
+    assert cache.maxsize == 2
+
+    # Check same parse results
+    for test_case in ["basic", "basic", "constraint_mysql"]:
+        table = ddlparse.parse_table(TEST_DATA[test_case]["ddl"], TEST_DATA[test_case]["database"])
+        assert table_properties(table) == table_properties(DdlParse(TEST_DATA[test_case]["ddl"], TEST_DATA[test_case]["database"]).parse())
+
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+
+    # Check copy on read
+    table = ddlparse.parse_table("\n  " + TEST_DATA["basic"]["ddl"] + "  \n")
+    table.name = "Changed_Table"
+    table.columns["Col_01"].comment = "changed"
+
+    assert ddlparse.parse_table(TEST_DATA["basic"]["ddl"]).name == "Sample_Table"
+    assert ddlparse.parse_table(TEST_DATA["basic"]["ddl"]).columns["Col_01"].comment is None
+    assert (cache.hits, cache.misses, len(cache)) == (4, 2, 2)
+
+    # Check source database is the part of the key
+    assert ddlparse.parse_table(TEST_DATA["basic"]["ddl"], DdlParse.DATABASE.oracle).columns["Col_13"].bigquery_data_type == "DATETIME"
+    assert (cache.hits, cache.misses, len(cache)) == (4, 3, 2)
+
+    # Check LRU eviction : "constraint_mysql" is evicted
+    ddlparse.parse_table(TEST_DATA["constraint_mysql"]["ddl"], TEST_DATA["constraint_mysql"]["database"])
+    assert (cache.hits, cache.misses, len(cache)) == (4, 4, 2)
+
+    # Check parse()
+    ddlparse = DdlParse(TEST_DATA["basic"]["ddl"], DdlParse.DATABASE.oracle, cache=cache)
+    table = ddlparse.parse()
+    assert table is ddlparse.parse()
+    assert table_properties(table) == table_properties(DdlParse(TEST_DATA["basic"]["ddl"], DdlParse.DATABASE.oracle).parse())
+    assert (cache.hits, cache.misses, len(cache)) == (6, 4, 2)
+
+    # Check cache in the other process
+    assert table_properties(pickle.loads(pickle.dumps(ddlparse)).parse_table(TEST_DATA["basic"]["ddl"])) == table_properties(table)
+
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+    # Check unlimited cache
+    cache = DdlParseCache(maxsize=None)
+    ddlparse.cache = cache
+    for data in TEST_DATA.values():
+        ddlparse.parse_table(data["ddl"])
+    assert len(cache) == len(TEST_DATA)
+
+
+def test_parse_disk_cache(tmp_path):
+    path = str(tmp_path / "ddlparse_cache.db")
+    cache = DdlParseDiskCache(path)
+    ddlparse = DdlParse(cache=cache)
+
+    assert cache.path == path
+    assert cache.max_bytes == 256 * 1024 * 1024
+
+    # Check same parse results
+    for data in TEST_DATA.values():
+        assert table_properties(ddlparse.parse_table(data["ddl"], data["database"])) == table_properties(DdlParse(data["ddl"], data["database"]).parse())
+
+    assert (cache.hits, cache.misses, len(cache)) == (0, len(TEST_DATA), len(TEST_DATA))
+
+    # Check the other cache instance and the other process
+    other_cache = pickle.loads(pickle.dumps(DdlParseDiskCache(path)))
+    for data in TEST_DATA.values():
+        assert table_properties(DdlParse(cache=other_cache).parse_table(data["ddl"], data["database"])) == table_properties(DdlParse(data["ddl"], data["database"]).parse())
+
+    assert (other_cache.hits, other_cache.misses) == (len(TEST_DATA), 0)
+
+    # Check ddlparse version is the part of the key
+    other_cache._version = "0.0.0"
+    assert other_cache.get(TEST_DATA["basic"]["ddl"]) is None
+
+    # Check broken data
+    other_cache._connection().execute("UPDATE ddlparse_cache SET data = ?", (b"broken",))
+    other_cache._connection().commit()
+    assert cache.get(TEST_DATA["basic"]["ddl"]) is None
+    assert len(cache) == len(TEST_DATA) - 1
+
+    # Check concurrent writers
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache), cache.size) == (0, 0, 0, 0)
+
+    def parse(data):
+        DdlParse(cache=cache).parse_table(data["ddl"], data["database"])
+
+    threads = [threading.Thread(target=parse, args=(data,)) for data in TEST_DATA.values()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == len(TEST_DATA)
+
+    # Check LRU eviction over the total size
+    cache = DdlParseDiskCache(str(tmp_path / "ddlparse_cache_small.db"), max_bytes=cache.size // 2)
+    ddlparse = DdlParse(cache=cache)
+
+    for data in TEST_DATA.values():
+        ddlparse.parse_table(data["ddl"], data["database"])
+
+    assert 0 < len(cache) < len(TEST_DATA)
+    assert cache.size <= cache.max_bytes
+    assert cache.get(TEST_DATA["basic"]["ddl"], TEST_DATA["basic"]["database"]) is None
+    assert cache.get(TEST_DATA["column_comment"]["ddl"], TEST_DATA["column_comment"]["database"]) is not None
+
+    # Check the running total size, also over replaced tables
+    cache.put(TEST_DATA["column_comment"]["ddl"], TEST_DATA["column_comment"]["database"], DdlParse().parse_table(TEST_DATA["basic"]["ddl"]))
+    assert cache.size == cache._connection().execute("SELECT SUM(size) FROM ddlparse_cache").fetchone()[0]
+
+    # Check close() and with block, reopened by a later use
+    with DdlParseDiskCache(path) as cache:
+        assert len(cache) == len(TEST_DATA)
+
+        threads = [threading.Thread(target=len, args=(cache,)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        connections = list(cache._connections)
+        assert len(connections) == 3
+
+    assert cache._connections == []
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
+
+    assert len(cache) == len(TEST_DATA)
+    cache.close()
+
+
+def test_source_span():
+    ddl = TEST_DATA["constraint_mysql"]["ddl"]
+
+    for engine in DdlParse.ENGINE:
+        table = DdlParse(engine=engine).parse_table(ddl)
+
+        assert ddl[slice(*table.columns["Col_01"].source_span)] == "Col_01 varchar(100)"
+        assert [ddl[slice(*definition[0])] for definition in table._definitions if isinstance(definition, tuple)][0] == "CONSTRAINT const_01 PRIMARY KEY (Col_01, Col_02)"
+
+    # Check source span of cached table
+    cache = DdlParseCache()
+    for leading_whitespace in ["", "\n  \n"]:
+        table = DdlParse(cache=cache).parse_table(leading_whitespace + ddl)
+        assert (leading_whitespace + ddl)[slice(*table.columns["Col_01"].source_span)] == "Col_01 varchar(100)"
+
+
+@pytest.mark.parametrize(("prefix", "old", "new", "incremental"), [
+    # edit data type
+    ("Col_03 ", "text", "integer", True),
+    # edit column name to the existing column
+    ("Col_0", "3", "4", True),
+    # add constraint
+    ("Col_04 integer", "", " NOT NULL DEFAULT 1", True),
+    # add columns and table constraint
+    ("Col_54 char(200) NOT NULL", "", ",\n  Col_55 integer, Col_56 date, UNIQUE (Col_55)", True),
+    # edit multiple columns
+    ("Col_10 ", "double precision,\n              Col_11 real", "bool, Col_11 money", True),
+    # delete column
+    ("", "Col_05 bigint,\n              Col_06 serial,", "", False),
+    # comment out the rest of line
+    ("Col_08 float", "", " -- float", False),
+    # add index
+    ("Col_08 float", "", ", KEY idx_01 (Col_08)", False),
+    # edit table name
+    ("", "Sample_Table", "New_Table", False),
+    # invalid column definition
+    ("Col_08 ", "float", "(", False),
+])
+def test_reparse(monkeypatch, prefix, old, new, incremental):
+    ddl = TEST_DATA["basic"]["ddl"]
+    offset = ddl.index(prefix + old) + len(prefix)
+    new_ddl = ddl[:offset] + new + ddl[offset + len(old):]
+
+    for engine in DdlParse.ENGINE:
+        ddlparse = DdlParse(source_database=DdlParse.DATABASE.postgresql, engine=engine)
+        table = ddlparse.parse_table(ddl)
+        columns = table.columns
+        col_01 = table.columns["Col_01"]
+
+        # Check the incremental parse
+        reparse_table = DdlParse._reparse_table
+        monkeypatch.setattr(DdlParse, "_reparse_table", lambda self, table, ddl: pytest.fail() if incremental else reparse_table(self, table, ddl))
+
+        assert ddlparse.reparse(table, ddl, offset, len(old), new) is table
+
+        monkeypatch.undo()
+
+        # Check same parse results
+        assert table_properties(table) == table_properties(DdlParse(source_database=DdlParse.DATABASE.postgresql, engine=engine).parse_table(new_ddl))
+
+        # Check update in place
+        assert table.columns is columns
+        assert (table.columns["Col_01"] is col_01) == incremental
+
+
+def test_reparse_edits():
+    ddl = TEST_DATA["constraint_postgres_oracle_redshift"]["ddl"]
+    ddlparse = DdlParse(engine=DdlParse.ENGINE.fast)
+    table = ddlparse.parse_table(ddl)
+
+    # Check same parse results for the sequence of edits
+    for find, replacement in [("char(200)", "char(20)"), ("integer", "integer NOT NULL"), ("NOT NULL", ""), ("double", "double precision"), ("Col_05 datetime", "Col_05 datetime, Col_06 date")]:
+        offset = ddl.index(find)
+        table = ddlparse.reparse(table, ddl, offset, len(find), replacement)
+        ddl = ddl[:offset] + replacement + ddl[offset + len(find):]
+
+        assert table_properties(table) == table_properties(DdlParse().parse_table(ddl))
+
+    # Error : out of DDL script
+    with pytest.raises(ValueError):
+        ddlparse.reparse(table, ddl, len(ddl), 1, "")
+
+
+
+@pytest.mark.parametrize("engine", [DdlParse.ENGINE.pyparsing, DdlParse.ENGINE.fast])
+def test_reparse_failure(engine):
+    ddl = "CREATE TABLE Sample_Table (Col_01 integer, Col_02 integer, Col_03 integer, Col_04 integer, Col_05 integer, UNIQUE (Col_04))"
+    ddlparse = DdlParse(engine=engine)
+    table = ddlparse.parse_table(ddl)
+    expected = table_properties(table)
+
+    # Error : the table constraint of the renamed column, the table is not changed
+    offset = ddl.index("Col_04 integer")
+    with pytest.raises(KeyError):
+        ddlparse.reparse(table, ddl, offset, len("Col_04"), "Col_40")
+
+    assert table_properties(table) == expected
+    assert [definition.name if isinstance(definition, DdlParseColumn) else definition[1] for definition in DdlParse._table_definitions(table)] \
+        == ["Col_01", "Col_02", "Col_03", "Col_04", "Col_05", "UNIQUE"]
+
+    # Recover from the failed edit, same as parse results
+    new_ddl = ddl.replace("Col_04 integer", "Col_40 integer")
+    assert ddlparse.reparse(table, new_ddl, offset, len("Col_40"), "Col_04") is table
+    assert table_properties(table) == expected
+
+    table = ddlparse.reparse(table, ddl, offset, len("Col_04 integer"), "Col_04 integer, Col_06 integer")
+    assert table_properties(table) == table_properties(DdlParse().parse_table(ddl.replace("Col_04 integer", "Col_04 integer, Col_06 integer")))
+    assert [col.source_span for col in table.columns.values()] == \
+        [col.source_span for col in DdlParse().parse_table(ddl.replace("Col_04 integer", "Col_04 integer, Col_06 integer")).columns.values()]
+
+ALTER_BASE_DDL = "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 char(200), Col_03 integer)"
+
+@pytest.mark.parametrize(("alter_ddl", "expected_ddl"), [
+    # add column
+    ("ALTER TABLE Sample_Table ADD COLUMN Col_04 date NOT NULL;",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 char(200), Col_03 integer, Col_04 date NOT NULL)"),
+    ("ALTER TABLE Sample_Table ADD Col_04 date FIRST",
+     "CREATE TABLE Sample_Table (Col_04 date, Col_01 varchar(100) PRIMARY KEY, Col_02 char(200), Col_03 integer)"),
+    ("ALTER TABLE `Sample_Table` ADD COLUMN IF NOT EXISTS `Col_04` date AFTER `Col_01`",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_04 date, Col_02 char(200), Col_03 integer)"),
+    ("ALTER TABLE Sample_Table ADD COLUMN IF NOT EXISTS Col_01 integer, ADD COLUMN IF NOT EXISTS Col_04 date",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 char(200), Col_03 integer, Col_04 date)"),
+    ("ALTER TABLE Sample_Table ADD (Col_04 date, Col_05 number(10, 2) DEFAULT '0,0')",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 char(200), Col_03 integer, Col_04 date, Col_05 number(10, 2) DEFAULT '0,0')"),
+    # column definition which is not supported by the fast parser
+    ("ALTER TABLE Sample_Table ADD COLUMN Col_04 date --\n",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 char(200), Col_03 integer, Col_04 date)"),
+    # add constraint
+    ("ALTER TABLE Sample_Table ADD CONSTRAINT uq_01 UNIQUE (Col_02, Col_03)",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 char(200) UNIQUE, Col_03 integer UNIQUE)"),
+    ("ALTER TABLE Sample_Table ADD PRIMARY KEY (Col_03), ADD INDEX idx_01 (Col_02), "
+     "ADD FOREIGN KEY (Col_02) REFERENCES Other_Table (Col_02), ADD CONSTRAINT ck_01 CHECK (Col_03 > 0)",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 char(200), Col_03 integer PRIMARY KEY)"),
+    # drop column
+    ("ALTER TABLE Sample_Table DROP COLUMN Col_02, DROP PRIMARY KEY, DROP INDEX idx_01",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) NOT NULL, Col_03 integer)"),
+    ("ALTER TABLE Sample_Table DROP Col_02 CASCADE, DROP COLUMN IF EXISTS Col_04",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_03 integer)"),
+    ("ALTER TABLE Sample_Table DROP (Col_02, Col_03)",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY)"),
+    # modify column
+    ("ALTER TABLE Sample_Table MODIFY Col_02 varchar(10) NOT NULL",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 varchar(10) NOT NULL, Col_03 integer)"),
+    ("ALTER TABLE Sample_Table MODIFY COLUMN Col_03 bigint FIRST",
+     "CREATE TABLE Sample_Table (Col_03 bigint, Col_01 varchar(100) PRIMARY KEY, Col_02 char(200))"),
+    ("ALTER TABLE Sample_Table MODIFY (Col_02 varchar2(10), Col_03 number)",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 varchar2(10), Col_03 number)"),
+    ("ALTER TABLE Sample_Table CHANGE COLUMN Col_02 Col_04 text AFTER Col_03",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_03 integer, Col_04 text)"),
+    # alter column
+    ("ALTER TABLE Sample_Table ALTER COLUMN Col_01 TYPE integer USING Col_01::integer",
+     "CREATE TABLE Sample_Table (Col_01 integer PRIMARY KEY, Col_02 char(200), Col_03 integer)"),
+    ("ALTER TABLE Sample_Table ALTER COLUMN Col_02 SET DATA TYPE numeric(10, 2), ALTER COLUMN Col_02 SET NOT NULL, ALTER Col_02 SET DEFAULT 0",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 numeric(10, 2) NOT NULL DEFAULT 0, Col_03 integer)"),
+    ("ALTER TABLE Sample_Table ALTER COLUMN Col_02 SET DEFAULT 'abc', ALTER COLUMN Col_02 SET STATISTICS 100; ALTER TABLE Sample_Table ALTER COLUMN Col_02 DROP DEFAULT",
+     ALTER_BASE_DDL),
+    ("ALTER TABLE Sample_Table ALTER COLUMN Col_02 SET NOT NULL; ALTER TABLE Sample_Table ALTER COLUMN Col_02 DROP NOT NULL",
+     ALTER_BASE_DDL),
+    # rename
+    ("ALTER TABLE Sample_Table RENAME COLUMN Col_02 TO Col_04",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_04 char(200), Col_03 integer)"),
+    ("ALTER TABLE Sample_Table RENAME Col_02 TO Col_04, RENAME INDEX idx_01 TO idx_02",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_04 char(200), Col_03 integer)"),
+    ("ALTER TABLE Sample_Table ADD Col_04 date, RENAME TO My_Schema.New_Table, ADD Col_05 date",
+     "CREATE TABLE My_Schema.New_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 char(200), Col_03 integer, Col_04 date, Col_05 date)"),
+    # ignored actions and statements
+    ("ALTER TABLE Sample_Table ENGINE=InnoDB, OWNER TO ddlparse, ADD Col_04 date",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 char(200), Col_03 integer, Col_04 date)"),
+    ("ALTER TABLE Other_Table ADD Col_04 date; CREATE TABLE Sample_Table (Col_05 integer); DROP TABLE Sample_Table; "
+     "INSERT INTO Sample_Table VALUES (1); ALTER TABLE ONLY My_Schema.Sample_Table ADD Col_04 date",
+     "CREATE TABLE Sample_Table (Col_01 varchar(100) PRIMARY KEY, Col_02 char(200), Col_03 integer, Col_04 date)"),
+])
+def test_alter(alter_ddl, expected_ddl):
+    for engine in DdlParse.ENGINE:
+        ddlparse = DdlParse(source_database=DdlParse.DATABASE.oracle, engine=engine)
+        table = ddlparse.parse_table(ALTER_BASE_DDL)
+        columns = table.columns
+
+        expected_table = ddlparse.parse_table(expected_ddl)
+        for col in expected_table.columns.values():
+            col.source_span = None
+
+        # Check same parse results, in place
+        assert ddlparse.alter(table, alter_ddl) is table
+        assert table.columns is columns
+        assert table_properties(table) == table_properties(expected_table)
+
+    # Source spans are unknown, re-parse the whole DDL script
+    new_table = ddlparse.reparse(table, expected_ddl, 0, 0, "")
+    assert table_properties(new_table) == table_properties(ddlparse.parse_table(expected_ddl))
+
+
+def test_alter_exception():
+    ddlparse = DdlParse()
+    table = ddlparse.parse_table(ALTER_BASE_DDL)
+
+    # Error : DDL is not specified
+    with pytest.raises(ValueError):
+        ddlparse.alter(table, None)
+
+    # Error : unsupported statement
+    with pytest.raises(ValueError, match="Unsupported statement"):
+        ddlparse.alter(table, "ALTER TABLE (Col_01)")
+
+    # Error : column already exists
+    with pytest.raises(ValueError, match="Column already exists"):
+        ddlparse.alter(table, "ALTER TABLE Sample_Table ADD Col_01 integer")
+
+    with pytest.raises(ValueError, match="Column already exists"):
+        ddlparse.alter(table, "ALTER TABLE Sample_Table CHANGE Col_01 Col_02 integer")
+
+    with pytest.raises(ValueError, match="Column already exists"):
+        ddlparse.alter(table, "ALTER TABLE Sample_Table RENAME COLUMN Col_01 TO col_02")
+
+    # Error : column is not defined
+    for alter_ddl in [
+        "ALTER TABLE Sample_Table DROP COLUMN Col_04",
+        "ALTER TABLE Sample_Table MODIFY Col_04 integer",
+        "ALTER TABLE Sample_Table CHANGE Col_04 Col_05 integer",
+        "ALTER TABLE Sample_Table ALTER COLUMN Col_04 TYPE integer",
+        "ALTER TABLE Sample_Table ALTER COLUMN Col_04 SET NOT NULL",
+        "ALTER TABLE Sample_Table ALTER COLUMN Col_04 SET DEFAULT 0",
+        "ALTER TABLE Sample_Table RENAME COLUMN Col_04 TO Col_05",
+        "ALTER TABLE Sample_Table ADD Col_04 integer AFTER Col_05",
+    ]:
+        with pytest.raises(ValueError, match="Column is not defined: Col_0[45]"):
+            ddlparse.alter(table, alter_ddl)
+
+    assert list(table.columns) == ["col_01", "col_02", "col_03"]
+
+    # Warning : unsupported action, the columns of named constraint are unknown
+    with pytest.warns(UserWarning, match="DROP CONSTRAINT uq_01"):
+        ddlparse.alter(table, "ALTER TABLE Sample_Table ADD CONSTRAINT uq_01 UNIQUE (Col_02), DROP CONSTRAINT uq_01")
+
+    assert table.columns["Col_02"].unique
+
+
+def test_column_dict():
+    columns = DdlParse().parse_table(ALTER_BASE_DDL).columns
+
+    # Case insensitive keys
+    assert "COL_01" in columns
+    del columns["COL_01"]
+    assert "col_01" not in columns
+
+    columns.move("Col_02", "COL_03")
+    assert list(columns) == ["col_03", "col_02"]
+
+    columns.move("Col_02", "Col_02")
+    columns.move("Col_02", first=True)
+    assert list(columns) == ["col_02", "col_03"]
+
+    # Rename to the other case of same name
+    columns.rename("col_02", "COL_02")
+    assert list(columns) == ["col_02", "col_03"]
+    assert columns["col_02"].name == "COL_02"
+
+    columns.replace("Col_03", DdlParseColumn("Col_01", {"type_name": ["integer"]}))
+    assert list(columns) == ["col_02", "col_01"]
+
+    # Keys other than str are not found
+    assert 1 not in columns
+    assert None not in columns
+    assert columns.get(1) is None
+    assert columns.get(None, 1) == 1
+    assert columns.pop(1, None) is None
+    with pytest.raises(KeyError):
+        columns[1]
+    with pytest.raises(KeyError):
+        del columns[1]
+
+    # Spellings of the other cases are cached on lookup of the existing columns only, and removed with the column
+    column = columns["Col_01"]
+    for delete in [lambda key: columns.__delitem__(key), lambda key: columns.pop(key), lambda key: columns.popitem()]:
+        columns["COL_01"] = column
+        assert columns["COL_01"] is column and columns["Col_01"] is column and columns["col_01"] is column
+        assert sorted(key for key, folded_key in columns._folded_keys.items() if folded_key == "col_01") == ["COL_01", "Col_01"]
+
+        delete("col_01")
+        assert "col_01" not in columns
+        assert "col_01" not in columns._folded_keys.values() and "col_01" not in columns._aliases
+
+    assert "Col_99" not in columns and "Col_99" not in columns._folded_keys
+
+    # Move to the beginning and pop the first column, same as OrderedDict
+    columns["Col_01"] = column
+    columns.move_to_end("COL_01", last=False)
+    assert list(columns) == ["col_01", "col_02"]
+    assert columns.popitem(last=False)[0] == "col_01"
+    columns.popitem(last=False)
+    with pytest.raises(KeyError):
+        columns.popitem(last=False)
+
+    # Update with the case insensitive keys
+    columns.update({"COL_01": column}, Col_02=column)
+    columns |= [("col_03", column)]
+    assert list(columns) == ["col_01", "col_02", "col_03"]
+
+
+def test_column_dict_index():
+    columns = DdlParse().parse_table(ALTER_BASE_DDL).columns
+
+    # Case insensitive keys of all dict methods
+    assert columns.get("COL_02").name == "Col_02"
+    assert columns.get("Col_99") is None
+    assert columns.get("Col_99", 1) == 1
+    assert "cOL_03" in columns
+    assert columns.setdefault("COL_01").name == "Col_01"
+
+    # Lookup by ordinal
+    assert [columns.at(i).name for i in range(3)] == ["Col_01", "Col_02", "Col_03"]
+    assert columns.at(-1).name == "Col_03"
+    assert columns.index("COL_03") == 2
+
+    with pytest.raises(IndexError):
+        columns.at(3)
+    with pytest.raises(KeyError):
+        columns.index("Col_99")
+
+    # Ordinals follow the changes of columns
+    assert columns.pop("COL_01").name == "Col_01"
+    assert columns.pop("COL_01", None) is None
+    assert columns.at(0).name == "Col_02"
+
+    columns.append("Col_04", {"type_name": ["date"]})
+    columns.setdefault("Col_05", DdlParseColumn("Col_05", {"type_name": ["date"]}))
+    assert columns.index("col_05") == 3
+
+    columns.move_to_end("COL_02")
+    assert [columns.at(i).name for i in range(4)] == ["Col_03", "Col_04", "Col_05", "Col_02"]
+
+    columns.move("Col_02", first=True)
+    columns.rename("Col_03", "Col_01")
+    assert [columns.at(i).name for i in range(4)] == ["Col_02", "Col_01", "Col_04", "Col_05"]
+
+    assert columns.popitem()[1].name == "Col_05"
+    assert columns.at(-1).name == "Col_04"
+
+    # Copy and pickle
+    for copied in [columns.copy(), pickle.loads(pickle.dumps(columns))]:
+        assert type(copied) is type(columns)
+        assert copied.source_database == columns.source_database
+        assert [copied.at(i).name for i in range(3)] == ["Col_02", "Col_01", "Col_04"]
+        assert copied["COL_04"].name == "Col_04"
+
+    columns.clear()
+    assert len(columns) == 0
+    assert columns.get("Col_02") is None
+    with pytest.raises(IndexError):
+        columns.at(0)
+
+
+def test_replay(tmp_path, monkeypatch):
+    migration_file = tmp_path / "0003.sql"
+    migration_file.write_text("ALTER TABLE Users ADD COLUMN Email varchar(255) NOT NULL AFTER Id;\n"
+                              "ALTER TABLE Users RENAME COLUMN Name TO Full_Name, ADD CONSTRAINT uq_01 UNIQUE (Email);\n")
+
+    migrations = [
+        "CREATE TABLE Users (Id integer PRIMARY KEY, Name varchar(100));",
+        "CREATE TABLE Temp_Table (Col_01 integer); CREATE TABLE My_Schema.Logs (Id integer);\n"
+        "INSERT INTO Temp_Table VALUES (1);",
+        migration_file,
+        "DROP TABLE IF EXISTS Temp_Table, Other_Table, Temp_Table CASCADE; DROP TABLE Temp_Table;",
+        "RENAME TABLE Users TO Temp_Table, Temp_Table TO Members; ALTER TABLE My_Schema.Members ALTER COLUMN Full_Name TYPE text;",
+        "ALTER TABLE My_Schema.Logs RENAME TO Archived_Logs, ADD Message text;",
+    ]
+
+    expected_ddls = [
+        "CREATE TABLE Members (Id integer PRIMARY KEY, Email varchar(255) NOT NULL UNIQUE, Full_Name text)",
+        "CREATE TABLE My_Schema.Archived_Logs (Id integer, Message text)",
+    ]
+
+    replay_migration = DdlParse._replay_migration
+    replayed = []
+
+    def count_replay_migration(self, tables, ddl):
+        replayed.append(ddl)
+        return replay_migration(self, tables, ddl)
+
+    monkeypatch.setattr(DdlParse, "_replay_migration", count_replay_migration)
+
+    for engine in DdlParse.ENGINE:
+        ddlparse = DdlParse(source_database=DdlParse.DATABASE.mysql, engine=engine)
+
+        for checkpoint_dir in [None, tmp_path / engine.name]:
+            replayed.clear()
+            tables = ddlparse.replay(migrations, DdlParse.DATABASE.mysql, checkpoint_dir, checkpoint_interval=4)
+
+            # Check same parse results
+            assert isinstance(tables, DdlParseTableDict)
+            assert list(tables) == ["members", "my_schema.archived_logs"]
+            assert tables.key(None, "Members") == "Members"
+
+            for key, expected_ddl in zip(["MEMBERS", "My_Schema.Archived_Logs"], expected_ddls):
+                expected_table = DdlParse(expected_ddl, DdlParse.DATABASE.mysql).parse()
+                for col in expected_table.columns.values():
+                    col.source_span = None
+
+                assert table_properties(tables[key]) == table_properties(expected_table)
+
+            assert len(replayed) == len(migrations)
+
+        # Snapshots every 4 migrations and at the end
+        assert sorted(name[:17] for name in os.listdir(checkpoint_dir)) == ["ddlparse-00000004", "ddlparse-00000006"]
+
+        # Resume from the newest snapshot
+        replayed.clear()
+        assert list(ddlparse.replay(migrations, checkpoint_dir=checkpoint_dir)) == list(tables)
+        assert replayed == []
+
+        # The older snapshots are kept to check the resume from them
+        replayed.clear()
+        tables = ddlparse.replay(migrations + ["ALTER TABLE Members DROP Email"], checkpoint_dir=checkpoint_dir, checkpoint_keep=None)
+        assert list(tables["Members"].columns) == ["id", "full_name"]
+        assert len(replayed) == 1
+
+        # Snapshots of the other migrations and the other source database are not used
+        replayed.clear()
+        ddlparse.replay(migrations[:5] + ["ALTER TABLE Members DROP Email"], checkpoint_dir=checkpoint_dir)
+        assert len(replayed) == 2
+
+        replayed.clear()
+        ddlparse.replay(migrations, DdlParse.DATABASE.postgresql, checkpoint_dir=checkpoint_dir)
+        assert len(replayed) == len(migrations)
+
+        # Check the state of instance is not changed
+        assert ddlparse.source_database == DdlParse.DATABASE.mysql
+
+        # Broken snapshot is skipped
+        for name in os.listdir(checkpoint_dir):
+            if name.startswith("ddlparse-00000006"):
+                (checkpoint_dir / name).write_bytes(b"broken")
+
+        replayed.clear()
+        ddlparse.replay(migrations, DdlParse.DATABASE.mysql, checkpoint_dir=checkpoint_dir)
+        assert len(replayed) == 2
+
+
+def test_replay_exception():
+    ddlparse = DdlParse()
+
+    # Error : table is not defined
+    with pytest.raises(ValueError, match="Table is not defined: My_Schema.Users"):
+        ddlparse.replay(["ALTER TABLE My_Schema.Users ADD Col_01 integer"])
+
+    # Error : column is not defined
+    with pytest.raises(ValueError, match="Column is not defined: Col_02"):
+        ddlparse.replay(["CREATE TABLE My_Schema.Users (Col_01 integer)", "ALTER TABLE My_Schema.Users DROP COLUMN Col_02"])
+
+    # Error : checkpoint_interval and checkpoint_keep
+    with pytest.raises(ValueError):
+        ddlparse.replay([], checkpoint_interval=0)
+
+    with pytest.raises(ValueError):
+        ddlparse.replay([], checkpoint_keep=0)
+
+
+def test_replay_checkpoint_keep(tmp_path, monkeypatch):
+    migrations = ["CREATE TABLE Users (Id integer);"] + ["ALTER TABLE Users ADD Col_{:02d} integer;".format(i) for i in range(5)]
+    ddlparse = DdlParse()
+
+    def checkpoints(checkpoint_dir):
+        return sorted(name[:17] for name in os.listdir(checkpoint_dir))
+
+    # The older snapshots of the same migrations are removed
+    ddlparse.replay(migrations, checkpoint_dir=tmp_path / "keep", checkpoint_interval=1)
+    assert checkpoints(tmp_path / "keep") == ["ddlparse-00000005", "ddlparse-00000006"]
+
+    # Snapshots of the other migrations are kept
+    ddlparse.replay(migrations[:3] + ["DROP TABLE Users;"], checkpoint_dir=tmp_path / "keep", checkpoint_interval=1, checkpoint_keep=1)
+    assert checkpoints(tmp_path / "keep") == ["ddlparse-00000004", "ddlparse-00000005", "ddlparse-00000006"]
+
+    # None keeps all snapshots
+    ddlparse.replay(migrations, checkpoint_dir=tmp_path / "all", checkpoint_interval=2, checkpoint_keep=None)
+    assert checkpoints(tmp_path / "all") == ["ddlparse-00000002", "ddlparse-00000004", "ddlparse-00000006"]
+
+    # Snapshot removed by the concurrent replay
+    def remove(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "remove", remove)
+    assert list(ddlparse.replay(migrations, checkpoint_dir=tmp_path / "concurrent", checkpoint_interval=1)["Users"].columns) == \
+        ["id", "col_00", "col_01", "col_02", "col_03", "col_04"]
+
+
+def test_compact_model():
+    ddl = TEST_DATA["default_postgres_redshift"]["ddl"]
+    table = DdlParse(ddl).parse()
+
+    # No instance dictionary
+    for obj in [table, table.columns["Col_01"]]:
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.unknown_attribute = None
+
+    # Boolean flags are independent of each other
+    col = DdlParseColumn("Col_01", {"type_name": ["integer"], "unsigned": "UNSIGNED"}, constraint={"null": "NOT NULL", "key": "UNIQUE", "auto_increment": "AUTO_INCREMENT"})
+    assert (col.is_unsigned, col.is_zerofill, col.not_null, col.primary_key, col.unique, col.auto_increment, col.distkey, col.sortkey) \
+        == (True, False, True, False, True, True, False, False)
+
+    col.not_null = False
+    col.primary_key = True
+    assert (col.is_unsigned, col.not_null, col.primary_key, col.unique, col.auto_increment) == (True, False, True, True, True)
+
+    # Check pickle
+    assert table_properties(pickle.loads(pickle.dumps(table))) == table_properties(table)
+
+
+def test_keep_constraint_text():
+    ddl = TEST_DATA["default_postgres_redshift"]["ddl"]
+
+    assert DdlParse().keep_constraint_text is True
+
+    for engine in DdlParse.ENGINE:
+        for cache in [None, DdlParseCache()]:
+            ddlparse = DdlParse(engine=engine, cache=cache, keep_constraint_text=False)
+            table = ddlparse.parse_table(ddl)
+
+            # Check same parse results without raw constraint text
+            assert table_properties(table) == table_properties(DdlParse(engine=engine).parse_table(ddl))
+            assert all(col._constraint is None for col in table.columns.values())
+            assert all(col._constraint is None for col in ddlparse.parse_table(ddl).columns.values())
+
+            ddlparse.keep_constraint_text = True
+            assert ddlparse.keep_constraint_text is True
+            assert any(col._constraint is not None for col in DdlParse(engine=engine).parse_table(ddl).columns.values())
+
+            # Check the cache shared with keep_constraint_text=True returns the raw constraint text
+            assert [col._constraint for col in ddlparse.parse_table(ddl).columns.values()] == \
+                [col._constraint for col in DdlParse(engine=engine).parse_table(ddl).columns.values()]
+
+
+@pytest.mark.parametrize("column_ddl, data_type_array, constraint", [
+    (
+        "Col_01 decimal(18, 2) UNSIGNED ZEROFILL NOT NULL DEFAULT '0,0' COMMENT 'Comma, strings'",
+        {"type_name": ["decimal"], "length": "18, 2", "unsigned": "UNSIGNED", "zerofill": "ZEROFILL"},
+        OrderedDict([("null", "NOT NULL"), ("default", "DEFAULT '0,0'"), ("comment", "COMMENT 'Comma, strings'")]),
+    ),
+    (
+        "Col_01 character varying(*) DEFAULT '{}'::character varying[] ENCODE lzo DISTKEY SORTKEY PRIMARY KEY",
+        {"type_name": ["character", "varying"], "length": "*"},
+        OrderedDict([("default", "DEFAULT '{}'::character varying[]"), ("encode", "ENCODE lzo"), ("distkey", "DISTKEY"), ("sortkey", "SORTKEY"), ("key", "PRIMARY KEY")]),
+    ),
+    (
+        "Col_01 numeric(10, 0) UNIQUE KEY AUTO_INCREMENT CHARACTER SET utf8 NULL COMMENT \"Double\"",
+        {"type_name": ["numeric"], "length": "10, 0"},
+        OrderedDict([("key", "UNIQUE KEY"), ("auto_increment", "AUTO_INCREMENT"), ("character_set", "utf8"), ("null", "NULL"), ("comment", "COMMENT \"Double\"")]),
+    ),
+    (
+        "Col_01 integer",
+        {"type_name": ["integer"]},
+        OrderedDict(),
+    ),
+])
+def test_column_values(column_ddl, data_type_array, constraint):
+    ddl = "CREATE TABLE Sample_Table ({})".format(column_ddl)
+
+    for engine in DdlParse.ENGINE:
+        table = DdlParse(engine=engine).parse_table(ddl)
+        parsed_col = table.columns["Col_01"]
+        expected = table_properties(table)
+
+        # Same column from the structured values of parse actions and from the tokens of constructor
+        col = table.columns.append("Col_01", data_type_array, constraint=constraint)
+        col.source_span = parsed_col.source_span
+
+        assert col._constraint == parsed_col._constraint
+        assert table_properties(table) == expected
+
+
+def test_bigquery_data_type_memo():
+    ddl = "CREATE TABLE Sample_Table (Col_01 date, Col_02 numeric(10, 2), Col_03 geometry)"
+    table = DdlParse(ddl, DdlParse.DATABASE.oracle).parse()
+
+    # Memoized per column, and updated by the change of source database or data type
+    col = table.columns["Col_01"]
+    assert col.bigquery_data_type == "DATETIME"
+    assert col.bigquery_data_type == "DATETIME"
+    assert (DdlParse.DATABASE.oracle, "DATE") in DdlParseColumn._bq_data_type_index
+
+    col.source_database = DdlParse.DATABASE.mysql
+    assert col.source_database == DdlParse.DATABASE.mysql
+    assert col.bigquery_data_type == "DATE"
+
+    col = table.columns["Col_02"]
+    assert col.bigquery_data_type == "FLOAT"
+    DdlParse().alter(table, "ALTER TABLE Sample_Table MODIFY Col_02 numeric(30)")
+    assert table.columns["Col_02"].bigquery_data_type == "NUMERIC"
+
+    # Unknown data type is not memoized
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Unknown data type : 'GEOMETRY'"):
+            table.columns["Col_03"].bigquery_data_type
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_column_store(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+
+    ddl = """
+        CREATE TABLE My_Schema.Sample_Table (
+          Col_01 integer PRIMARY KEY,
+          Col_02 timestamp NOT NULL,
+          Col_03 timestamp,
+          Col_04 numeric(30, 2) DEFAULT 0 COMMENT 'Amount',
+          Col_05 geometry,
+          Col_06 integer[][]
+        );
+        CREATE TABLE Other_Table (
+          Col_01 bigint NOT NULL UNIQUE,
+          Col_02 TIMESTAMP NOT NULL,
+          Col_03 varchar(*) CHARACTER SET utf8 ENCODE lzo
+        );
+        """
+    tables = list(DdlParse().iter_tables(ddl, DdlParse.DATABASE.postgresql))
+
+    store = DdlParseColumnStore(tables, use_numpy=use_numpy)
+    assert store.use_numpy is use_numpy
+    assert len(store) == 9
+    assert store.tables == ["My_Schema.Sample_Table", "Other_Table"]
+
+    # Parallel arrays
+    assert list(store.table_indexes) == [0, 0, 0, 0, 0, 0, 1, 1, 1]
+    assert list(store.names) == ["Col_01", "Col_02", "Col_03", "Col_04", "Col_05", "Col_06", "Col_01", "Col_02", "Col_03"]
+    assert list(store.data_types) == ["INTEGER", "TIMESTAMP", "TIMESTAMP", "NUMERIC", "GEOMETRY", "INTEGER", "BIGINT", "TIMESTAMP", "VARCHAR"]
+    assert list(store.lengths) == [-1, -1, -1, 30, -1, -1, -1, -1, store.LENGTH_ASTERISK]
+    assert list(store.scales) == [-1, -1, -1, 2, -1, -1, -1, -1, -1]
+    assert list(store.array_dimensionals) == [0, 0, 0, 0, 0, 2, 0, 0, 0]
+    assert list(store.bigquery_data_types) == ["INTEGER", "DATETIME", "DATETIME", "NUMERIC", None, "INTEGER", "INTEGER", "DATETIME", "STRING"]
+    assert store.flags[0] == DdlParseColumn._NOT_NULL | DdlParseColumn._PRIMARY_KEY
+
+    # Bulk queries
+    assert list(store.indices(store.mask(data_type="timestamp", not_null=True))) == [1, 7]
+    assert list(store.indices(store.mask(data_type=["INTEGER", "BIGINT"], primary_key=False))) == [5, 6]
+    assert list(store.indices(store.mask(bigquery_data_type="NUMERIC"))) == [3]
+    assert list(store.indices(store.flag_mask("unique"))) == [6]
+    assert list(store.indices(store.flag_mask("not_null", False))) == [2, 3, 4, 5, 8]
+    assert list(store.mask()) == [True] * 9
+    assert [col.name for col in store.columns(store.mask(data_type="VARCHAR"))] == ["Col_03"]
+
+    with pytest.raises(ValueError, match="Unknown flag : 'nullable'"):
+        store.mask(nullable=True)
+
+    # DdlParseColumn view of the stored columns
+    for index, col in enumerate(store.columns()):
+        table = tables[store.table_indexes[index]]
+        expected = table.columns[col.name]
+
+        for name in ["name", "data_type", "length", "scale", "is_unsigned", "is_zerofill", "array_dimensional", "not_null", "primary_key", "unique",
+                     "auto_increment", "distkey", "sortkey", "encode", "default", "comment", "character_set", "constraint", "source_database"]:
+            assert getattr(col, name) == getattr(expected, name)
+
+        assert col._constraint == expected._constraint
+        assert store[index] is not store[index]
+
+    # Append after the conversion of arrays
+    store.append(tables[1])
+    assert len(store) == 12
+    assert list(store.indices(store.mask(data_type="TIMESTAMP"))) == [1, 2, 7, 10]
+    assert pickle.loads(pickle.dumps(store)).tables == ["My_Schema.Sample_Table", "Other_Table", "Other_Table"]
+
+
+def test_column_store_numpy(monkeypatch):
+    import ddlparse.ddlparse
+
+    # NumPy is installed
+    try:
+        import numpy
+        assert DdlParseColumnStore().use_numpy is True
+    except ImportError:
+        pass
+
+    def import_module(name):
+        raise ImportError(name)
+
+    # NumPy is not installed
+    monkeypatch.setattr(ddlparse.ddlparse, "import_module", import_module)
+
+    assert DdlParseColumnStore().use_numpy is False
+    assert len(DdlParseColumnStore()) == 0
+
+    with pytest.raises(ImportError):
+        DdlParseColumnStore(use_numpy=True)
+
+
+@pytest.mark.parametrize("name_case", list(DdlParse.NAME_CASE))
+def test_bigquery_writer(name_case):
+    ddl = "\n".join([
+        TEST_DATA["basic"]["ddl"],
+        TEST_DATA["datatype_postgres"]["ddl"].replace("Sample_Table", "Test_Table"),
+        TEST_DATA["column_comment"]["ddl"].replace("Sample_Table", "My_Schema.Other_Table"),
+    ])
+    tables = DdlParse().replay([ddl], DdlParse.DATABASE.postgresql)
+
+    # Same fields as to_bigquery_fields()
+    for table in tables.values():
+        for source in [table, table.columns]:
+            file = io.StringIO()
+            writer = DdlParseBigQueryWriter(file, name_case)
+            assert writer.name_case == name_case
+
+            writer.write_fields(source)
+            assert file.getvalue() == table.to_bigquery_fields(name_case)
+            assert DdlParseBigQueryWriter.fields(source, name_case) == json.loads(table.to_bigquery_fields(name_case))
+
+    # Tables
+    expected_keys = {
+        DdlParse.NAME_CASE.original: ["Sample_Table", "Test_Table", "My_Schema.Other_Table"],
+        DdlParse.NAME_CASE.lower: ["sample_table", "test_table", "my_schema.other_table"],
+        DdlParse.NAME_CASE.upper: ["SAMPLE_TABLE", "TEST_TABLE", "MY_SCHEMA.OTHER_TABLE"],
+    }[name_case]
+
+    for source in [tables, list(tables.values()), iter(tables.values())]:
+        file = io.StringIO()
+        DdlParseBigQueryWriter(file, name_case).write_tables(source)
+        native_tables = DdlParseBigQueryWriter.tables(tables, name_case)
+
+        assert json.loads(file.getvalue()) == native_tables
+        assert list(native_tables) == expected_keys
+        assert list(native_tables.values()) == [json.loads(table.to_bigquery_fields(name_case)) for table in tables.values()]
+
+    file = io.StringIO()
+    DdlParseBigQueryWriter(file).write_tables([])
+    assert file.getvalue() == "{}"
+
+
+@pytest.mark.parametrize("name_case", list(DdlParse.NAME_CASE))
+def test_to_bigquery_schema(name_case):
+    for test_case, data in TEST_DATA.items():
+        table = DdlParse(data["ddl"], data.get("database")).parse()
+
+        try:
+            expected = json.loads(table.to_bigquery_fields(name_case))
+        except ValueError:
+            continue
+
+        # Same as json.loads() of JSON string
+        assert table.to_bigquery_schema(name_case) == expected
+        assert table.columns.to_bigquery_schema(name_case) == expected
+        assert [col.to_bigquery_schema(name_case) for col in table.columns.values()] == expected
+        assert all(type(field) is OrderedDict for field in table.to_bigquery_schema(name_case))
+
+    # Nested RECORD fields of multiple dimensional array
+    col = DdlParse().parse_table("CREATE TABLE Sample_Table (Col_01 integer[][][] NOT NULL COMMENT 'Array')").columns["Col_01"]
+    assert col.to_bigquery_schema(name_case) == {
+        "name": col.get_name(name_case), "type": "RECORD", "mode": "REPEATED", "description": "Array",
+        "fields": [{
+            "name": "dimension_1", "type": "RECORD", "mode": "REPEATED",
+            "fields": [{"name": "dimension_2", "type": "INTEGER", "mode": "REPEATED"}],
+        }],
+    }
+
+
+class NameTarget(DdlParseEmitTarget):
+    def __init__(self):
+        self.begins = 0
+
+    def begin(self, table, name_case):
+        self.begins += 1
+        self._names = [table.get_name(name_case)]
+
+    def column(self, column):
+        assert isinstance(column, DdlParseEmitColumn)
+        self._names.append(column.name)
+
+    def end(self):
+        return self._names
+
+
+@pytest.mark.parametrize("name_case", [DdlParse.NAME_CASE.original, DdlParse.NAME_CASE.lower, DdlParse.NAME_CASE.upper])
+def test_emitter(name_case):
+    emitter = DdlParseEmitter(name_case)
+    assert emitter.name_case == name_case
+    assert list(emitter.targets) == ["bigquery_fields", "bigquery_schema", "bigquery_ddl"]
+
+    # Same as to_bigquery_fields(), to_bigquery_schema() and to_bigquery_ddl()
+    for test_case, data in TEST_DATA.items():
+        table = DdlParse(data["ddl"], data.get("database")).parse()
+
+        try:
+            expected = [table.to_bigquery_fields(name_case), table.to_bigquery_schema(name_case), table.to_bigquery_ddl(name_case)]
+        except ValueError:
+            continue
+
+        assert list(emitter.emit(table).values()) == expected
+
+    # Custom target, register and unregister
+    target = NameTarget()
+    emitter = DdlParseEmitter(name_case, {"names": target})
+    assert emitter.targets == {"names": target}
+    assert emitter.register("fields", DdlParseBigQueryFieldsTarget()) is emitter
+    assert list(emitter.targets) == ["names", "fields"]
+    assert emitter.unregister("fields") is emitter
+    assert list(emitter.targets) == ["names"]
+
+    # Custom target without BigQuery data type does not fail on unknown data type
+    table = DdlParse().parse_table("CREATE TABLE Sample_Table (Col_01 NG_DATA_TYPE, Col_02 integer)")
+    assert emitter.emit(table) == {"names": [table.get_name(name_case), table.columns["Col_01"].get_name(name_case), table.columns["Col_02"].get_name(name_case)]}
+
+    with pytest.raises(ValueError):
+        DdlParseEmitter(name_case).emit(table)
+
+    # Emit tables of iterable and DdlParseTableDict, targets are fed in one pass
+    tables = DdlParseTableDict()
+    for ddl in ["CREATE TABLE Table_01 (Col_01 integer)", "CREATE TABLE My_Schema.Table_02 (Col_01 integer[][] NOT NULL, Col_02 bool)"]:
+        table = DdlParse().parse_table(ddl)
+        tables[DdlParseTableDict.key(table.schema, table.name)] = table
+
+    emitter = DdlParseEmitter(name_case, [("schema", DdlParseBigQuerySchemaTarget()), ("ddl", DdlParseBigQueryDdlTarget()), ("names", target)])
+    for emitted in [list(emitter.emit_tables(tables)), list(emitter.emit_tables(tables.values()))]:
+        assert [table for table, _ in emitted] == list(tables.values())
+
+        for table, results in emitted:
+            assert results == {
+                "schema": table.to_bigquery_schema(name_case),
+                "ddl": table.to_bigquery_ddl(name_case),
+                "names": [table.get_name(name_case)] + [col.get_name(name_case) for col in table.columns.values()],
+            }
+
+    assert target.begins == 5
+
+    # Derived values of the column
+    col = tables["My_Schema.Table_02"].columns["Col_01"]
+    column = DdlParseEmitColumn(col, name_case)
+    assert (column.column, column.name, column.bigquery_mode, column.description, column.not_null, column.array_dimensional) == \
+        (col, col.get_name(name_case), "REPEATED", None, True, 2)
+    assert (column.bigquery_legacy_data_type, column.bigquery_standard_data_type) == ("INTEGER", "INT64")
+    assert column.bigquery_schema is column.bigquery_schema
+    assert column.bigquery_schema == col.to_bigquery_schema(name_case)
+
+    # Base target does nothing
+    target = DdlParseEmitTarget()
+    target.begin(table, name_case)
+    target.column(column)
+    assert target.end() is None
+
+
+@pytest.mark.parametrize("engine", [DdlParse.ENGINE.pyparsing, DdlParse.ENGINE.fast])
+def test_profile(engine):
+    ddl = "CREATE TABLE My_Schema.Table_01 (Col_01 integer NOT NULL COMMENT 'Comment', Col_02 varchar(10)[], PRIMARY KEY (Col_01));"
+    parser = DdlParse(engine=engine)
+
+    # Disabled
+    profile = DdlParseProfile()
+    parser.parse_table(ddl)
+    assert profile.stats == {} and profile.tables == {}
+    assert profile.callback is None
+
+    # Per phase and per table, with callback
+    callbacks = []
+    with DdlParseProfile(lambda table, stats: callbacks.append((table.name, stats))) as profile:
+        table = parser.parse_table(ddl)
+        table.to_bigquery_fields()
+
+    matching = "fast_parse" if engine == DdlParse.ENGINE.fast else "grammar"
+
+    assert list(profile.stats) == ["parse", matching, "column_values", "walk", "column", "bigquery_data_type"]
+    assert [calls for calls, _ in profile.stats.values()] == [1, 1, 2, 1, 2, 2]
+    assert all(seconds >= 0.0 for _, seconds in profile.stats.values())
+    assert list(profile.tables) == ["My_Schema.Table_01"]
+    assert list(profile.tables["My_Schema.Table_01"]) == ["parse", matching, "column_values", "walk", "column"]
+    assert callbacks == [("Table_01", profile.tables["My_Schema.Table_01"])]
+
+    # Wall time of parse includes the other phases of the table
+    table_stats = profile.tables["My_Schema.Table_01"]
+    assert table_stats["parse"][1] >= sum(seconds for phase, (_, seconds) in table_stats.items() if phase != "parse") * 0.99
+
+    # Not profiled out of the with block
+    parser.parse_table(ddl)
+    assert profile.stats["parse"][0] == 1
+
+    # Tables of iter_tables(), cache, and the nested profile
+    with profile:
+        with DdlParseProfile() as nested:
+            parser.parse_table(ddl)
+        list(parser.iter_tables(ddl + "INSERT INTO Table_01 VALUES (1); CREATE TABLE Table_02 (Col_01 integer, FOREIGN KEY (Col_01) REFERENCES Table_01 (Col_01));"))
+        DdlParse(engine=engine, cache=DdlParseCache()).parse_table(ddl)
+
+    assert nested.stats["parse"][0] == 1
+    assert profile.stats["parse"][0] == 4
+    assert profile.stats["cache"][0] == 2
+    assert "grammar" in profile.tables["Table_02"]
+    assert [(key, stats["parse"][0]) for key, stats in profile.tables.items()] == [("My_Schema.Table_01", 3), ("Table_02", 1)]
+    assert len(callbacks) == 4
+
+    # Failed parse is recorded to the total stats only
+    profile.clear()
+    assert profile.stats == {} and profile.tables == {}
+
+    with profile:
+        with pytest.raises(Exception):
+            parser.parse_table("CREATE TABLE Table_01 (")
+
+        with pytest.raises(KeyError):
+            list(parser.iter_tables("CREATE TABLE Table_01 (Col_01 integer, PRIMARY KEY (Col_02));"))
+
+        with pytest.raises(Exception):
+            list(parser.iter_tables("CREATE TABLE Table_02 Col_01;"))
+
+        assert list(parser.iter_tables("CREATE TABLE Table_01 (Col_01 integer)\nCREATE TABLE Table_02 (Col_01 integer)")) != []
+
+        with pytest.raises(ValueError):
+            parser.parse_table("CREATE TABLE Table_03 (Col_01 NG_DATA_TYPE)").columns["Col_01"].bigquery_data_type
+
+    assert profile.stats["parse"][0] == 5
+    assert list(profile.tables) == ["Table_01", "Table_03"]
+    assert profile.stats["bigquery_data_type"][0] == 1
+
+    # Phases left open by the exception are closed at the end of the with block
+    with DdlParseProfile() as profile:
+        with pytest.raises(KeyError):
+            list(parser.iter_tables("CREATE TABLE Table_01 (Col_01 integer, PRIMARY KEY (Col_02));"))
+
+    assert profile.stats["parse"][0] == 1 and profile.tables == {}
+
+
+def test_trace(tmpdir):
+    ddl = "CREATE TABLE My_Schema.Table_01 (Col_01 integer NOT NULL COMMENT 'Comment', Col_02 varchar(10)[], PRIMARY KEY (Col_01));"
+    parser = DdlParse(engine=DdlParse.ENGINE.pyparsing)
+    elements = _DdlParseElementHook._grammar_elements(DdlParseTrace._roots())
+
+    with DdlParseTrace() as trace:
+        table = parser.parse_table(ddl)
+
+    assert [col.name for col in table.columns.values()] == ["Col_01", "Col_02"]
+    assert all("_parse" not in vars(element) for element in elements)
+
+    stats = trace.stats
+    assert stats["ddl_parse_expr"]["attempts"] == 1 and stats["ddl_parse_expr"]["successes"] == 1
+    assert stats["Located:column"]["successes"] == 2
+    assert all(stat["attempts"] == stat["successes"] + stat["failures"] for stat in stats.values())
+    assert all(stat["time"] >= 0.0 and stat["self_time"] >= 0.0 for stat in stats.values())
+    assert [stat["self_time"] for stat in stats.values()] == sorted((stat["self_time"] for stat in stats.values()), reverse=True)
+    assert stats["ddl_parse_expr"]["time"] >= sum(stat["self_time"] for stat in stats.values()) * 0.99
+    assert sum(stat["failures"] for stat in stats.values()) > 0
+
+    # Collapsed stacks from the root element
+    lines = trace.collapsed_stacks()
+    assert lines and all(re.match(r"^ddl_parse_expr(;[^;\n]+)* \d+$", line) for line in lines)
+    assert any(";Located:column" in line for line in lines)
+
+    path = tmpdir.join("trace.folded")
+    trace.write_collapsed(str(path))
+    assert path.read_text("utf-8").splitlines() == lines
+
+    # Not traced out of the with block, the fast parser engine and the other thread
+    attempts = stats["ddl_parse_expr"]["attempts"]
+    parser.parse_table(ddl)
+
+    with trace:
+        DdlParse(engine=DdlParse.ENGINE.fast).parse_table(ddl)
+        thread = threading.Thread(target=parser.parse_table, args=(ddl,))
+        thread.start()
+        thread.join()
+
+    assert trace.stats["ddl_parse_expr"]["attempts"] == attempts
+
+    # Failed parse, with packrat and the nested trace
+    trace.clear()
+    assert trace.stats == {} and trace.collapsed_stacks() == []
+
+    with trace:
+        with DdlParseTrace() as nested:
+            DdlParse(engine=DdlParse.ENGINE.pyparsing, packrat=True).parse_table(ddl)
+
+        with pytest.raises(Exception):
+            parser.parse_table("CREATE TABLE Table_01 (")
+
+    assert all("_parse" not in vars(element) for element in elements)
+    assert nested.stats["Located:column"]["successes"] == 2
+    assert trace.stats["ddl_parse_expr"]["attempts"] == 1 and trace.stats["ddl_parse_expr"]["failures"] == 1
+
+
+@pytest.mark.parametrize("engine", [DdlParse.ENGINE.pyparsing, DdlParse.ENGINE.fast])
+def test_budget(tmp_path, monkeypatch, engine):
+    ddl = "CREATE TABLE Table_01 (Col_01 integer NOT NULL, Col_02 varchar(10) DEFAULT 'abc', Col_03 text);"
+    elements = _DdlParseElementHook._grammar_elements(DdlParseTrace._roots())
+
+    # Options
+    ddlparse = DdlParse(engine=engine)
+    assert ddlparse.max_ddl_size is None and ddlparse.max_columns is None and ddlparse.timeout is None
+
+    ddlparse.max_ddl_size, ddlparse.max_columns, ddlparse.timeout = len(ddl), 3, 60
+    assert ddlparse.max_ddl_size == len(ddl) and ddlparse.max_columns == 3 and ddlparse.timeout == 60
+    assert len(ddlparse.parse_table(ddl).columns) == 3
+    assert len(ddlparse.parse(ddl).columns) == 3
+    assert len(ddlparse.parse(ddl).columns) == 3
+    assert [table.name for table in ddlparse.iter_tables(ddl * 10)] == ["Table_01"] * 10
+
+    # Maximum input size, of each statement in iter_tables()
+    with pytest.raises(DdlParseBudgetError) as e:
+        DdlParse(engine=engine, max_ddl_size=len(ddl) - 1).parse_table(ddl)
+
+    assert isinstance(e.value, ValueError)
+    assert (e.value.budget, e.value.limit) == ("max_ddl_size", len(ddl) - 1)
+    assert str(e.value) == "Parse budget is exceeded : max_ddl_size = {}".format(len(ddl) - 1)
+
+    with pytest.raises(DdlParseBudgetError):
+        list(DdlParse(engine=engine, max_ddl_size=len(ddl) - 2).iter_tables(ddl))
+
+    # Maximum column count, with the cached table
+    for cache in [None, DdlParseCache()]:
+        DdlParse(engine=engine, cache=cache).parse_table(ddl)
+
+        with pytest.raises(DdlParseBudgetError) as e:
+            DdlParse(engine=engine, cache=cache, max_columns=2).parse_table(ddl)
+
+        assert (e.value.budget, e.value.limit) == ("max_columns", 2)
+
+    with pytest.raises(DdlParseBudgetError):
+        list(DdlParse(engine=engine, max_columns=2).iter_tables(ddl))
+
+    # Counted while matching, per CREATE TABLE statement
+    wide_ddl = "CREATE TABLE Table_02 ({});".format(", ".join("Col_{:03} integer".format(i) for i in range(100)))
+
+    with DdlParseTrace() as trace, pytest.raises(DdlParseBudgetError):
+        DdlParse(engine=DdlParse.ENGINE.pyparsing, max_columns=2).parse_table(wide_ddl)
+
+    assert trace.stats["Located:column"]["successes"] == 2
+
+    with pytest.raises(DdlParseBudgetError):
+        _DdlParseFastParser(max_columns=2).parse(wide_ddl)
+
+    assert len(_DdlParseFastParser(max_columns=100).parse(wide_ddl)[3]) == 100
+    assert len(DdlParse(engine=engine, max_columns=3).parse(ddl + ddl).columns) == len(DdlParse(engine=engine).parse(ddl + ddl).columns)
+
+    # Wall-clock deadline, passed on the first check
+    for packrat in [False, True]:
+        with pytest.raises(DdlParseBudgetError) as e:
+            DdlParse(engine=engine, packrat=packrat, timeout=0).parse_table(ddl)
+
+        assert (e.value.budget, e.value.limit) == ("timeout", 0)
+
+        with pytest.raises(DdlParseBudgetError):
+            list(DdlParse(engine=engine, packrat=packrat, timeout=0).iter_tables(ddl + "CREATE TABLE Table_02 (Col_01 integer) CREATE TABLE Table_03 (Col_01 integer);"))
+
+    # The nested deadline never extends the outer one
+    with _DdlParseBudget(0.05), pytest.raises(DdlParseBudgetError):
+        time.sleep(0.1)
+        DdlParse(engine=engine, timeout=60).parse_table(ddl)
+
+    # Checked on entering and every CHECK_INTERVAL grammar elements, not on each element
+    checks = []
+    monkeypatch.setattr(_DdlParseBudget, "_check_deadline", staticmethod(checks.append))
+
+    with DdlParseTrace() as trace:
+        DdlParse(engine=DdlParse.ENGINE.pyparsing, timeout=60).parse_table(wide_ddl)
+
+    hook_calls = sum(stats["attempts"] for stats in trace.stats.values())
+    assert 1 < len(checks) <= hook_calls // _DdlParseBudget.CHECK_INTERVAL + 2
+    monkeypatch.undo()
+
+    with DdlParseTrace(), pytest.raises(DdlParseBudgetError):
+        DdlParse(engine=DdlParse.ENGINE.pyparsing, timeout=0).parse_table(ddl)
+
+    # The deadline and the parse method hook are removed after the budget error
+    assert all("_parse" not in vars(element) for element in elements)
+    assert _LOCAL.deadline is None and _LOCAL.columns is None
+    assert len(DdlParse(engine=engine).parse_table(ddl).columns) == 3
+
+    # Pickle
+    error = pickle.loads(pickle.dumps(DdlParseBudgetError("timeout", 1.5)))
+    assert (error.budget, error.limit, str(error)) == ("timeout", 1.5, "Parse budget is exceeded : timeout = 1.5")
+
+    # Worker of parse_many(), the file over max_ddl_size is not read to the end
+    ddl_file = tmp_path / "sample.sql"
+    ddl_file.write_text(ddl * 1000, encoding="utf-8")
+
+    options = {"engine": engine, "max_ddl_size": len(ddl) * 2, "max_columns": 2}
+    tables = _parse_many_worker(options, ["CREATE TABLE Table_02 (Col_01 integer);", ddl, ddl_file], None, "utf-8", return_exceptions=True)
+
+    assert tables[0].name == "Table_02"
+    assert (tables[1].budget, tables[2].budget) == ("max_columns", "max_ddl_size")
+
+    with pytest.raises(DdlParseBudgetError):
+        _parse_many_worker(options, [ddl], None, "utf-8")
+
+
+def test_budget_parse_many():
+    ddls = ["CREATE TABLE Table_01 (Col_01 integer);", "CREATE TABLE Table_02 (Col_01 integer, Col_02 integer);"] * 2
+
+    results = list(DdlParse(max_columns=1).parse_many(ddls, workers=1, chunksize=2, return_exceptions=True))
+
+    assert [result.name for result in results[::2]] == ["Table_01", "Table_01"]
+    assert all(isinstance(result, DdlParseBudgetError) and result.budget == "max_columns" for result in results[1::2])
+
+    with pytest.raises(DdlParseBudgetError):
+        list(DdlParse(max_columns=1).parse_many(ddls, workers=1))
+
+
+@pytest.mark.parametrize("engine", [DdlParse.ENGINE.pyparsing, DdlParse.ENGINE.fast])
+@pytest.mark.parametrize("literal", ["DEFAULT '{}", 'DEFAULT "{}', "COMMENT '{}", 'COMMENT "{}'])
+def test_unterminated_literal(engine, literal):
+    # Unterminated literal of many commas is matched without the exponential backtracking
+    ddl = "CREATE TABLE Table_01 (Col_01 varchar(10) {});".format(literal.format("," * 100))
+
+    start = time.perf_counter()
+    col = DdlParse(engine=engine).parse_table(ddl).columns["Col_01"]
+
+    assert time.perf_counter() - start < 5.0
+    assert (col.default if literal.startswith("DEFAULT") else col.comment) == literal[-3]